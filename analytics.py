@@ -0,0 +1,388 @@
+"""
+Placement Analytics for PyTech Arena
+One query layer for the department, status, company and time-bucket
+aggregations behind the admin dashboards, reports and exports: pushed down
+to SQL on SQLite, one columnar pass over Firebase snapshots, and memoized
+per data version so every route reuses the same computation
+"""
+
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import sqlalchemy as sa
+
+try:
+    import fcntl
+except ImportError:  # Windows: bumps are serialized per process only
+    fcntl = None
+
+
+NOT_PLACED = "Not Placed"
+
+_VERSION = struct.Struct("<Q")
+
+# Bucket label formats; SQLite's strftime and Python's agree on all of them
+BUCKET_FORMATS = {
+    "hour": "%Y-%m-%d %H:00",
+    "day": "%Y-%m-%d",
+    "week": "%Y-W%W",
+    "month": "%Y-%m",
+}
+
+
+def is_placed(placement_status) -> bool:
+    return placement_status is not None and placement_status != NOT_PLACED
+
+
+class DepartmentStats(NamedTuple):
+    department: str
+    total: int
+    placed: int
+    gpa_sum: float
+
+    @property
+    def avg_gpa(self) -> float:
+        return round(self.gpa_sum / self.total, 2) if self.total else 0
+
+    @property
+    def placement_rate(self) -> float:
+        return round(self.placed / self.total * 100, 1) if self.total else 0
+
+    def as_dict(self) -> Dict:
+        """The per-department dict the admin templates and exports read."""
+        return {
+            'total': self.total,
+            'count': self.total,
+            'placed': self.placed,
+            'gpa_sum': self.gpa_sum,
+            'avg_gpa': self.avg_gpa,
+            'placement_rate': self.placement_rate,
+        }
+
+
+class PlacementSummary(NamedTuple):
+    total_students: int
+    placed_students: int
+    departments: Tuple[DepartmentStats, ...]
+
+    @property
+    def not_placed_students(self) -> int:
+        return self.total_students - self.placed_students
+
+    @property
+    def placement_rate(self) -> float:
+        return round(self.placed_students / self.total_students * 100, 1) if self.total_students else 0
+
+    @property
+    def dept_stats(self) -> Dict[str, Dict]:
+        return {stats.department: stats.as_dict() for stats in self.departments}
+
+    def as_dict(self) -> Dict:
+        return {
+            'total_students': self.total_students,
+            'placed_students': self.placed_students,
+            'placement_rate': self.placement_rate,
+            'dept_stats': self.dept_stats,
+        }
+
+
+class StatusCount(NamedTuple):
+    status: str
+    count: int
+
+
+class CompanyStats(NamedTuple):
+    company_name: str
+    applications: int
+    shortlisted: int
+
+
+class TimeBucket(NamedTuple):
+    bucket: str
+    count: int
+
+
+def summarize(departments: Iterable[DepartmentStats]) -> PlacementSummary:
+    departments = tuple(sorted((d for d in departments if d.total > 0), key=lambda d: d.department))
+    return PlacementSummary(
+        total_students=sum(d.total for d in departments),
+        placed_students=sum(d.placed for d in departments),
+        departments=departments,
+    )
+
+
+def bucket_start(moment: datetime, bucket: str) -> datetime:
+    """Round ``moment`` down to the start of its bucket."""
+    moment = moment.replace(minute=0, second=0, microsecond=0)
+    if bucket == "hour":
+        return moment
+    moment = moment.replace(hour=0)
+    if bucket == "week":
+        return moment - timedelta(days=moment.weekday())
+    if bucket == "month":
+        return moment.replace(day=1)
+    return moment
+
+
+class SQLAnalytics:
+    """Aggregations pushed down to SQL as ``GROUP BY`` queries.
+
+    ``time_series`` maps a series name to ``(timestamp column, filter or
+    None)``; a ``timeline`` (see event_log.EventLog) answers time buckets
+    from its rollups instead. When a materialized ``stats_table`` (department, total,
+    placed, gpa_sum) is given, departments are read from it instead of
+    grouping every profile. Until it has been seeded (it has no
+    ``global_key`` row) the profiles are grouped as usual; reads never write.
+    """
+
+    def __init__(self, db, profile_table, application_table=None, time_series=None, timeline=None,
+                 stats_table=None, global_key: str = "*"):
+        self.db = db
+        self.profiles = profile_table
+        self.applications = application_table
+        self.time_series = time_series or {}
+        self.timeline = timeline
+        self.stats_table = stats_table
+        self.global_key = global_key
+
+    def _execute(self, statement):
+        return self.db.session.execute(statement)
+
+    def departments(self) -> List[DepartmentStats]:
+        if self.stats_table is not None:
+            table = self.stats_table
+            rows = self._execute(
+                sa.select(table.c.department, table.c.total, table.c.placed, table.c.gpa_sum)
+            ).all()
+            if any(row.department == self.global_key for row in rows):
+                return [DepartmentStats(*row) for row in rows if row.department != self.global_key]
+        profiles = self.profiles
+        department = sa.func.coalesce(profiles.c.department, "")
+        placed = sa.func.sum(sa.case((profiles.c.placement_status != NOT_PLACED, 1), else_=0))
+        gpa_sum = sa.func.sum(sa.func.coalesce(profiles.c.gpa, 0.0))
+        rows = self._execute(
+            sa.select(department, sa.func.count(profiles.c.id), placed, gpa_sum).group_by(department)
+        )
+        return [DepartmentStats(dept, total, placed or 0, gpa_sum or 0.0) for dept, total, placed, gpa_sum in rows]
+
+    def by_status(self) -> List[StatusCount]:
+        status = self.profiles.c.placement_status
+        rows = self._execute(sa.select(status, sa.func.count()).group_by(status))
+        return [StatusCount(*row) for row in rows]
+
+    def by_company(self) -> List[CompanyStats]:
+        applications = self.applications
+        shortlisted = sa.func.sum(sa.case((applications.c.status == "Shortlisted", 1), else_=0))
+        rows = self._execute(
+            sa.select(applications.c.company_name, sa.func.count(applications.c.id), shortlisted)
+            .group_by(applications.c.company_name)
+        )
+        return [CompanyStats(name, count, shortlisted or 0) for name, count, shortlisted in rows]
+
+    def time_buckets(self, series: str, bucket: str, since: Optional[datetime]) -> List[TimeBucket]:
+        if self.timeline is not None:
+            return self.timeline.series(self.db.session.connection(), [series], since, None, bucket)[series]
+        column, condition = self.time_series[series]
+        fmt = BUCKET_FORMATS[bucket]
+        conditions = [column.isnot(None)]
+        if condition is not None:
+            conditions.append(condition)
+        if since is not None:
+            conditions.append(column >= since)
+        if self.db.engine.dialect.name == "sqlite":
+            label = sa.func.strftime(fmt, column)
+            rows = self._execute(
+                sa.select(label, sa.func.count()).where(*conditions).group_by(label).order_by(label)
+            )
+            return [TimeBucket(*row) for row in rows]
+        # Other dialects spell date formatting differently; bucket the timestamps here
+        counts: Dict[str, int] = {}
+        for (moment,) in self._execute(sa.select(column).where(*conditions)):
+            key = moment.strftime(fmt)
+            counts[key] = counts.get(key, 0) + 1
+        return [TimeBucket(key, counts[key]) for key in sorted(counts)]
+
+
+def _parse_timestamp(value) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+class SnapshotAnalytics:
+    """Aggregations over Firebase-style snapshots (lists of dicts).
+
+    ``load(collection)`` returns the records of a collection. Each
+    aggregation makes one pass to pull the fields it needs into columns and
+    then groups them with ``np.unique`` / ``np.bincount``. ``time_series``
+    maps a series name to ``(collection, timestamp field, predicate or
+    None)``.
+    """
+
+    def __init__(self, load: Callable[[str], Iterable[Dict]], profiles: str = "student_profiles",
+                 applications: str = "job_applications", time_series=None):
+        self.load = load
+        self.profile_collection = profiles
+        self.application_collection = applications
+        self.time_series = time_series or {}
+
+    def departments(self) -> List[DepartmentStats]:
+        columns = [
+            (record.get("department") or "", is_placed(record.get("placement_status")), record.get("gpa") or 0.0)
+            for record in self.load(self.profile_collection)
+        ]
+        if not columns:
+            return []
+        departments, placed, gpas = zip(*columns)
+        names, index = np.unique(np.array(departments, dtype=object), return_inverse=True)
+        totals = np.bincount(index, minlength=len(names))
+        placed = np.bincount(index, weights=np.array(placed, dtype=np.float64), minlength=len(names))
+        gpa_sums = np.bincount(index, weights=np.array(gpas, dtype=np.float64), minlength=len(names))
+        return [
+            DepartmentStats(name, int(total), int(placed_count), float(gpa_sum))
+            for name, total, placed_count, gpa_sum in zip(names.tolist(), totals, placed, gpa_sums)
+        ]
+
+    @staticmethod
+    def _counts(values: List) -> List[Tuple]:
+        if not values:
+            return []
+        names, counts = np.unique(np.array(values, dtype=object), return_counts=True)
+        return list(zip(names.tolist(), counts.tolist()))
+
+    def by_status(self) -> List[StatusCount]:
+        statuses = [record.get("placement_status") or NOT_PLACED for record in self.load(self.profile_collection)]
+        return [StatusCount(*row) for row in self._counts(statuses)]
+
+    def by_company(self) -> List[CompanyStats]:
+        columns = [
+            (record.get("company_name") or "", record.get("status") == "Shortlisted")
+            for record in self.load(self.application_collection)
+        ]
+        if not columns:
+            return []
+        companies, shortlisted = zip(*columns)
+        names, index = np.unique(np.array(companies, dtype=object), return_inverse=True)
+        counts = np.bincount(index, minlength=len(names))
+        shortlisted = np.bincount(index, weights=np.array(shortlisted, dtype=np.float64), minlength=len(names))
+        return [
+            CompanyStats(name, int(count), int(short))
+            for name, count, short in zip(names.tolist(), counts, shortlisted)
+        ]
+
+    def time_buckets(self, series: str, bucket: str, since: Optional[datetime]) -> List[TimeBucket]:
+        collection, field, predicate = self.time_series[series]
+        fmt = BUCKET_FORMATS[bucket]
+        labels = []
+        for record in self.load(collection):
+            if predicate is not None and not predicate(record):
+                continue
+            moment = _parse_timestamp(record.get(field)) if record.get(field) else None
+            if moment is not None and (since is None or moment >= since):
+                labels.append(moment.strftime(fmt))
+        return [TimeBucket(*row) for row in self._counts(labels)]
+
+
+class AnalyticsEngine:
+    """Memoized aggregations over a :class:`SQLAnalytics` or :class:`SnapshotAnalytics` source.
+
+    A result is reused until ``version()`` changes (callers bump it when
+    profiles, applications or users are written) or, when ``ttl`` is set,
+    for at most ``ttl`` seconds so writes made by other processes show up.
+    """
+
+    def __init__(self, source, version: Callable[[], object] = lambda: None, ttl: float = 0):
+        self.source = source
+        self.version = version
+        self.ttl = ttl
+        self._memo: Dict[Tuple, Tuple[object, float, object]] = {}
+        self._lock = threading.Lock()
+
+    def _memoized(self, key: Tuple, compute: Callable[[], object]):
+        # Read the version first: a write landing mid-computation then forces a recompute
+        version = self.version()
+        now = time.monotonic()
+        entry = self._memo.get(key)
+        if entry is not None and entry[0] == version and (not self.ttl or now - entry[1] < self.ttl):
+            return entry[2]
+        value = compute()
+        with self._lock:
+            self._memo[key] = (version, now, value)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+    def summary(self) -> PlacementSummary:
+        return self._memoized(("summary",), lambda: summarize(self.source.departments()))
+
+    def by_department(self) -> Dict[str, DepartmentStats]:
+        return {stats.department: stats for stats in self.summary().departments}
+
+    def by_status(self) -> List[StatusCount]:
+        return self._memoized(("status",), self.source.by_status)
+
+    def by_company(self) -> List[CompanyStats]:
+        return self._memoized(("company",), self.source.by_company)
+
+    def by_time_bucket(self, series: str, bucket: str = "day", since: Optional[datetime] = None) -> List[TimeBucket]:
+        """Counts per bucket; ``since`` is rounded down to its bucket start."""
+        if bucket not in BUCKET_FORMATS:
+            raise ValueError(f"unknown bucket {bucket!r}; expected one of {', '.join(BUCKET_FORMATS)}")
+        if since is not None:
+            since = bucket_start(since, bucket)
+        return self._memoized(
+            ("time", series, bucket, since),
+            lambda: self.source.time_buckets(series, bucket, since),
+        )
+
+
+class DataVersion:
+    """Counter bumped after commits that change analytics inputs.
+
+    With a ``path`` the counter is an 8-byte memory-mapped file, so every
+    worker process on the host (and CLI commands) shares it and reading it
+    is a memory access rather than a query. Without one it is per process.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._value = 0
+        self._fd = None
+        self._map = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            if os.fstat(self._fd).st_size < _VERSION.size:
+                os.ftruncate(self._fd, _VERSION.size)
+            self._map = mmap.mmap(self._fd, _VERSION.size)
+
+    def current(self) -> int:
+        if self._map is None:
+            return self._value
+        return _VERSION.unpack_from(self._map)[0]
+
+    def bump(self) -> int:
+        with self._lock:
+            if self._map is None:
+                self._value += 1
+                return self._value
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                value = _VERSION.unpack_from(self._map)[0] + 1
+                _VERSION.pack_into(self._map, 0, value)
+                return value
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
@@ -5,7 +5,9 @@ Fixed version for Vercel deployment
 """
 
 import os
+import sys
 import json
+from datetime import datetime
 from flask import Flask, request, jsonify
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin
@@ -13,6 +15,10 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
 from dotenv import load_dotenv
 
+# Shared modules live at the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analytics import AnalyticsEngine, SQLAnalytics
+
 # Load environment variables
 load_dotenv()
 
@@ -44,6 +50,13 @@ class StudentProfile(db.Model):
     placement_status = db.Column(db.String(50), default='Not Placed')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+# No version counter here: each serverless invocation is short-lived, so results
+# are only shared between the routes of one warm instance for ANALYTICS_TTL seconds
+analytics = AnalyticsEngine(
+    SQLAnalytics(db, StudentProfile.__table__),
+    ttl=float(os.getenv('ANALYTICS_TTL', '30')),
+)
+
 # User loader
 @login_manager.user_loader
 def load_user(user_id):
@@ -80,43 +93,23 @@ def health_check():
 @roles_required('admin')
 def admin_dashboard():
     try:
-        # Get statistics
-        total_students = StudentProfile.query.count()
-        placed_students = StudentProfile.query.filter(StudentProfile.placement_status != 'Not Placed').count()
-        placement_rate = (placed_students / total_students * 100) if total_students > 0 else 0
-        
-        # Department statistics
-        dept_stats = {}
-        students = StudentProfile.query.all()
-        
-        for student in students:
-            dept = student.department or 'Unknown'
-            if dept not in dept_stats:
-                dept_stats[dept] = {
-                    'total': 0,
-                    'placed': 0,
-                    'avg_gpa': 0.0,
-                    'gpa_sum': 0.0
-                }
-            
-            dept_stats[dept]['total'] += 1
-            if student.placement_status != 'Not Placed':
-                dept_stats[dept]['placed'] += 1
-            if student.gpa:
-                dept_stats[dept]['gpa_sum'] += student.gpa
-        
-        # Calculate averages and placement rates
-        for dept, stats in dept_stats.items():
-            stats['avg_gpa'] = round(stats['gpa_sum'] / stats['total'], 2) if stats['total'] > 0 else 0
-            stats['placement_rate'] = round((stats['placed'] / stats['total'] * 100), 1) if stats['total'] > 0 else 0
-            del stats['gpa_sum']  # Remove temporary sum
+        summary = analytics.summary()
+        dept_stats = {
+            stats.department or 'Unknown': {
+                'total': stats.total,
+                'placed': stats.placed,
+                'avg_gpa': stats.avg_gpa,
+                'placement_rate': stats.placement_rate
+            }
+            for stats in summary.departments
+        }
         
         return jsonify({
             'status': 'success',
             'data': {
-                'total_students': total_students,
-                'placed_students': placed_students,
-                'placement_rate': round(placement_rate, 1),
+                'total_students': summary.total_students,
+                'placed_students': summary.placed_students,
+                'placement_rate': summary.placement_rate,
                 'dept_stats': dept_stats
             }
         })
@@ -131,34 +124,19 @@ def admin_dashboard():
 @roles_required('admin')
 def admin_analytics():
     try:
-        # Get comprehensive analytics data
-        total_students = StudentProfile.query.count()
-        placed_students = StudentProfile.query.filter(StudentProfile.placement_status != 'Not Placed').count()
-        not_placed_students = total_students - placed_students
-        
-        # Department statistics
-        dept_query = db.session.query(
-            StudentProfile.department,
-            db.func.count(StudentProfile.id).label('count'),
-            db.func.avg(StudentProfile.gpa).label('avg_gpa')
-        ).group_by(StudentProfile.department).all()
-        
-        dept_stats = {}
-        for dept, count, avg_gpa in dept_query:
-            dept_stats[dept] = {
-                'count': count,
-                'avg_gpa': round(avg_gpa, 2) if avg_gpa else 0
-            }
-        
-        placement_rate = (placed_students / total_students * 100) if total_students > 0 else 0
+        summary = analytics.summary()
+        dept_stats = {
+            stats.department: {'count': stats.total, 'avg_gpa': stats.avg_gpa}
+            for stats in summary.departments
+        }
         
         return jsonify({
             'status': 'success',
             'data': {
-                'total_students': total_students,
-                'placed_students': placed_students,
-                'not_placed_students': not_placed_students,
-                'placement_rate': round(placement_rate, 1),
+                'total_students': summary.total_students,
+                'placed_students': summary.placed_students,
+                'not_placed_students': summary.not_placed_students,
+                'placement_rate': summary.placement_rate,
                 'dept_stats': dept_stats
             }
         })
@@ -1,4 +1,4 @@
-from flask import Flask, render_template, redirect, url_for, request, flash, session, jsonify, send_from_directory, abort
+from flask import Flask, render_template, redirect, url_for, request, flash, session, jsonify, send_from_directory, abort, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, logout_user, login_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -7,10 +7,17 @@ from werkzeug.exceptions import HTTPException
 from functools import wraps
 import os
 import json
+import threading
+import time
+from types import SimpleNamespace
 from datetime import datetime, timedelta
 import logging
+import click
 from logging.handlers import RotatingFileHandler
 from dotenv import load_dotenv
+from sqlalchemy import event as sa_event, inspect as sa_inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import contains_eager, joinedload
 
 # Load environment variables
 load_dotenv()
@@ -24,7 +31,32 @@ except ImportError:
     print("⚠️ Firebase modules not available, using SQLite only")
 
 # Import database manager
-from database_manager import get_database_manager
+from database_manager import get_database_manager, TTLCache
+from csv_export import csv_response, stream_query
+from search_index import CandidateSearchIndex, ResumeSearchIndex, split_skills
+from skill_bitmap import SkillBitmapIndex
+from pagination import keyset_paginate
+from index_advisor import IndexAdvisor
+from notification_outbox import NotificationDispatcher
+from student_import import StudentImporter
+from password_hashing import (
+    DEFAULT_MAX_PENDING as DEFAULT_HASH_MAX_PENDING, DEFAULT_WORKERS as DEFAULT_HASH_WORKERS,
+    PasswordHasher, PasswordHasherBusy,
+)
+from blob_storage import BlobStore, BlobTooLarge, ResumableUploads, UploadOffsetMismatch, send_blob
+from resume_extraction import ResumeExtractionWorker
+from eligibility import EligibilityMatcher, criteria_columns, parse_eligibility, stored_criteria
+from job_candidates import JobCandidateLists
+from analytics import NOT_PLACED, AnalyticsEngine, CompanyStats, DataVersion, SQLAnalytics, SnapshotAnalytics, is_placed
+from application_funnel import ALL, COMPANY, POSTING, ApplicationFunnel, STAGE_COLUMNS
+from bulk_status import BulkStatusUpdater
+from live_events import NOTIFICATION, STATUS, LiveEvent, LiveEventBroker, parse_cursor
+from event_log import (
+    APPLICATION_STATUS_CHANGED, APPLICATION_SUBMITTED, DEFAULT_METRICS, PLACEMENT_RECORDED,
+    STUDENT_REGISTERED, Event, EventLog, bucket_count,
+)
+from validation import validate_email, validate_phone, validate_password_strength, sanitize_input
+from sqlite_tuning import sqlite_pragmas, engine_options, install_pragmas, effective_settings, async_worker
 
 
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -38,11 +70,33 @@ app = Flask(__name__)
 app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "change-this-secret-key")
 app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL", "sqlite:///" + os.path.join(BASE_DIR, "placement.db"))
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+# SQLite connection profile: "production" (WAL, busy timeout, larger cache) or "default"
+app.config["SQLITE_PROFILE"] = os.getenv("SQLITE_PROFILE", "production")
+app.config["SQLITE_PRAGMAS"] = sqlite_pragmas(app.config["SQLITE_PROFILE"])
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(
+    app.config["SQLALCHEMY_DATABASE_URI"], app.config["SQLITE_PRAGMAS"]
+)
 app.config["UPLOAD_FOLDER"] = os.getenv("UPLOAD_FOLDER", UPLOAD_FOLDER)
 app.config["MAX_CONTENT_LENGTH"] = int(os.getenv("MAX_CONTENT_LENGTH", "16777216"))  # 16MB
 app.config["ALLOWED_EXTENSIONS"] = {
     "pdf", "doc", "docx", "txt", "jpg", "jpeg", "png", "gif"
 }
+app.config["PHOTO_MAX_BYTES"] = int(os.getenv("PHOTO_MAX_BYTES", str(5 * 1024 * 1024)))
+# Chunk size suggested to clients of the resumable upload API, and how long an
+# abandoned upload session is kept
+app.config["UPLOAD_CHUNK_SIZE"] = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+app.config["UPLOAD_SESSION_TTL"] = int(os.getenv("UPLOAD_SESSION_TTL", str(24 * 3600)))
+# Resume delivery: seconds a browser may reuse a resume before revalidating its ETag,
+# and who sends the bytes: "" (this worker), "x-sendfile" (Apache/lighttpd) or
+# "x-accel" (nginx, with RESUME_ACCEL_PREFIX mapped as an internal alias of UPLOAD_FOLDER)
+app.config["RESUME_CACHE_MAX_AGE"] = int(os.getenv("RESUME_CACHE_MAX_AGE", "300"))
+app.config["RESUME_SENDFILE"] = os.getenv("RESUME_SENDFILE", "").lower()
+app.config["RESUME_ACCEL_PREFIX"] = os.getenv("RESUME_ACCEL_PREFIX", "/protected-uploads/")
+# Resume text extraction for recruiter search: "thread" (background worker), "inline"
+# (right after the upload commits) or "off" (run `flask extract-resumes`), and the
+# number of extraction processes
+app.config["RESUME_EXTRACTION"] = os.getenv("RESUME_EXTRACTION", "thread").lower()
+app.config["RESUME_EXTRACTION_WORKERS"] = int(os.getenv("RESUME_EXTRACTION_WORKERS", "1"))
 
 # Email configuration
 app.config["MAIL_SERVER"] = os.getenv("MAIL_SERVER", "smtp.gmail.com")
@@ -51,6 +105,61 @@ app.config["MAIL_USE_TLS"] = os.getenv("MAIL_USE_TLS", "True").lower() == "true"
 app.config["MAIL_USERNAME"] = os.getenv("MAIL_USERNAME", "")
 app.config["MAIL_PASSWORD"] = os.getenv("MAIL_PASSWORD", "")
 
+# Seconds before the in-process skill bitmaps are reloaded to pick up other workers' writes
+app.config["SKILL_BITMAP_TTL"] = float(os.getenv("SKILL_BITMAP_TTL", "60"))
+
+# Seconds before the eligibility matcher's student/job arrays are reloaded for the same reason
+app.config["ELIGIBILITY_TTL"] = float(os.getenv("ELIGIBILITY_TTL", "60"))
+
+# Seconds analytics results are reused before other workers' (or Firebase) writes are picked up
+app.config["ANALYTICS_TTL"] = float(os.getenv("ANALYTICS_TTL", "60"))
+
+# Memory-mapped counter shared by every worker on the host; analytics memos and ETags key off it
+app.config["DATA_VERSION_FILE"] = os.getenv("DATA_VERSION_FILE", os.path.join(BASE_DIR, "instance", "data_version"))
+
+# Seconds a user's navbar context (name, role, unread count) is reused across requests
+app.config["RENDER_CONTEXT_TTL"] = float(os.getenv("RENDER_CONTEXT_TTL", "30"))
+
+# How committed outbox notifications are delivered: "thread" (background batches) or "inline"
+app.config["NOTIFICATION_DISPATCH"] = os.getenv("NOTIFICATION_DISPATCH", "thread").lower()
+app.config["NOTIFICATION_BATCH_SIZE"] = int(os.getenv("NOTIFICATION_BATCH_SIZE", "500"))
+
+# Server-sent event streams (/api/live): seconds between checks for other workers' writes,
+# seconds between keep-alives, seconds before a stream is recycled (0 = never) and the most
+# streams one worker holds open. Every open tab holds a stream, which ties up a whole sync
+# worker, so streams are only on by default under a gevent/eventlet worker:
+#   gunicorn -k gevent --worker-connections 2000 app:app
+# Pages fall back to their usual refresh when LIVE_EVENTS_ENABLED is off.
+app.config["LIVE_EVENTS_ENABLED"] = os.getenv("LIVE_EVENTS_ENABLED", str(async_worker())).lower() == "true"
+app.config["LIVE_EVENTS_POLL_INTERVAL"] = float(os.getenv("LIVE_EVENTS_POLL_INTERVAL", "2"))
+app.config["LIVE_EVENTS_HEARTBEAT"] = float(os.getenv("LIVE_EVENTS_HEARTBEAT", "20"))
+app.config["LIVE_EVENTS_LIFETIME"] = float(os.getenv("LIVE_EVENTS_LIFETIME", "300"))
+app.config["LIVE_EVENTS_MAX_STREAMS"] = int(os.getenv("LIVE_EVENTS_MAX_STREAMS", "1000"))
+
+# Password hashing: werkzeug method string (e.g. "pbkdf2:sha256:600000", "scrypt:32768:8:1"),
+# hashing processes per web worker (0 = inline; each gunicorn worker starts its own) and how
+# many operations may queue before logins are turned away at once. Hashes made with another
+# method are upgraded on next login.
+app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+app.config["PASSWORD_HASH_WORKERS"] = int(os.getenv("PASSWORD_HASH_WORKERS", str(DEFAULT_HASH_WORKERS)))
+app.config["PASSWORD_HASH_MAX_PENDING"] = int(os.getenv("PASSWORD_HASH_MAX_PENDING", str(DEFAULT_HASH_MAX_PENDING)))
+app.config["PASSWORD_HASH_TIMEOUT"] = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+# Bulk student import: rows per transaction and password-hashing processes (0 = one per CPU).
+# Admin uploads run in a background thread of the web worker with their own, smaller pool;
+# the uploaded file is kept in IMPORT_FOLDER until its import finishes.
+app.config["IMPORT_BATCH_SIZE"] = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+app.config["IMPORT_WORKERS"] = int(os.getenv("IMPORT_WORKERS", "0"))
+app.config["IMPORT_UPLOAD_WORKERS"] = int(os.getenv("IMPORT_UPLOAD_WORKERS", "2"))
+app.config["IMPORT_FOLDER"] = os.getenv("IMPORT_FOLDER", os.path.join(BASE_DIR, "instance", "imports"))
+
+# Applications per UPDATE ... WHERE id IN (...) transaction, and the most ids one bulk status request may name
+app.config["BULK_STATUS_CHUNK_SIZE"] = int(os.getenv("BULK_STATUS_CHUNK_SIZE", "500"))
+app.config["BULK_STATUS_MAX_IDS"] = int(os.getenv("BULK_STATUS_MAX_IDS", "10000"))
+
+# Raise instead of logging when a view exceeds its @query_budget (always on under TESTING)
+app.config["ENFORCE_QUERY_BUDGETS"] = os.getenv("ENFORCE_QUERY_BUDGETS", "False").lower() == "true"
+
 # Debug mode
 app.config["DEBUG"] = os.getenv("FLASK_DEBUG", "False").lower() == "true"
 
@@ -84,6 +193,18 @@ if not app.debug:
 
 db = SQLAlchemy(app)
 
+password_hasher = PasswordHasher(
+    method=app.config["PASSWORD_HASH_METHOD"],
+    workers=app.config["PASSWORD_HASH_WORKERS"],
+    max_pending=app.config["PASSWORD_HASH_MAX_PENDING"],
+    timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+)
+
+with app.app_context():
+    install_pragmas(db.engine, app.config["SQLITE_PRAGMAS"])
+    if app.logger.isEnabledFor(logging.INFO):
+        app.logger.info("SQLite settings (%s profile): %s", app.config["SQLITE_PROFILE"], effective_settings(db.engine))
+
 # Initialize Flask-Login
 login_manager = LoginManager()
 login_manager.init_app(app)
@@ -93,36 +214,36 @@ login_manager.login_view = "login"
 def load_user(user_id):
     # Handle Firebase string IDs and SQLite integer IDs
     if database_manager.db_type == "firebase":
-        # For Firebase, get user from database manager
+        # For Firebase, fetch the single user record (cached) by uid
         try:
-            # Access the Firebase manager through the user_manager.firebase
-            firebase_manager = database_manager.user_manager.firebase
-            users = firebase_manager.get_reference('users').get()
-            if users:
-                for uid, user_data in users.items():
-                    if uid == user_id:
-                        # Create a temporary User object for Flask-Login
-                        temp_user = User()
-                        temp_user.id = uid
-                        temp_user.name = user_data['name']
-                        temp_user.email = user_data['email']
-                        temp_user.role = user_data['role']
-                        return temp_user
+            user_data = database_manager.get_user_by_id(user_id)
+            if user_data:
+                # Create a temporary User object for Flask-Login
+                temp_user = User()
+                temp_user.id = user_id
+                temp_user.name = user_data['name']
+                temp_user.email = user_data['email']
+                temp_user.role = user_data['role']
+                return temp_user
             return None
         except Exception as e:
             app.logger.error(f'Error loading user from Firebase: {str(e)}')
             return None
     else:
-        # For SQLite, use the original method
+        # For SQLite, load the row itself: authentication must see deletes and role
+        # changes at once, so only the navbar data is served from render_context_cache
         try:
-            return User.query.get(int(user_id))
+            return db.session.get(User, int(user_id))
         except ValueError:
             return None
 
 # Initialize database manager
 database_manager = None
 if DATABASE_TYPE == "firebase" and firebase_managers:
-    database_manager = get_database_manager("firebase", firebase_managers=firebase_managers)
+    database_manager = get_database_manager(
+        "firebase", firebase_managers=firebase_managers, check_password=password_hasher.verify,
+        needs_rehash=password_hasher.needs_rehash, hash_password=password_hasher.hash
+    )
 else:
     # We'll initialize SQLite database manager after models are defined
     pass
@@ -140,18 +261,28 @@ class User(db.Model, UserMixin):
 
     student_profile = db.relationship("StudentProfile", backref="user", uselist=False)
 
+    __table_args__ = (
+        db.Index("ix_user_role", "role"),
+    )
+
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return password_hasher.needs_rehash(self.password_hash)
 
 
 class StudentProfile(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.String(50), db.ForeignKey("user.id"), nullable=False)  # Changed to String for Firebase compatibility
-    department = db.Column(db.String(100), nullable=False)
-    gpa = db.Column(db.Float, nullable=False)
+    # active_history on the columns placement_stats counts by: their previous values are
+    # loaded even when the attributes have expired (after any commit), so flush deltas
+    # subtract what was really counted instead of treating old == new
+    department = db.column_property(db.Column(db.String(100), nullable=False), active_history=True)
+    gpa = db.column_property(db.Column(db.Float, nullable=False), active_history=True)
     skills = db.Column(db.String(255), nullable=True)
     internships = db.Column(db.Text, nullable=True)
     projects = db.Column(db.Text, nullable=True)
@@ -159,13 +290,20 @@ class StudentProfile(db.Model):
     career_preferences = db.Column(db.Text, nullable=True)
     resume_filename = db.Column(db.String(255), nullable=True)
     photo_filename = db.Column(db.String(255), nullable=True)
-    placement_status = db.Column(db.String(100), default="Not Placed")
+    placement_status = db.column_property(db.Column(db.String(100), default="Not Placed"), active_history=True)
     # Contact details
     phone = db.Column(db.String(20), nullable=True)
     linkedin = db.Column(db.String(255), nullable=True)
     github = db.Column(db.String(255), nullable=True)
     portfolio = db.Column(db.String(255), nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_student_profile_user_id", "user_id"),
+        db.Index("ix_student_profile_department_status", "department", "placement_status"),
+        db.Index("ix_student_profile_placement_status", "placement_status"),
+        db.Index("ix_student_profile_gpa_id", "gpa", "id"),
+    )
+
 
 class JobApplication(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -181,12 +319,21 @@ class JobApplication(db.Model):
     cgpa = db.Column(db.String(20), nullable=False)
     skills = db.Column(db.Text, nullable=True)
     cover_letter = db.Column(db.Text, nullable=False)
-    status = db.Column(db.String(50), default="Pending")  # Pending, Reviewed, Shortlisted, Rejected
+    status = db.column_property(  # Pending, Reviewed, Shortlisted, Rejected, Placed
+        db.Column(db.String(50), default="Pending"), active_history=True
+    )
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     student = db.relationship("User", backref="job_applications")
     job_posting = db.relationship("JobPosting", backref="job_applications")
 
+    __table_args__ = (
+        db.Index("ix_job_application_student_posting", "student_id", "job_posting_id"),
+        db.Index("ix_job_application_student_applied_at", "student_id", "applied_at"),
+        db.Index("ix_job_application_applied_at_id", "applied_at", "id"),
+        db.Index("ix_job_application_posting_status", "job_posting_id", "status"),
+    )
+
 
 class Company(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -207,7 +354,10 @@ class Company(db.Model):
 
 class JobPosting(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    company_id = db.Column(db.Integer, db.ForeignKey("company.id"), nullable=False)
+    # active_history so track_application_funnel knows which company's funnel to move counts from
+    company_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey("company.id"), nullable=False), active_history=True
+    )
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
     requirements = db.Column(db.Text, nullable=True)
@@ -215,6 +365,10 @@ class JobPosting(db.Model):
     job_type = db.Column(db.String(50), nullable=True)  # Full-time, Internship, Part-time
     salary_range = db.Column(db.String(100), nullable=True)
     eligibility = db.Column(db.Text, nullable=True)
+    # Parsed from eligibility on save (see eligibility.parse_eligibility)
+    min_gpa = db.Column(db.Float, nullable=True)
+    eligible_departments = db.Column(db.String(255), nullable=True)  # comma separated codes; empty = all
+    required_skills = db.Column(db.String(255), nullable=True)  # comma separated canonical skills
     application_process = db.Column(db.Text, nullable=True)
     visit_date = db.Column(db.DateTime, nullable=True)
     visit_time = db.Column(db.String(100), nullable=True)
@@ -223,6 +377,10 @@ class JobPosting(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        db.Index("ix_job_posting_is_active", "is_active", "company_id"),
+    )
+
 
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -235,6 +393,11 @@ class Notification(db.Model):
     
     user = db.relationship("User", backref="notifications")
 
+    __table_args__ = (
+        db.Index("ix_notification_user_is_read", "user_id", "is_read"),
+        db.Index("ix_notification_user_created_at", "user_id", "created_at"),
+    )
+
 
 class PlacementDrive(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -253,6 +416,1038 @@ drive_companies = db.Table('drive_companies',
     db.Column('company_id', db.Integer, db.ForeignKey('company.id'), primary_key=True)
 )
 
+
+class PlacementStats(db.Model):
+    """Materialized placement summary: one row per department plus a global row."""
+    __tablename__ = "placement_stats"
+
+    department = db.Column(db.String(100), primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    placed = db.Column(db.Integer, nullable=False, default=0)
+    gpa_sum = db.Column(db.Float, nullable=False, default=0.0)
+
+
+# Key of the PlacementStats row holding the university-wide totals
+PLACEMENT_STATS_GLOBAL = "*"
+
+
+def _profile_contribution(department, placement_status, gpa):
+    """Return the (department, total, placed, gpa_sum) a profile adds to the summary."""
+    placed = 1 if placement_status is not None and placement_status != "Not Placed" else 0
+    return department or "", 1, placed, gpa or 0.0
+
+
+def _committed_values(obj, keys):
+    """Attribute values of ``obj`` as they were before the pending flush."""
+    state = sa_inspect(obj)
+    values = []
+    for key in keys:
+        history = state.attrs[key].history
+        if history.deleted:
+            values.append(history.deleted[0])
+        elif history.unchanged:
+            values.append(history.unchanged[0])
+        else:
+            values.append(getattr(obj, key))
+    return values
+
+
+def _committed_profile_contribution(profile):
+    """Contribution of a profile as it was before the pending flush."""
+    return _profile_contribution(*_committed_values(profile, ("department", "placement_status", "gpa")))
+
+
+def seed_placement_stats(connection):
+    """Populate placement_stats from student_profile with one INSERT ... SELECT."""
+    table = PlacementStats.__table__
+    profiles = StudentProfile.__table__
+    department = db.func.coalesce(profiles.c.department, "")
+    placed = db.func.sum(db.case((profiles.c.placement_status != "Not Placed", 1), else_=0))
+    gpa_sum = db.func.sum(db.func.coalesce(profiles.c.gpa, 0.0))
+
+    connection.execute(table.insert().from_select(
+        ["department", "total", "placed", "gpa_sum"],
+        db.select(department, db.func.count(profiles.c.id), placed, gpa_sum).group_by(department)
+    ))
+    connection.execute(table.insert().from_select(
+        ["department", "total", "placed", "gpa_sum"],
+        db.select(
+            db.literal(PLACEMENT_STATS_GLOBAL),
+            db.func.count(profiles.c.id),
+            db.func.coalesce(placed, 0),
+            db.func.coalesce(gpa_sum, 0.0)
+        )
+    ))
+
+
+def apply_placement_stats_deltas(connection, deltas):
+    """Apply {department: [total, placed, gpa_sum]} increments to placement_stats.
+
+    Increments are issued as ``UPDATE ... SET total = total + :delta`` so
+    concurrent writers never lose each other's updates. A database that has
+    never been summarized is seeded first, so the deltas land on real totals.
+    """
+    table = PlacementStats.__table__
+    has_global = connection.execute(
+        db.select(table.c.department).where(table.c.department == PLACEMENT_STATS_GLOBAL)
+    ).first()
+    if not has_global:
+        seed_placement_stats(connection)
+
+    for department, (total, placed, gpa_sum) in deltas.items():
+        if not total and not placed and not gpa_sum:
+            continue
+        for key in (department, PLACEMENT_STATS_GLOBAL):
+            result = connection.execute(
+                table.update()
+                .where(table.c.department == key)
+                .values(
+                    total=table.c.total + total,
+                    placed=table.c.placed + placed,
+                    gpa_sum=table.c.gpa_sum + gpa_sum,
+                )
+            )
+            if result.rowcount == 0:
+                connection.execute(
+                    table.insert().values(department=key, total=total, placed=placed, gpa_sum=gpa_sum)
+                )
+
+
+@sa_event.listens_for(db.session, "before_flush")
+def track_placement_stats(session, flush_context, instances):
+    """Keep placement_stats in step with StudentProfile inserts, updates and deletes.
+
+    Runs as part of the flush, so the summary is updated in the same transaction
+    as the profile change (create_user, student_profile, admin_update_status,
+    admin_delete_student and any other writer).
+    """
+    deltas = {}
+
+    def add(contribution, sign):
+        department, total, placed, gpa_sum = contribution
+        entry = deltas.setdefault(department, [0, 0, 0.0])
+        entry[0] += sign * total
+        entry[1] += sign * placed
+        entry[2] += sign * gpa_sum
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, StudentProfile):
+                add(_profile_contribution(obj.department, obj.placement_status, obj.gpa), 1)
+
+        for obj in session.deleted:
+            if isinstance(obj, StudentProfile):
+                add(_committed_profile_contribution(obj), -1)
+
+        for obj in session.dirty:
+            if isinstance(obj, StudentProfile) and session.is_modified(obj):
+                old = _committed_profile_contribution(obj)
+                new = _profile_contribution(obj.department, obj.placement_status, obj.gpa)
+                if old != new:
+                    add(old, -1)
+                    add(new, 1)
+
+    if deltas:
+        apply_placement_stats_deltas(session.connection(), deltas)
+
+
+@sa_event.listens_for(db.metadata, "after_create")
+def backfill_placement_stats(target, connection, **kw):
+    """Seed placement_stats when db.create_all() adds it to an existing database."""
+    table = PlacementStats.__table__
+    seeded = connection.execute(
+        db.select(table.c.department).where(table.c.department == PLACEMENT_STATS_GLOBAL)
+    ).first()
+    if seeded:
+        return
+    connection.execute(table.delete())
+    seed_placement_stats(connection)
+
+
+def rebuild_placement_stats():
+    """Recompute placement_stats from scratch with one aggregate query."""
+    connection = db.session.connection()
+    connection.execute(PlacementStats.__table__.delete())
+    seed_placement_stats(connection)
+    db.session.commit()
+    analytics.invalidate()
+
+
+class AnalyticsEvent(db.Model):
+    """Append-only log of placement activity (see event_log.EventLog)."""
+    __tablename__ = "analytics_event"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)
+    occurred_at = db.Column(db.DateTime, nullable=False)
+    user_id = db.Column(db.String(50), nullable=True)
+    application_id = db.Column(db.Integer, nullable=True)
+    job_posting_id = db.Column(db.Integer, nullable=True)
+    value = db.Column(db.String(100), nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_analytics_event_kind_occurred_at", "kind", "occurred_at"),
+    )
+
+
+class AnalyticsRollup(db.Model):
+    """Event counts per hour and per day, incremented as events are logged."""
+    __tablename__ = "analytics_rollup"
+
+    granularity = db.Column(db.String(8), primary_key=True)  # "hour" or "day"
+    metric = db.Column(db.String(64), primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+
+event_log = EventLog(AnalyticsEvent.__table__, AnalyticsRollup.__table__)
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def log_analytics_events(session, flush_context):
+    """Append events for new students, applications, status changes and placements.
+
+    Written through the flush's connection, so the events and their rollup
+    counters commit with the change itself.
+    """
+    now = datetime.utcnow()
+    events = []
+    for obj in session.new:
+        if isinstance(obj, User) and obj.role == "student":
+            events.append(Event(STUDENT_REGISTERED, obj.created_at or now, obj.id))
+        elif isinstance(obj, JobApplication):
+            events.append(Event(
+                APPLICATION_SUBMITTED, obj.applied_at or now, str(obj.student_id), obj.id, obj.job_posting_id, obj.status
+            ))
+        elif isinstance(obj, StudentProfile) and is_placed(obj.placement_status):
+            events.append(Event(PLACEMENT_RECORDED, now, obj.user_id, value=obj.placement_status))
+
+    for obj in session.dirty:
+        if isinstance(obj, JobApplication):
+            history = sa_inspect(obj).attrs.status.history
+            if history.added and obj.status not in history.deleted:
+                events.append(Event(
+                    APPLICATION_STATUS_CHANGED, now, str(obj.student_id), obj.id, obj.job_posting_id, obj.status
+                ))
+        elif isinstance(obj, StudentProfile):
+            history = sa_inspect(obj).attrs.placement_status.history
+            if history.added and is_placed(obj.placement_status) and not any(map(is_placed, history.deleted)):
+                events.append(Event(PLACEMENT_RECORDED, now, obj.user_id, value=obj.placement_status))
+
+    event_log.record(session.connection(), events)
+    if any(event.kind == APPLICATION_STATUS_CHANGED for event in events):
+        session.info["live_events_pending"] = True
+
+
+def historical_events(connection):
+    """Events recoverable from existing rows: registrations and applications.
+
+    Status changes and placements carry no timestamp of their own, so the
+    log only sees those from the moment it exists.
+    """
+    users, applications = User.__table__, JobApplication.__table__
+    for user_id, created_at in connection.execute(
+        db.select(users.c.id, users.c.created_at).where(users.c.role == "student", users.c.created_at.isnot(None))
+    ):
+        yield Event(STUDENT_REGISTERED, created_at, user_id)
+    for row in connection.execute(
+        db.select(applications.c.id, applications.c.student_id, applications.c.job_posting_id,
+                  applications.c.status, applications.c.applied_at)
+        .where(applications.c.applied_at.isnot(None))
+    ):
+        yield Event(APPLICATION_SUBMITTED, row.applied_at, str(row.student_id), row.id, row.job_posting_id, row.status)
+
+
+@sa_event.listens_for(db.metadata, "after_create")
+def backfill_event_log(target, connection, **kw):
+    """Seed the event log when db.create_all() adds it to an existing database."""
+    if connection.execute(db.select(AnalyticsEvent.__table__.c.id).limit(1)).first():
+        return
+    event_log.record(connection, historical_events(connection))
+
+
+class ApplicationFunnelCounter(db.Model):
+    """Applications per stage for each posting, each company and overall (see application_funnel)."""
+    __tablename__ = "application_funnel"
+
+    scope = db.Column(db.String(10), primary_key=True)  # "posting", "company" or "all"
+    scope_id = db.Column(db.Integer, primary_key=True)  # JobPosting.id, Company.id or 0
+    applied = db.Column(db.Integer, nullable=False, default=0)
+    pending = db.Column(db.Integer, nullable=False, default=0)
+    reviewed = db.Column(db.Integer, nullable=False, default=0)
+    shortlisted = db.Column(db.Integer, nullable=False, default=0)
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+    placed = db.Column(db.Integer, nullable=False, default=0)
+
+
+application_funnel = ApplicationFunnel(ApplicationFunnelCounter.__table__, JobPosting.__table__)
+
+# Statuses a recruiter can set, in funnel order
+APPLICATION_STATUSES = tuple(STAGE_COLUMNS)
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def track_application_funnel(session, flush_context):
+    """Move applications between funnel stages as they are inserted, updated or deleted,
+    and a posting's counts between companies when it is reassigned."""
+    connection = session.connection()
+    for obj in session.dirty:
+        if isinstance(obj, JobPosting):
+            (old_company_id,) = _committed_values(obj, ("company_id",))
+            # The edit form assigns the id as a string
+            if old_company_id is not None and int(old_company_id) != int(obj.company_id):
+                application_funnel.move_posting(connection, obj.id, int(old_company_id), int(obj.company_id))
+    contributions = []
+    for obj in session.new:
+        if isinstance(obj, JobApplication):
+            contributions.append(application_funnel.contribution(obj.job_posting_id, obj.status, 1))
+    for obj in session.deleted:
+        if isinstance(obj, JobApplication):
+            contributions.append(application_funnel.contribution(*_committed_values(obj, ("job_posting_id", "status")), -1))
+    for obj in session.dirty:
+        if isinstance(obj, JobApplication):
+            old = _committed_values(obj, ("job_posting_id", "status"))
+            new = [obj.job_posting_id, obj.status]
+            if old != new:
+                contributions.append(application_funnel.contribution(*old, -1))
+                contributions.append(application_funnel.contribution(*new, 1))
+    application_funnel.apply(connection, contributions)
+
+
+@sa_event.listens_for(db.metadata, "after_create")
+def backfill_application_funnel(target, connection, **kw):
+    """Count existing applications when db.create_all() adds application_funnel."""
+    table = ApplicationFunnelCounter.__table__
+    if not connection.execute(db.select(table.c.scope).limit(1)).first():
+        application_funnel.rebuild(connection, JobApplication.__table__)
+
+
+def _firebase_records(collection):
+    snapshot = database_manager.profile_manager.firebase.get_reference(collection).get()
+    return list(snapshot.values()) if snapshot else []
+
+
+# Bumped after every commit that writes a profile, application, user, company or posting
+analytics_version = DataVersion(app.config["DATA_VERSION_FILE"])
+
+if DATABASE_TYPE == "firebase" and firebase_managers:
+    analytics_source = SnapshotAnalytics(_firebase_records, time_series={
+        "registrations": ("users", "created_at", lambda user: user.get("role") == "student"),
+        "applications": ("job_applications", "applied_at", None),
+    })
+else:
+    analytics_source = SQLAnalytics(
+        db, StudentProfile.__table__, JobApplication.__table__,
+        timeline=event_log,
+        stats_table=PlacementStats.__table__,
+        global_key=PLACEMENT_STATS_GLOBAL,
+    )
+
+analytics = AnalyticsEngine(analytics_source, version=analytics_version.current, ttl=app.config["ANALYTICS_TTL"])
+
+
+@sa_event.listens_for(db.session, "before_flush")
+def flag_analytics_changes(session, flush_context, instances):
+    tracked = (StudentProfile, JobApplication, User, Company, JobPosting)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, tracked):
+            session.info["analytics_changed"] = True
+            return
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def bump_analytics_version(session):
+    if session.info.pop("analytics_changed", False):
+        analytics_version.bump()
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_analytics_changes(session):
+    session.info.pop("analytics_changed", None)
+
+
+def get_placement_summary():
+    """Placement totals and a per-department dict shaped the way the admin templates expect.
+
+    Read from placement_stats on SQLite (seeded once if missing) or the
+    Firebase snapshot, and memoized by the analytics engine.
+    """
+    return analytics.summary().as_dict()
+
+
+class NotificationCounter(db.Model):
+    """Per-user unread notification count, kept in step with Notification."""
+    __tablename__ = "notification_counter"
+
+    user_id = db.Column(db.String(50), primary_key=True)
+    unread = db.Column(db.Integer, nullable=False, default=0)
+
+
+# user_id -> {"user": snapshot, "notification_count": n} shared by renders in this process
+render_context_cache = TTLCache(maxsize=4096, ttl=app.config["RENDER_CONTEXT_TTL"])
+
+
+def apply_unread_deltas(connection, deltas):
+    """Apply {user_id: delta} increments to notification_counter.
+
+    A user without a counter row is seeded from the committed notification
+    rows, so the first delta lands on the real count.
+    """
+    counters = NotificationCounter.__table__
+    notifications = Notification.__table__
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        result = connection.execute(
+            counters.update()
+            .where(counters.c.user_id == user_id)
+            .values(unread=counters.c.unread + delta)
+        )
+        if result.rowcount == 0:
+            committed = connection.execute(
+                db.select(db.func.count(notifications.c.id))
+                .where(notifications.c.user_id == user_id, notifications.c.is_read.is_(False))
+            ).scalar()
+            connection.execute(counters.insert().values(user_id=user_id, unread=committed + delta))
+
+
+@sa_event.listens_for(db.session, "before_flush")
+def track_unread_notifications(session, flush_context, instances):
+    """Keep notification_counter in step with Notification inserts, reads and deletes."""
+    deltas = {}
+
+    def add(notification, delta):
+        key = str(notification.user_id)
+        deltas[key] = deltas.get(key, 0) + delta
+
+    with session.no_autoflush:
+        for obj in session.new:
+            if isinstance(obj, Notification) and not obj.is_read:
+                add(obj, 1)
+
+        for obj in session.deleted:
+            if isinstance(obj, Notification):
+                history = sa_inspect(obj).attrs.is_read.history
+                was_read = (history.deleted or history.unchanged or [obj.is_read])[0]
+                if not was_read:
+                    add(obj, -1)
+
+        for obj in session.dirty:
+            if isinstance(obj, Notification):
+                history = sa_inspect(obj).attrs.is_read.history
+                if history.has_changes():
+                    was_read = bool(history.deleted and history.deleted[0])
+                    if was_read != bool(obj.is_read):
+                        add(obj, -1 if obj.is_read else 1)
+
+    if deltas:
+        apply_unread_deltas(session.connection(), deltas)
+        session.info.setdefault("stale_render_contexts", set()).update(deltas)
+
+
+@sa_event.listens_for(db.session, "before_flush")
+def track_changed_users(session, flush_context, instances):
+    """Drop the cached navbar context of users who are deleted or renamed, or change role or email."""
+    stale = set()
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            stale.add(str(obj.id))
+    for obj in session.dirty:
+        if isinstance(obj, User) and session.is_modified(obj):
+            stale.add(str(obj.id))
+    if stale:
+        session.info.setdefault("stale_render_contexts", set()).update(stale)
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def expire_render_contexts(session):
+    """Drop cached navbar context for users whose unread count just changed."""
+    for user_id in session.info.pop("stale_render_contexts", ()):
+        render_context_cache.pop(user_id)
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_render_context_changes(session):
+    session.info.pop("stale_render_contexts", None)
+
+
+class NotificationOutbox(db.Model):
+    """Notifications waiting to be written to the notification table by the dispatcher."""
+    __tablename__ = "notification_outbox"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    type = db.Column(db.String(50), nullable=False, default="info")
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+def fetch_live_events(cursor, user_id=None, limit=None):
+    """Notifications and application status changes after ``cursor``, oldest first.
+
+    With ``user_id`` only that user's rows are read (a reconnecting
+    stream's catch-up); without it, every user's (the broker's tail).
+    """
+    notifications, events, applications = Notification.__table__, AnalyticsEvent.__table__, JobApplication.__table__
+    connection = db.session.connection()
+
+    query = (
+        db.select(notifications.c.id, notifications.c.user_id, notifications.c.title, notifications.c.message,
+                  notifications.c.type, notifications.c.created_at)
+        .where(notifications.c.id > cursor[0])
+        .order_by(notifications.c.id).limit(limit)
+    )
+    if user_id is not None:
+        query = query.where(notifications.c.user_id == int(user_id))
+    live = [
+        LiveEvent(NOTIFICATION, str(row.user_id), row.id, {
+            "id": row.id, "title": row.title, "message": row.message, "type": row.type,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        })
+        for row in connection.execute(query)
+    ]
+
+    query = (
+        db.select(events.c.id, events.c.user_id, events.c.application_id, events.c.value, events.c.occurred_at,
+                  applications.c.job_title, applications.c.company_name)
+        .outerjoin_from(events, applications, applications.c.id == events.c.application_id)
+        .where(events.c.kind == APPLICATION_STATUS_CHANGED, events.c.id > cursor[1])
+        .order_by(events.c.id).limit(limit)
+    )
+    if user_id is not None:
+        query = query.where(events.c.user_id == str(user_id))
+    live += [
+        LiveEvent(STATUS, row.user_id, row.id, {
+            "application_id": row.application_id, "status": row.value,
+            "job_title": row.job_title, "company_name": row.company_name,
+            "changed_at": row.occurred_at.isoformat(),
+        })
+        for row in connection.execute(query)
+    ]
+    return live
+
+
+def latest_live_cursor():
+    notifications, events = Notification.__table__, AnalyticsEvent.__table__
+    row = db.session.execute(db.select(
+        db.select(db.func.coalesce(db.func.max(notifications.c.id), 0)).scalar_subquery(),
+        db.select(db.func.coalesce(db.func.max(events.c.id), 0)).scalar_subquery(),
+    )).one()
+    return tuple(row)
+
+
+live_broker = LiveEventBroker(
+    app, fetch_live_events, latest_live_cursor,
+    poll_interval=app.config["LIVE_EVENTS_POLL_INTERVAL"],
+)
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def publish_live_events(session):
+    """Have this process's streams see committed status changes without waiting for a poll."""
+    if session.info.pop("live_events_pending", False):
+        live_broker.wake()
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_live_events(session):
+    session.info.pop("live_events_pending", None)
+
+
+def after_notifications_delivered(delivered):
+    for user_id in delivered:
+        render_context_cache.pop(user_id)
+    live_broker.wake()
+
+
+notification_dispatcher = NotificationDispatcher(
+    app, db, NotificationOutbox.__table__, Notification.__table__,
+    on_delivered=apply_unread_deltas,
+    after_delivered=after_notifications_delivered,
+    batch_size=app.config["NOTIFICATION_BATCH_SIZE"],
+)
+
+
+@sa_event.listens_for(db.session, "before_flush")
+def track_outbox_appends(session, flush_context, instances):
+    if any(isinstance(obj, NotificationOutbox) for obj in session.new):
+        session.info["notification_outbox_pending"] = True
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def dispatch_outbox(session):
+    """Hand newly committed outbox rows to the dispatcher."""
+    if not session.info.pop("notification_outbox_pending", False):
+        return
+    if app.config["NOTIFICATION_DISPATCH"] == "inline":
+        notification_dispatcher.drain()
+    else:
+        notification_dispatcher.wake()
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_outbox_appends(session):
+    session.info.pop("notification_outbox_pending", None)
+
+
+# Full-text index over student skills, projects, internships and certifications
+candidate_search = CandidateSearchIndex(db, StudentProfile)
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def sync_candidate_search(session, flush_context):
+    """Re-index profiles whose searchable fields changed in this flush."""
+    upserts = []
+    deletes = []
+    for obj in session.new:
+        if isinstance(obj, StudentProfile):
+            upserts.append(obj)
+    for obj in session.dirty:
+        if isinstance(obj, StudentProfile):
+            state = sa_inspect(obj)
+            if any(state.attrs[key].history.has_changes() for key in CandidateSearchIndex.COLUMNS):
+                upserts.append(obj)
+    for obj in session.deleted:
+        if isinstance(obj, StudentProfile):
+            deletes.append(obj.id)
+
+    if upserts or deletes:
+        candidate_search.sync(session.connection(), upserts, deletes)
+
+
+@sa_event.listens_for(db.metadata, "after_create")
+def create_candidate_search(target, connection, **kw):
+    """Create (and fill) the FTS table alongside db.create_all()."""
+    candidate_search.available(connection)
+
+
+def search_candidates(query, text):
+    """Restrict a StudentProfile query to profiles matching ``text``.
+
+    Returns ``(query, score)`` where ``score`` is a relevance expression
+    (higher is better) to sort by, or None when no ranking applies. Uses the
+    FTS index when available and falls back to the old substring filter on
+    the skills column otherwise.
+    """
+    if not text:
+        return query, None
+    if candidate_search.available():
+        match = candidate_search.match(text)
+        if match is None:
+            return query, None
+        query = query.join(match, match.c.profile_id == StudentProfile.id)
+        return query, (-match.c.rank).label("score")
+    return query.filter(StudentProfile.skills.ilike(f"%{text}%")), None
+
+
+def apply_candidate_search(query, text):
+    """Restrict a StudentProfile query to profiles matching ``text``, best match first."""
+    query, score = search_candidates(query, text)
+    if score is not None:
+        query = query.order_by(score.desc())
+    return query
+
+
+class Skill(db.Model):
+    """Canonical skill names (see search_index.normalize_skill)."""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+
+student_skill = db.Table('student_skill',
+    db.Column('profile_id', db.Integer, db.ForeignKey('student_profile.id'), primary_key=True),
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True, index=True)
+)
+
+skill_bitmaps = SkillBitmapIndex(db, Skill.__table__, student_skill, ttl=app.config["SKILL_BITMAP_TTL"])
+
+
+def sync_student_skills(connection, skills_by_profile):
+    """Rewrite student_skill rows for {profile_id: [canonical skill, ...]}.
+
+    Unknown skills are added to the skill dictionary first. A value of None
+    removes the profile's skills.
+    """
+    skills_table = Skill.__table__
+    names = {name for skills in skills_by_profile.values() for name in skills or ()}
+    skill_ids = {}
+    if names:
+        existing = connection.execute(
+            db.select(skills_table.c.name, skills_table.c.id).where(skills_table.c.name.in_(names))
+        ).all()
+        skill_ids = dict(existing)
+        missing = names - set(skill_ids)
+        if missing:
+            connection.execute(
+                skills_table.insert().prefix_with("OR IGNORE", dialect="sqlite"),
+                [{"name": name} for name in missing]
+            )
+            skill_ids.update(connection.execute(
+                db.select(skills_table.c.name, skills_table.c.id).where(skills_table.c.name.in_(missing))
+            ).all())
+
+    connection.execute(student_skill.delete().where(student_skill.c.profile_id.in_(list(skills_by_profile))))
+    rows = [
+        {"profile_id": profile_id, "skill_id": skill_ids[name]}
+        for profile_id, skills in skills_by_profile.items()
+        for name in skills or ()
+    ]
+    if rows:
+        connection.execute(student_skill.insert(), rows)
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def track_student_skills(session, flush_context):
+    """Keep student_skill in step with the free-text StudentProfile.skills column."""
+    changes = {}
+    for obj in session.new:
+        if isinstance(obj, StudentProfile):
+            changes[obj.id] = split_skills(obj.skills)
+    for obj in session.dirty:
+        if isinstance(obj, StudentProfile) and sa_inspect(obj).attrs.skills.history.has_changes():
+            changes[obj.id] = split_skills(obj.skills)
+    for obj in session.deleted:
+        if isinstance(obj, StudentProfile):
+            changes[obj.id] = None
+
+    if changes:
+        sync_student_skills(session.connection(), changes)
+        session.info.setdefault("skill_bitmap_changes", {}).update(changes)
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def apply_skill_bitmap_changes(session):
+    changes = session.info.pop("skill_bitmap_changes", None)
+    if changes:
+        skill_bitmaps.apply_changes(changes)
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_skill_bitmap_changes(session):
+    session.info.pop("skill_bitmap_changes", None)
+
+
+def record_imported_stats(connection, records):
+    """Add a batch of imported profiles to placement_stats (before they are inserted)."""
+    deltas = {}
+    for record in records:
+        department, total, placed, gpa_sum = _profile_contribution(
+            record["department"], record["placement_status"], record["gpa"]
+        )
+        entry = deltas.setdefault(department, [0, 0, 0.0])
+        entry[0] += total
+        entry[1] += placed
+        entry[2] += gpa_sum
+    apply_placement_stats_deltas(connection, deltas)
+
+
+def index_imported_profiles(connection, profiles):
+    """Add a batch of imported profiles to the search index and skill tables."""
+    candidate_search.sync(connection, upserts=[
+        SimpleNamespace(id=row["id"], skills=row["skills"], projects=None, internships=None, certifications=None)
+        for row in profiles
+    ])
+    changes = {row["id"]: split_skills(row["skills"]) for row in profiles}
+    sync_student_skills(connection, changes)
+    db.session.info.setdefault("skill_bitmap_changes", {}).update(changes)
+    db.session.info["analytics_changed"] = True
+    now = datetime.utcnow()
+    event_log.record(connection, [Event(STUDENT_REGISTERED, now, row["user_id"]) for row in profiles] + [
+        Event(PLACEMENT_RECORDED, now, row["user_id"], value=row["placement_status"])
+        for row in profiles if is_placed(row["placement_status"])
+    ])
+    # New students are evaluated against the cached job arrays; the student
+    # arrays are reloaded once, when the whole import is done
+    job_candidates.update_profiles(connection, [
+        SimpleNamespace(id=row["id"], gpa=row["gpa"], department=row["department"], skills=row["skills"])
+        for row in profiles
+    ])
+
+
+student_importer = StudentImporter(
+    db, User.__table__, StudentProfile.__table__,
+    batch_size=app.config["IMPORT_BATCH_SIZE"],
+    workers=app.config["IMPORT_WORKERS"] or None,
+    password_method=password_hasher.method,
+    before_insert=record_imported_stats,
+    after_insert=index_imported_profiles,
+    after_import=lambda: eligibility_matcher.refresh(),
+)
+
+
+class StudentImportJob(db.Model):
+    """An admin CSV upload being imported in the background (see run_student_import)."""
+    __tablename__ = "student_import_job"
+
+    id = db.Column(db.Integer, primary_key=True)
+    status = db.Column(db.String(20), nullable=False, default="queued")  # queued, running, done, failed
+    filename = db.Column(db.String(255), nullable=True)
+    requested_by = db.Column(db.String(50), nullable=True)
+    created = db.Column(db.Integer, nullable=False, default=0)
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+    errors = db.Column(db.Text, nullable=True)  # JSON list of the first rejected rows
+    message = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "created": self.created,
+            "rejected": self.rejected,
+            "errors": json.loads(self.errors) if self.errors else [],
+            "message": self.message,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+# Rejected rows kept on a finished import job; the CLI prints them all
+IMPORT_JOB_ERRORS_SHOWN = 100
+
+
+def run_student_import(job_id, path, default_password):
+    """Import an uploaded CSV outside the request, recording progress on its job row.
+
+    Progress is written through its own connection, so the status endpoint
+    sees it from any worker while the import's batches commit.
+    """
+    jobs = StudentImportJob.__table__
+
+    def update(**values):
+        with db.engine.begin() as connection:
+            connection.execute(jobs.update().where(jobs.c.id == job_id).values(**values))
+
+    with app.app_context():
+        try:
+            update(status="running")
+            with open(path, "rb") as f:
+                report = student_importer.import_csv(
+                    f, default_password=default_password, workers=app.config["IMPORT_UPLOAD_WORKERS"],
+                    progress=lambda created: update(created=created),
+                )
+        except Exception as e:
+            app.logger.exception(f"Student import {job_id} failed")
+            update(status="failed", message=str(e), finished_at=datetime.utcnow())
+        else:
+            app.logger.info(f'Imported {report.created} students ({report.rows_per_second:.0f} rows/s), '
+                            f'{len(report.errors)} rows rejected')
+            update(
+                status="done", created=report.created, rejected=len(report.errors),
+                errors=json.dumps([error._asdict() for error in report.errors[:IMPORT_JOB_ERRORS_SHOWN]]),
+                message=f"Imported {report.created} students in {report.seconds:.1f}s",
+                finished_at=datetime.utcnow(),
+            )
+        finally:
+            db.session.remove()
+            os.remove(path)
+
+
+# Notification type students get for a bulk move to each status
+BULK_STATUS_NOTIFICATION_TYPES = {"Shortlisted": "success", "Placed": "success", "Rejected": "warning"}
+
+
+def record_bulk_status_changes(connection, changes, status):
+    """Funnel counters, event log and student notifications for one chunk of a bulk status update."""
+    now = datetime.utcnow()
+    contributions = []
+    for change in changes:
+        contributions.append(application_funnel.contribution(change.job_posting_id, change.old_status, -1))
+        contributions.append(application_funnel.contribution(change.job_posting_id, status, 1))
+    application_funnel.apply(connection, contributions)
+    event_log.record(connection, [
+        Event(APPLICATION_STATUS_CHANGED, now, str(change.student_id), change.application_id,
+              change.job_posting_id, status)
+        for change in changes
+    ])
+    connection.execute(NotificationOutbox.__table__.insert(), [
+        {
+            "user_id": change.student_id,
+            "title": "Application status updated",
+            "message": f"Your application for {change.job_title} at {change.company_name} is now {status}.",
+            "type": BULK_STATUS_NOTIFICATION_TYPES.get(status, "info"),
+            "created_at": now,
+        }
+        for change in changes
+    ])
+    db.session.info["analytics_changed"] = True
+    db.session.info["live_events_pending"] = True
+    db.session.info["notification_outbox_pending"] = True
+
+
+bulk_status_updater = BulkStatusUpdater(
+    db, JobApplication.__table__,
+    chunk_size=app.config["BULK_STATUS_CHUNK_SIZE"],
+    after_update=record_bulk_status_changes,
+)
+
+
+def rebuild_student_skills(batch_size=1000):
+    """Re-derive student_skill from every StudentProfile.skills value."""
+    connection = db.session.connection()
+    connection.execute(student_skill.delete())
+    profiles = StudentProfile.__table__
+    result = connection.execute(
+        db.select(profiles.c.id, profiles.c.skills).execution_options(yield_per=batch_size)
+    )
+    for rows in result.partitions():
+        sync_student_skills(connection, {row.id: split_skills(row.skills) for row in rows})
+    db.session.commit()
+    skill_bitmaps.refresh()
+
+
+@sa_event.listens_for(db.metadata, "after_create")
+def backfill_student_skills(target, connection, **kw):
+    """Fill student_skill when db.create_all() adds it to an existing database."""
+    has_rows = connection.execute(db.select(student_skill.c.profile_id).limit(1)).first()
+    if has_rows:
+        return
+    profiles = StudentProfile.__table__
+    rows = connection.execute(db.select(profiles.c.id, profiles.c.skills).where(profiles.c.skills != "")).all()
+    if rows:
+        sync_student_skills(connection, {row.id: split_skills(row.skills) for row in rows})
+
+
+# Above this many ids the filter is pushed down to SQL instead (SQLite bound parameter limit)
+MAX_SKILL_FILTER_IDS = 30000
+
+
+def apply_skill_filters(query, all_skills=(), any_skills=()):
+    """Restrict a StudentProfile query with bitmap AND/OR skill filters.
+
+    The bitmaps resolve the filter to a set of profile ids in memory; the
+    database then sees a single ``id IN (...)`` on the primary key.
+    """
+    bits = skill_bitmaps.match(all_skills, any_skills)
+    if bits is None:
+        return query
+    if bits.bit_count() <= MAX_SKILL_FILTER_IDS:
+        return query.filter(StudentProfile.id.in_(SkillBitmapIndex.to_ids(bits)))
+
+    for name in all_skills:
+        query = query.filter(StudentProfile.id.in_(
+            db.select(student_skill.c.profile_id).join(Skill).where(Skill.name == name)
+        ))
+    if any_skills:
+        query = query.filter(StudentProfile.id.in_(
+            db.select(student_skill.c.profile_id).join(Skill).where(Skill.name.in_(any_skills))
+        ))
+    return query
+
+
+eligibility_matcher = EligibilityMatcher(
+    db, StudentProfile.__table__, student_skill, Skill.__table__, JobPosting.__table__,
+    ttl=app.config["ELIGIBILITY_TTL"],
+)
+
+# StudentProfile columns the matcher's arrays are built from
+ELIGIBILITY_PROFILE_FIELDS = ("gpa", "department", "skills")
+
+
+def job_criteria(job):
+    return stored_criteria(job.min_gpa, job.eligible_departments, job.required_skills)
+
+
+@sa_event.listens_for(db.session, "before_flush")
+def parse_job_eligibility(session, flush_context, instances):
+    """Store structured criteria for jobs whose eligibility text changed."""
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, JobPosting):
+            if obj in session.new or sa_inspect(obj).attrs.eligibility.history.has_changes():
+                for column, value in criteria_columns(parse_eligibility(obj.eligibility)).items():
+                    setattr(obj, column, value)
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def keep_eligibility_patches(session):
+    session.info.pop("eligibility_patched", None)
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_eligibility_patches(session):
+    # sync_job_candidates patched the arrays with rows that were never committed
+    if session.info.pop("eligibility_patched", False):
+        eligibility_matcher.invalidate()
+
+
+class JobCandidate(db.Model):
+    """Precomputed eligible students of a job posting (see job_candidates.JobCandidateLists)."""
+    __tablename__ = "job_candidate"
+
+    job_id = db.Column(db.Integer, db.ForeignKey("job_posting.id"), primary_key=True)
+    profile_id = db.Column(db.Integer, db.ForeignKey("student_profile.id"), primary_key=True)
+    # Copied from the profile so a page is a range scan of ix_job_candidate_job_gpa
+    gpa = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_job_candidate_job_gpa", "job_id", "gpa", "profile_id"),
+        db.Index("ix_job_candidate_profile_id", "profile_id"),
+    )
+
+
+job_candidates = JobCandidateLists(JobCandidate.__table__, eligibility_matcher)
+
+# JobPosting columns that change who is on a posting's candidate list
+JOB_CANDIDATE_FIELDS = ("min_gpa", "eligible_departments", "required_skills", "is_active")
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def sync_job_candidates(session, flush_context):
+    """Rebuild saved postings' candidate lists and patch the rows of changed profiles."""
+    jobs = []
+    profiles = []
+    deleted_jobs = []
+    deleted_profiles = []
+    for obj in session.new:
+        if isinstance(obj, JobPosting):
+            jobs.append(obj)
+        elif isinstance(obj, StudentProfile):
+            profiles.append(obj)
+    for obj in session.dirty:
+        if isinstance(obj, JobPosting):
+            state = sa_inspect(obj)
+            if any(state.attrs[key].history.has_changes() for key in JOB_CANDIDATE_FIELDS):
+                jobs.append(obj)
+        elif isinstance(obj, StudentProfile):
+            state = sa_inspect(obj)
+            if any(state.attrs[key].history.has_changes() for key in ELIGIBILITY_PROFILE_FIELDS):
+                profiles.append(obj)
+    for obj in session.deleted:
+        if isinstance(obj, JobPosting):
+            deleted_jobs.append(obj.id)
+        elif isinstance(obj, StudentProfile):
+            deleted_profiles.append(obj.id)
+    if not (jobs or profiles or deleted_jobs or deleted_profiles):
+        return
+
+    connection = session.connection()
+    # Patch just the changed rows into the matcher; reloading every student
+    # here would make each profile edit cost as much as the whole table
+    eligibility_matcher.update_students([profile.id for profile in profiles] + deleted_profiles)
+    eligibility_matcher.update_jobs([job.id for job in jobs] + deleted_jobs)
+    session.info["eligibility_patched"] = True
+    job_candidates.remove_jobs(connection, deleted_jobs)
+    job_candidates.remove_profiles(connection, deleted_profiles)
+    job_candidates.update_profiles(connection, profiles)
+    for job in jobs:
+        job_candidates.rebuild_job(connection, job.id, job_criteria(job), active=job.is_active is not False)
+
+
+def backfill_job_eligibility():
+    """Parse the eligibility text of every job into its structured columns and
+    recompute every candidate list."""
+    jobs = JobPosting.__table__
+    connection = db.session.connection()
+    for job_id, text in connection.execute(db.select(jobs.c.id, jobs.c.eligibility)).all():
+        connection.execute(jobs.update().where(jobs.c.id == job_id).values(**criteria_columns(parse_eligibility(text))))
+    job_candidates.rebuild_all(connection)
+    db.session.commit()
+    eligibility_matcher.invalidate()
+
+
 # Initialize SQLite database manager if needed
 if database_manager is None:
     models = {
@@ -260,7 +1455,8 @@ if database_manager is None:
         'StudentProfile': StudentProfile,
         'JobPosting': JobPosting,
         'JobApplication': JobApplication,
-        'Notification': Notification
+        'Notification': Notification,
+        'NotificationOutbox': NotificationOutbox
     }
     database_manager = get_database_manager("sqlite", db=db, models=models)
     print(f"✅ SQLite database manager initialized")
@@ -274,23 +1470,218 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in app.config['ALLOWED_EXTENSIONS']
 
 
-def create_notification(user_id, title, message, notification_type="info"):
-    """Create a notification for a user."""
-    notification = Notification(
+# Uploads are stored by content hash under UPLOAD_FOLDER; profiles keep "<sha256>.<ext>"
+blob_store = BlobStore(app.config["UPLOAD_FOLDER"])
+resumable_uploads = ResumableUploads(blob_store)
+
+# Upload kind -> StudentProfile column it fills
+UPLOAD_KINDS = {"resume": "resume_filename", "photo": "photo_filename"}
+
+
+def upload_limit(kind):
+    return app.config["PHOTO_MAX_BYTES"] if kind == "photo" else app.config["MAX_CONTENT_LENGTH"]
+
+
+def store_upload(file, kind):
+    """Stream an uploaded file into the blob store; returns its stored name."""
+    name, _ = blob_store.save(file.stream, secure_filename(file.filename), max_bytes=upload_limit(kind))
+    return name
+
+
+class ResumeExtractionJob(db.Model):
+    """One text extraction run for an uploaded resume."""
+    __tablename__ = "resume_extraction_job"
+
+    id = db.Column(db.Integer, primary_key=True)
+    profile_id = db.Column(db.Integer, nullable=False)
+    blob_name = db.Column(db.String(255), nullable=False)
+    # pending, running, done, failed, skipped (unsupported type) or superseded (newer upload)
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    error = db.Column(db.Text, nullable=True)
+    chars = db.Column(db.Integer, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_resume_extraction_job_status_id", "status", "id"),
+        db.Index("ix_resume_extraction_job_profile_id", "profile_id"),
+    )
+
+
+# Full-text index over extracted resume text, filled by the extraction worker
+resume_search = ResumeSearchIndex(db, StudentProfile)
+
+
+@sa_event.listens_for(db.metadata, "after_create")
+def create_resume_search(target, connection, **kw):
+    resume_search.available(connection)
+
+
+def store_resume_text(connection, profile_id, text):
+    resume_search.sync(connection, upserts=[SimpleNamespace(id=profile_id, content=text)])
+
+
+resume_extractor = ResumeExtractionWorker(
+    app, db, ResumeExtractionJob.__table__, StudentProfile.__table__,
+    resolve_path=blob_store.path,
+    store_text=store_resume_text,
+    workers=app.config["RESUME_EXTRACTION_WORKERS"],
+)
+
+
+@sa_event.listens_for(db.session, "after_flush")
+def track_resume_uploads(session, flush_context):
+    """Queue text extraction for new resumes and drop the indexed text of replaced ones."""
+    changed = {}
+    deleted = []
+    for obj in session.new:
+        if isinstance(obj, StudentProfile) and obj.resume_filename:
+            changed[obj.id] = obj.resume_filename
+    for obj in session.dirty:
+        if isinstance(obj, StudentProfile) and sa_inspect(obj).attrs.resume_filename.history.has_changes():
+            changed[obj.id] = obj.resume_filename
+    for obj in session.deleted:
+        if isinstance(obj, StudentProfile):
+            deleted.append(obj.id)
+    if not changed and not deleted:
+        return
+
+    connection = session.connection()
+    jobs = ResumeExtractionJob.__table__
+    profile_ids = list(changed) + deleted
+    connection.execute(
+        jobs.update()
+        .where(jobs.c.profile_id.in_(profile_ids), jobs.c.status == "pending")
+        .values(status="superseded", finished_at=datetime.utcnow())
+    )
+    resume_search.sync(connection, deletes=profile_ids)
+    queued = [{"profile_id": profile_id, "blob_name": name} for profile_id, name in changed.items() if name]
+    if queued:
+        connection.execute(jobs.insert(), queued)
+        session.info["resume_extraction_pending"] = True
+
+
+@sa_event.listens_for(db.session, "after_commit")
+def dispatch_resume_extraction(session):
+    if not session.info.pop("resume_extraction_pending", False):
+        return
+    mode = app.config["RESUME_EXTRACTION"]
+    if mode == "inline":
+        resume_extractor.drain()
+    elif mode == "thread":
+        resume_extractor.wake()
+
+
+@sa_event.listens_for(db.session, "after_rollback")
+def discard_resume_extraction(session):
+    session.info.pop("resume_extraction_pending", None)
+
+
+def enqueue_resume_extraction():
+    """Queue extraction for every profile with a resume; returns how many were queued."""
+    jobs = ResumeExtractionJob.__table__
+    profiles = StudentProfile.__table__
+    with_resume = db.select(profiles.c.id, profiles.c.resume_filename, db.literal(datetime.utcnow())).where(
+        profiles.c.resume_filename.isnot(None), profiles.c.resume_filename != ""
+    )
+    db.session.execute(
+        jobs.update().where(jobs.c.status == "pending")
+        .values(status="superseded", finished_at=datetime.utcnow())
+    )
+    queued = db.session.execute(
+        jobs.insert().from_select(["profile_id", "blob_name", "created_at"], with_resume)
+    ).rowcount
+    db.session.commit()
+    return queued
+
+
+def search_resumes(query, text):
+    """Restrict a StudentProfile query to profiles whose resume text matches ``text``.
+
+    Returns ``(query, score)`` like search_candidates. Without FTS5 there is
+    no resume text to search, so nothing matches.
+    """
+    if not text:
+        return query, None
+    if not resume_search.available():
+        return query.filter(db.false()), None
+    match = resume_search.match(text)
+    if match is None:
+        return query, None
+    query = query.join(match, match.c.profile_id == StudentProfile.id)
+    return query, (-match.c.rank).label("resume_score")
+
+
+def enqueue_notification(user_id, title, message, notification_type="info"):
+    """Queue a notification for a user; it is delivered after the caller commits."""
+    db.session.add(NotificationOutbox(
         user_id=user_id,
         title=title,
         message=message,
         type=notification_type
+    ))
+
+
+def enqueue_notifications(user_ids, title, message, notification_type="info"):
+    """Queue the same notification for every user id selected by ``user_ids``.
+
+    ``user_ids`` is a single-column select, so the fan-out is one
+    INSERT ... SELECT no matter how many users it reaches.
+    """
+    outbox = NotificationOutbox.__table__
+    db.session.execute(
+        outbox.insert().from_select(
+            ["user_id", "title", "message", "type", "created_at"],
+            db.select(
+                user_ids.subquery().c[0],
+                db.literal(title), db.literal(message),
+                db.literal(notification_type), db.literal(datetime.utcnow()),
+            ),
+        )
     )
-    db.session.add(notification)
-    db.session.commit()
+    db.session.info["notification_outbox_pending"] = True
 
 
 def get_unread_notification_count(user_id):
     """Get count of unread notifications for a user."""
+    counter = db.session.get(NotificationCounter, str(user_id))
+    if counter is not None:
+        return counter.unread
     return Notification.query.filter_by(user_id=user_id, is_read=False).count()
 
 
+def get_render_context(user_id):
+    """Return the navbar context for a user.
+
+    Memoized on ``g`` for the request and in ``render_context_cache`` across
+    requests, so a steady-state render needs no database round trip. The
+    cache entry is dropped when the user's unread count or user row changes
+    in this process and otherwise expires after RENDER_CONTEXT_TTL seconds.
+    It is display data only; load_user always reads the User row.
+    """
+    if "render_context" in g:
+        return g.render_context
+
+    key = str(user_id)
+    context = render_context_cache.get(key)
+    if context is None:
+        user = db.session.get(User, user_id)
+        if user is None:
+            context = {"current_user": None, "notification_count": 0}
+        else:
+            snapshot = SimpleNamespace(
+                id=user.id, name=user.name, email=user.email, role=user.role,
+                is_authenticated=True
+            )
+            context = {"current_user": snapshot, "notification_count": get_unread_notification_count(user_id)}
+            render_context_cache.set(key, context)
+
+    g.render_context = context
+    return context
+
+
 def validate_student_profile(profile):
     """Validate student profile data."""
     errors = []
@@ -307,53 +1698,6 @@ def validate_student_profile(profile):
     return errors
 
 
-def validate_email(email):
-    """Validate email format."""
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
-
-
-def validate_phone(phone):
-    """Validate phone number format."""
-    import re
-    pattern = r'^[+]?[0-9]{10,15}$'
-    return re.match(pattern, email) is not None
-
-
-def validate_password_strength(password):
-    """Validate password strength."""
-    errors = []
-    
-    if len(password) < 8:
-        errors.append("Password must be at least 8 characters long")
-    
-    if not any(c.isupper() for c in password):
-        errors.append("Password must contain at least one uppercase letter")
-    
-    if not any(c.islower() for c in password):
-        errors.append("Password must contain at least one lowercase letter")
-    
-    if not any(c.isdigit() for c in password):
-        errors.append("Password must contain at least one digit")
-    
-    return errors
-
-
-def sanitize_input(text):
-    """Sanitize user input to prevent XSS."""
-    if not text:
-        return ""
-    
-    # Basic XSS prevention
-    dangerous_chars = ["<", ">", "&", '"', "'", "/"]
-    sanitized = text
-    for char in dangerous_chars:
-        sanitized = sanitized.replace(char, "")
-    
-    return sanitized.strip()
-
-
 # Error handlers
 @app.errorhandler(404)
 def not_found_error(error):
@@ -410,33 +1754,61 @@ def validate_form_fields(required_fields):
 
 def generate_placement_report():
     """Generate comprehensive placement report."""
-    total_students = StudentProfile.query.count()
-    placed_students = StudentProfile.query.filter(StudentProfile.placement_status != "Not Placed").count()
-    
-    # Department-wise statistics
-    dept_stats = db.session.query(
-        StudentProfile.department,
-        db.func.count(StudentProfile.id).label('total'),
-        db.func.sum(db.case([(StudentProfile.placement_status != "Not Placed", 1)], else_=0)).label('placed'),
-        db.func.avg(StudentProfile.gpa).label('avg_gpa')
-    ).group_by(StudentProfile.department).all()
-    
-    # Company-wise placements
-    company_stats = db.session.query(
-        JobApplication.company_name,
-        db.func.count(JobApplication.id).label('applications'),
-        db.func.sum(db.case([(JobApplication.status == "Shortlisted", 1)], else_=0)).label('shortlisted')
-    ).group_by(JobApplication.company_name).all()
-    
+    summary = analytics.summary()
+    if database_manager.db_type == "firebase":
+        company_funnels = []
+        company_stats = analytics.by_company()
+    else:
+        # Read from the maintained per-company funnel counters
+        company_funnels = application_funnel.funnels(db.session.connection(), COMPANY, label=Company.__table__.c.name)
+        company_stats = [CompanyStats(funnel.name, funnel.applied, funnel.shortlisted) for funnel in company_funnels]
     return {
-        'total_students': total_students,
-        'placed_students': placed_students,
-        'placement_rate': (placed_students / total_students * 100) if total_students > 0 else 0,
-        'dept_stats': dept_stats,
-        'company_stats': company_stats
+        'total_students': summary.total_students,
+        'placed_students': summary.placed_students,
+        'placement_rate': summary.placement_rate,
+        'dept_stats': [dict(stats.as_dict(), department=stats.department) for stats in summary.departments],
+        'company_stats': company_stats,
+        'company_funnels': company_funnels
     }
 
 
+def query_budget(max_selects):
+    """Declare the most SELECT statements a list view may issue.
+    
+    The budget is a constant: it must not grow with the number of rows the
+    view renders, so an N+1 relationship access blows through it. Every
+    read counts, including WITH (CTE) queries, parenthesised compound
+    selects and FTS MATCH lookups. Exceeding it raises under TESTING or
+    ENFORCE_QUERY_BUDGETS and logs a warning otherwise.
+    """
+    def decorator(f):
+        f.query_budget = max_selects
+        return f
+    return decorator
+
+
+@sa_event.listens_for(Engine, "before_cursor_execute")
+def count_select_statements(conn, cursor, statement, parameters, context, executemany):
+    if not has_request_context():
+        return
+    words = statement.lstrip(" \t\r\n(")[:7].split(None, 1)
+    if words and words[0].upper() in ("SELECT", "WITH"):
+        g.select_count = g.get("select_count", 0) + 1
+
+
+@app.after_request
+def check_query_budget(response):
+    view = app.view_functions.get(request.endpoint)
+    budget = getattr(view, "query_budget", None)
+    selects = g.get("select_count", 0)
+    if budget is not None and selects > budget:
+        message = f"{request.endpoint} issued {selects} SELECTs (budget {budget})"
+        if app.testing or app.config["ENFORCE_QUERY_BUDGETS"]:
+            raise AssertionError(message)
+        app.logger.warning(message)
+    return response
+
+
 def login_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -463,14 +1835,61 @@ def roles_required(*roles):
     return decorator
 
 
+def data_version_etag(page, period=None):
+    """Weak ETag for the current user's view of the data at ``analytics_version``.
+
+    Rendered pages also depend on the navbar's unread count, which comes
+    from the (cached) render context; name and role changes bump the data
+    version themselves. Firebase writes never bump the counter, so there
+    (and for views that depend on the clock) the tag also rolls over every
+    ``period`` seconds.
+    """
+    parts = [f"v{analytics_version.current()}", f"u{session.get('user_id')}"]
+    if page:
+        parts.append(f"n{get_render_context(session['user_id'])['notification_count']}")
+    if period is None and database_manager.db_type == "firebase":
+        period = app.config["ANALYTICS_TTL"]
+    if period:
+        parts.append(f"t{int(time.time() // period)}")
+    return ".".join(parts)
+
+
+def conditional_get(page=True, period=None):
+    """Answer ``If-None-Match`` with 304 before the view runs.
+
+    The tag is computed before the view reads anything, so a write that
+    lands while it renders produces a new tag on the next request. Apply it
+    below ``login_required``/``roles_required`` so the check stays behind
+    them; a pending flash message always gets a full render.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if session.get("_flashes"):
+                return f(*args, **kwargs)
+            etag = data_version_etag(page, period)
+            if request.if_none_match.contains_weak(etag):
+                response = app.response_class(status=304)
+            else:
+                response = app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
 @app.context_processor
 def inject_current_user():
     user_id = session.get("user_id")
     if not user_id:
         return {"current_user": None, "notification_count": 0}
-    user = User.query.get(user_id)
-    notification_count = get_unread_notification_count(user_id) if user else 0
-    return {"current_user": user, "notification_count": notification_count}
+    return get_render_context(user_id)
 
 
 @app.route("/")
@@ -513,21 +1932,19 @@ def register():
             return redirect(url_for("login"))
 
         try:
-            # Use database manager to create user (automatically syncs to Firebase)
-            user_id = database_manager.create_user(name, email, password, role)
-            
-            app.logger.info(f'New user registered: {email} with role {role}')
-            flash("Registration successful. Please login.", "success")
-            
-            # Create welcome notification for the new user
+            # Students get a welcome notification, queued in the same commit as the account
+            notifications = []
             if role == "student":
-                database_manager.create_notification(
-                    user_id, 
-                    "Welcome to PyTech Arena!", 
+                notifications.append((
+                    "Welcome to PyTech Arena!",
                     f"Welcome {name}! Your account has been created successfully. Complete your profile to apply for jobs.",
                     "success"
-                )
+                ))
+            # Use database manager to create user (automatically syncs to Firebase)
+            database_manager.create_user(name, email, password, role, notifications=notifications)
             
+            app.logger.info(f'New user registered: {email} with role {role}')
+            flash("Registration successful. Please login.", "success")
             return redirect(url_for("login"))
             
         except Exception as e:
@@ -545,7 +1962,12 @@ def login():
         password = request.form.get("password")
 
         # Use database manager to verify user
-        user = database_manager.verify_password(email, password)
+        try:
+            user = database_manager.verify_password(email, password)
+        except PasswordHasherBusy:
+            app.logger.warning(f'Login rejected, password hashing queue full: {password_hasher.stats()}')
+            flash("The server is busy. Please try logging in again in a moment.", "warning")
+            return render_template("login_fixed.html"), 503
         if not user:
             flash("Invalid email or password.", "danger")
             return redirect(url_for("login"))
@@ -626,19 +2048,14 @@ def student_profile():
         profile.portfolio = request.form.get("portfolio")
         
         # Handle file uploads
-        if 'resume' in request.files:
-            resume = request.files['resume']
-            if resume and allowed_file(resume.filename):
-                filename = secure_filename(resume.filename)
-                resume.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                profile.resume_filename = filename
-        
-        if 'photo' in request.files:
-            photo = request.files['photo']
-            if photo and allowed_file(photo.filename):
-                filename = secure_filename(photo.filename)
-                photo.save(os.path.join(app.config['UPLOAD_FOLDER'], filename))
-                profile.photo_filename = filename
+        for kind, column in UPLOAD_KINDS.items():
+            upload = request.files.get(kind)
+            if upload and upload.filename and allowed_file(upload.filename):
+                try:
+                    setattr(profile, column, store_upload(upload, kind))
+                except BlobTooLarge:
+                    flash(f"The {kind} file is too large.", "danger")
+                    return redirect(url_for("student_profile"))
         
         # Save to Firebase or SQLite
         if database_manager.db_type == "firebase":
@@ -660,23 +2077,11 @@ def student_profile():
                 'updated_at': datetime.utcnow().isoformat()
             }
             database_manager.update_student_profile(profile.id, profile_data)
+            analytics_version.bump()
         else:
             # Update SQLite
             db.session.commit()
-        
-            photo_filename = f"photo_{user_id}_{int(datetime.utcnow().timestamp())}_{filename}"
-            photo_path = os.path.join(app.config["UPLOAD_FOLDER"], photo_filename)
-            photo.save(photo_path)
-            
-            # Basic file validation
-            if os.path.getsize(photo_path) > 5 * 1024 * 1024:  # 5MB limit for images
-                os.remove(photo_path)
-                flash("Image file too large. Maximum size is 5MB.", "danger")
-                return redirect(url_for("student_profile"))
-            
-            profile.photo_filename = photo_filename
 
-        db.session.commit()
         flash("Profile updated successfully.", "success")
         return redirect(url_for("student_dashboard"))
 
@@ -685,79 +2090,22 @@ def student_profile():
 
 @app.route("/admin/dashboard")
 @login_required
-@roles_required("admin")
-def admin_dashboard():
-    # Get statistics from Firebase or SQLite based on database type
-    if database_manager.db_type == "firebase":
-        # Firebase statistics
-        # Get all student profiles from Firebase
-        profiles_ref = database_manager.profile_manager.firebase.get_reference('student_profiles').get()
-        all_profiles = list(profiles_ref.values()) if profiles_ref else []
-        
-        total_students = len(all_profiles) if all_profiles else 0
-        placed_students = len([p for p in all_profiles if p.get('placement_status') != 'Not Placed']) if all_profiles else 0
-        
-        # Department-wise statistics
-        dept_stats = {}
-        if all_profiles:
-            for profile in all_profiles:
-                dept = profile.get('department', 'Unknown')
-                if dept not in dept_stats:
-                    dept_stats[dept] = {
-                        'total': 0,
-                        'placed': 0,
-                        'avg_gpa': 0.0,
-                        'gpa_sum': 0.0
-                    }
-                dept_stats[dept]['total'] += 1
-                if profile.get('placement_status') != 'Not Placed':
-                    dept_stats[dept]['placed'] += 1
-                gpa = profile.get('gpa', 0.0)
-                if gpa:
-                    dept_stats[dept]['gpa_sum'] += gpa
-            
-            # Calculate averages
-            for dept, stats in dept_stats.items():
-                if stats['total'] > 0:
-                    stats['avg_gpa'] = round(stats['gpa_sum'] / stats['total'], 2)
-                stats['placement_rate'] = round((stats['placed'] / stats['total'] * 100), 1) if stats['total'] > 0 else 0
-        
-        # Get recent applications
+@roles_required("admin")
+@conditional_get(page=True)
+def admin_dashboard():
+    summary = analytics.summary()
+    if database_manager.db_type == "firebase":
         applications_ref = database_manager.job_manager.firebase.get_reference('job_applications').get()
         recent_applications = list(applications_ref.values())[:10] if applications_ref else []  # Last 10 applications
-        
     else:
-        # SQLite statistics
-        total_students = StudentProfile.query.count()
-        placed_students = StudentProfile.query.filter(StudentProfile.placement_status != "Not Placed").count()
-        
-        # Department-wise statistics
-        dept_stats = {}
-        dept_query = db.session.query(
-            StudentProfile.department,
-            db.func.count(StudentProfile.id).label('total'),
-            db.func.sum(db.case([(StudentProfile.placement_status != "Not Placed", 1)], else_=0)).label('placed'),
-            db.func.avg(StudentProfile.gpa).label('avg_gpa')
-        ).group_by(StudentProfile.department).all()
-        
-        for dept, total, placed, avg_gpa in dept_query:
-            dept_stats[dept] = {
-                'total': total,
-                'placed': placed,
-                'avg_gpa': round(avg_gpa, 2) if avg_gpa else 0.0,
-                'placement_rate': round((placed / total * 100), 1) if total > 0 else 0
-            }
-        
         recent_applications = JobApplication.query.order_by(JobApplication.applied_at.desc()).limit(10).all()
     
-    placement_rate = round((placed_students / total_students * 100), 1) if total_students > 0 else 0
-    
     return render_template(
         "admin_dashboard.html",
-        total_students=total_students,
-        placed_students=placed_students,
-        placement_rate=placement_rate,
-        dept_stats=dept_stats,
+        total_students=summary.total_students,
+        placed_students=summary.placed_students,
+        placement_rate=summary.placement_rate,
+        dept_stats=summary.dept_stats,
         recent_applications=recent_applications
     )
 
@@ -767,169 +2115,86 @@ def admin_dashboard():
 @roles_required("admin")
 def admin_export_report():
     """Export placement statistics report as CSV."""
-    import csv
-    from io import StringIO
-    from flask import Response
-    
-    # Get statistics from Firebase or SQLite based on database type
-    if database_manager.db_type == "firebase":
-        # Firebase data
-        profiles_ref = database_manager.profile_manager.firebase.get_reference('student_profiles').get()
-        all_profiles = list(profiles_ref.values()) if profiles_ref else []
-        
-        applications_ref = database_manager.job_manager.firebase.get_reference('job_applications').get()
-        all_applications = list(applications_ref.values()) if applications_ref else []
-        
-        # Prepare CSV data
-        output = StringIO()
-        writer = csv.writer(output)
+    def generate():
+        yield ['PyTech Arena Placement Report']
+        yield ['Generated on:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        yield []
         
-        # Write header
-        writer.writerow(['PyTech Arena Placement Report'])
-        writer.writerow(['Generated on:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
+        summary = analytics.summary()
         
-        # Overall Statistics
-        total_students = len(all_profiles) if all_profiles else 0
-        placed_students = len([p for p in all_profiles if p.get('placement_status') != 'Not Placed']) if all_profiles else 0
-        placement_rate = round((placed_students / total_students * 100), 1) if total_students > 0 else 0
-        
-        writer.writerow(['Overall Statistics'])
-        writer.writerow(['Total Students', total_students])
-        writer.writerow(['Placed Students', placed_students])
-        writer.writerow(['Placement Rate (%)', placement_rate])
-        writer.writerow([])
-        
-        # Department-wise Statistics
-        writer.writerow(['Department-wise Statistics'])
-        writer.writerow(['Department', 'Total Students', 'Placed Students', 'Placement Rate (%)', 'Average GPA'])
-        
-        dept_stats = {}
-        if all_profiles:
-            for profile in all_profiles:
-                dept = profile.get('department', 'Unknown')
-                if dept not in dept_stats:
-                    dept_stats[dept] = {'total': 0, 'placed': 0, 'gpa_sum': 0.0}
-                dept_stats[dept]['total'] += 1
-                if profile.get('placement_status') != 'Not Placed':
-                    dept_stats[dept]['placed'] += 1
-                gpa = profile.get('gpa', 0.0)
-                if gpa:
-                    dept_stats[dept]['gpa_sum'] += gpa
+        if database_manager.db_type == "firebase":
+            profiles_ref = database_manager.profile_manager.firebase.get_reference('student_profiles').get()
+            all_profiles = list(profiles_ref.values()) if profiles_ref else []
             
-            for dept, stats in dept_stats.items():
-                avg_gpa = round(stats['gpa_sum'] / stats['total'], 2) if stats['total'] > 0 else 0
-                placement_rate = round((stats['placed'] / stats['total'] * 100), 1) if stats['total'] > 0 else 0
-                writer.writerow([dept, stats['total'], stats['placed'], placement_rate, avg_gpa])
-        
-        writer.writerow([])
-        
-        # Student Details
-        writer.writerow(['Student Details'])
-        writer.writerow(['Name', 'Email', 'Department', 'GPA', 'Placement Status', 'Skills'])
-        
-        if all_profiles:
-            for profile in all_profiles:
-                writer.writerow([
+            students = (
+                [
                     profile.get('full_name', 'N/A'),
                     profile.get('email', 'N/A'),
                     profile.get('department', 'N/A'),
                     profile.get('gpa', 0.0),
                     profile.get('placement_status', 'Not Placed'),
                     profile.get('skills', 'N/A')
-                ])
+                ]
+                for profile in all_profiles
+            )
+        else:
+            students_query = db.session.query(
+                User.name, User.email, StudentProfile.department,
+                StudentProfile.gpa, StudentProfile.placement_status,
+                StudentProfile.skills
+            ).join(User)
+            students = (
+                [name, email, department, gpa, placement_status, skills or 'N/A']
+                for name, email, department, gpa, placement_status, skills in stream_query(students_query)
+            )
+        
+        # Overall Statistics
+        yield ['Overall Statistics']
+        yield ['Total Students', summary.total_students]
+        yield ['Placed Students', summary.placed_students]
+        yield ['Placement Rate (%)', summary.placement_rate]
+        yield []
+        
+        # Department-wise Statistics
+        yield ['Department-wise Statistics']
+        yield ['Department', 'Total Students', 'Placed Students', 'Placement Rate (%)', 'Average GPA']
+        for stats in summary.departments:
+            yield [stats.department, stats.total, stats.placed, stats.placement_rate, stats.avg_gpa]
+        yield []
         
-        writer.writerow([])
+        # Student Details
+        yield ['Student Details']
+        yield ['Name', 'Email', 'Department', 'GPA', 'Placement Status', 'Skills']
+        yield from students
+        yield []
         
         # Recent Applications
-        writer.writerow(['Recent Job Applications'])
-        writer.writerow(['Student Name', 'Job Title', 'Company', 'Status', 'Applied Date'])
+        yield ['Recent Job Applications']
+        yield ['Student Name', 'Job Title', 'Company', 'Status', 'Applied Date']
         
-        if all_applications:
+        if database_manager.db_type == "firebase":
+            applications_ref = database_manager.job_manager.firebase.get_reference('job_applications').get()
+            all_applications = list(applications_ref.values()) if applications_ref else []
             for app in all_applications[:20]:  # Last 20 applications
-                writer.writerow([
+                yield [
                     app.get('full_name', 'N/A'),
                     app.get('job_title', 'N/A'),
                     app.get('company_name', 'N/A'),
                     app.get('status', 'Applied'),
                     app.get('applied_at', 'N/A')
-                ])
-    
-    else:
-        # SQLite data
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['PyTech Arena Placement Report'])
-        writer.writerow(['Generated on:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow([])
-        
-        # Overall Statistics
-        total_students = StudentProfile.query.count()
-        placed_students = StudentProfile.query.filter(StudentProfile.placement_status != "Not Placed").count()
-        placement_rate = round((placed_students / total_students * 100), 1) if total_students > 0 else 0
-        
-        writer.writerow(['Overall Statistics'])
-        writer.writerow(['Total Students', total_students])
-        writer.writerow(['Placed Students', placed_students])
-        writer.writerow(['Placement Rate (%)', placement_rate])
-        writer.writerow([])
-        
-        # Department-wise Statistics
-        writer.writerow(['Department-wise Statistics'])
-        writer.writerow(['Department', 'Total Students', 'Placed Students', 'Placement Rate (%)', 'Average GPA'])
-        
-        dept_query = db.session.query(
-            StudentProfile.department,
-            db.func.count(StudentProfile.id).label('total'),
-            db.func.sum(db.case([(StudentProfile.placement_status != "Not Placed", 1)], else_=0)).label('placed'),
-            db.func.avg(StudentProfile.gpa).label('avg_gpa')
-        ).group_by(StudentProfile.department).all()
-        
-        for dept, total, placed, avg_gpa in dept_query:
-            placement_rate = round((placed / total * 100), 1) if total > 0 else 0
-            writer.writerow([dept, total, placed, placement_rate, round(avg_gpa, 2) if avg_gpa else 0.0])
-        
-        writer.writerow([])
-        
-        # Student Details
-        writer.writerow(['Student Details'])
-        writer.writerow(['Name', 'Email', 'Department', 'GPA', 'Placement Status', 'Skills'])
-        
-        students = db.session.query(StudentProfile, User).join(User).all()
-        for profile, user in students:
-            writer.writerow([
-                user.name,
-                user.email,
-                profile.department,
-                profile.gpa,
-                profile.placement_status,
-                profile.skills or 'N/A'
-            ])
-        
-        writer.writerow([])
-        
-        # Recent Applications
-        writer.writerow(['Recent Job Applications'])
-        writer.writerow(['Student Name', 'Job Title', 'Company', 'Status', 'Applied Date'])
-        
-        applications = JobApplication.query.order_by(JobApplication.applied_at.desc()).limit(20).all()
-        for app in applications:
-            writer.writerow([
-                app.full_name,
-                app.job_title,
-                app.company_name,
-                app.status,
-                app.applied_at.strftime('%Y-%m-%d %H:%M:%S') if app.applied_at else 'N/A'
-            ])
-    
-    # Create response
-    output.seek(0)
-    response = Response(output.getvalue(), mimetype='text/csv')
-    response.headers['Content-Disposition'] = f'attachment; filename=placement_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+                ]
+        else:
+            applications = JobApplication.query.order_by(JobApplication.applied_at.desc()).limit(20).all()
+            for app in applications:
+                yield [
+                    app.full_name,
+                    app.job_title,
+                    app.company_name,
+                    app.status,
+                    app.applied_at.strftime('%Y-%m-%d %H:%M:%S') if app.applied_at else 'N/A'
+                ]
     
-    return response
+    return csv_response(generate(), f'placement_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv')
 
 
 @app.route("/admin/student/<int:student_id>/status", methods=["POST"])
@@ -942,6 +2207,7 @@ def admin_update_status(student_id):
         if profile:
             status = request.form.get("placement_status")
             database_manager.update_student_profile(str(student_id), {'placement_status': status})
+            analytics_version.bump()
             flash("Placement status updated.", "success")
         else:
             flash("Student profile not found.", "danger")
@@ -959,10 +2225,12 @@ def admin_update_status(student_id):
 @app.route("/admin/management")
 @login_required
 @roles_required("admin")
+@conditional_get(page=True)
 def admin_management():
     """Admin management dashboard for students and recruiters."""
-    total_students = StudentProfile.query.count()
-    placed_students = StudentProfile.query.filter(StudentProfile.placement_status != "Not Placed").count()
+    summary = get_placement_summary()
+    total_students = summary['total_students']
+    placed_students = summary['placed_students']
     total_recruiters = User.query.filter_by(role="recruiter").count()
     placement_rate = (placed_students / total_students * 100) if total_students > 0 else 0
     
@@ -975,22 +2243,63 @@ def admin_management():
     )
 
 
+@app.route("/admin/students/import", methods=["POST"])
+@login_required
+@roles_required("admin")
+def admin_import_students():
+    """Start importing student accounts from an uploaded registrar CSV.
+
+    Hashing thousands of passwords takes far longer than a request may, so
+    the file is saved and imported by a background thread; progress is at
+    ``admin_import_status``.
+    """
+    upload = request.files.get("students_csv")
+    if not upload or not upload.filename:
+        flash("Please choose a CSV file to import.", "warning")
+        return redirect(url_for("admin_students"))
+
+    job = StudentImportJob(filename=secure_filename(upload.filename), requested_by=session["user_id"])
+    db.session.add(job)
+    db.session.commit()
+    os.makedirs(app.config["IMPORT_FOLDER"], exist_ok=True)
+    path = os.path.join(app.config["IMPORT_FOLDER"], f"{job.id}.csv")
+    upload.save(path)
+    threading.Thread(
+        target=run_student_import, args=(job.id, path, request.form.get("default_password") or None),
+        name=f"student-import-{job.id}", daemon=True,
+    ).start()
+
+    flash(f"Import #{job.id} started. Progress: {url_for('admin_import_status', job_id=job.id)}", "info")
+    return redirect(url_for("admin_students"))
+
+
+@app.route("/admin/students/import/<int:job_id>")
+@login_required
+@roles_required("admin")
+def admin_import_status(job_id):
+    """Progress of a background student import: status, counts and the first rejected rows."""
+    job = db.session.get(StudentImportJob, job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job.to_dict())
+
+
 @app.route("/admin/students")
 @login_required
 @roles_required("admin")
+@query_budget(6)
 def admin_students():
     department = request.args.get("department")
     min_gpa = request.args.get("min_gpa", type=float)
     skill = request.args.get("skill")
 
-    query = StudentProfile.query.join(User)
+    query = StudentProfile.query.join(User).options(contains_eager(StudentProfile.user))
 
     if department:
         query = query.filter(StudentProfile.department == department)
     if min_gpa is not None:
         query = query.filter(StudentProfile.gpa >= min_gpa)
-    if skill:
-        query = query.filter(StudentProfile.skills.ilike(f"%{skill}%"))
+    query = apply_candidate_search(query, skill)
 
     students = query.all()
     return render_template("admin_students.html", students=students)
@@ -1020,39 +2329,12 @@ def admin_recruiters():
 @app.route("/admin/analytics")
 @login_required
 @roles_required("admin")
+@conditional_get(page=True, period=3600)
 def admin_analytics():
     """Comprehensive analytics dashboard for admin."""
+    summary = analytics.summary()
+    
     if database_manager.db_type == "firebase":
-        # Firebase implementation
-        profiles_ref = database_manager.profile_manager.firebase.get_reference('student_profiles').get()
-        all_profiles = list(profiles_ref.values()) if profiles_ref else []
-        
-        # Student statistics
-        total_students = len(all_profiles)
-        placed_students = len([p for p in all_profiles if p.get('placement_status') != 'Not Placed'])
-        not_placed_students = total_students - placed_students
-        
-        # Department-wise statistics
-        dept_stats = {}
-        if all_profiles:
-            for profile in all_profiles:
-                dept = profile.get('department', 'Unknown')
-                if dept not in dept_stats:
-                    dept_stats[dept] = {
-                        'count': 0,
-                        'avg_gpa': 0.0,
-                        'gpa_sum': 0.0
-                    }
-                dept_stats[dept]['count'] += 1
-                gpa = profile.get('gpa', 0.0)
-                if gpa:
-                    dept_stats[dept]['gpa_sum'] += gpa
-            
-            # Calculate averages
-            for dept, stats in dept_stats.items():
-                if stats['count'] > 0:
-                    stats['avg_gpa'] = round(stats['gpa_sum'] / stats['count'], 2)
-        
         # Recruiter statistics
         users_ref = database_manager.user_manager.firebase.get_reference('users').get()
         recruiters = []
@@ -1067,45 +2349,26 @@ def admin_analytics():
                         active_recruiters += 1
         
         recruiter_success_rate = round((active_recruiters / len(recruiters) * 100), 1) if recruiters else 0
-        
-        # Recent registrations (last 7 days)
-        from datetime import datetime, timedelta
-        recent_students = 0  # Firebase doesn't store created_at by default
-        
     else:
-        # SQLite implementation
-        total_students = StudentProfile.query.count()
-        placed_students = StudentProfile.query.filter(StudentProfile.placement_status != "Not Placed").count()
-        not_placed_students = total_students - placed_students
-        
-        # Department-wise statistics
-        dept_stats = db.session.query(
-            StudentProfile.department,
-            db.func.count(StudentProfile.id).label('count'),
-            db.func.avg(StudentProfile.gpa).label('avg_gpa')
-        ).group_by(StudentProfile.department).all()
-        
         # Recruiter statistics - fetch all recruiter details
         recruiters = User.query.filter_by(role="recruiter").all()
-        total_recruiters = len(recruiters)
-        active_recruiters = total_recruiters  # Simplified for SQLite
-        recruiter_success_rate = 100.0 if total_recruiters > 0 else 0
-        
-        # Recent registrations (last 7 days)
-        from datetime import datetime, timedelta
-        recent_students = User.query.filter(
-            User.role == "student",
-            User.created_at >= datetime.utcnow() - timedelta(days=7)
-        ).count()
+        active_recruiters = len(recruiters)  # Simplified for SQLite
+        recruiter_success_rate = 100.0 if recruiters else 0
+    
+    # Recent registrations (the last 7 days, in whole days)
+    recent_students = sum(
+        bucket.count for bucket in
+        analytics.by_time_bucket("registrations", "day", since=datetime.utcnow() - timedelta(days=6))
+    )
     
     return render_template(
         "admin_analytics.html",
-        total_students=total_students,
-        placed_students=placed_students,
-        not_placed_students=not_placed_students,
-        placement_rate=(placed_students/total_students*100) if total_students > 0 else 0,
-        dept_stats=dept_stats,
-        total_recruiters=len(recruiters) if database_manager.db_type == "firebase" else total_recruiters,
+        total_students=summary.total_students,
+        placed_students=summary.placed_students,
+        not_placed_students=summary.not_placed_students,
+        placement_rate=summary.placement_rate,
+        dept_stats=summary.dept_stats,
+        total_recruiters=len(recruiters),
         active_recruiters=active_recruiters,
         recruiter_success_rate=recruiter_success_rate,
         recruiters=recruiters,
@@ -1118,81 +2381,27 @@ def admin_analytics():
 @roles_required("admin")
 def admin_analytics_export():
     """Export analytics data as CSV."""
-    import csv
-    from io import StringIO
-    from flask import Response
+    summary = analytics.summary()
     
-    # Get analytics data (reuse admin_analytics logic)
-    if database_manager.db_type == "firebase":
-        profiles_ref = database_manager.profile_manager.firebase.get_reference('student_profiles').get()
-        all_profiles = list(profiles_ref.values()) if profiles_ref else []
+    def generate():
+        yield ['PyTech Arena Analytics Report']
+        yield ['Generated on:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+        yield []
         
-        total_students = len(all_profiles)
-        placed_students = len([p for p in all_profiles if p.get('placement_status') != 'Not Placed'])
-        
-        # Department-wise statistics
-        dept_stats = {}
-        if all_profiles:
-            for profile in all_profiles:
-                dept = profile.get('department', 'Unknown')
-                if dept not in dept_stats:
-                    dept_stats[dept] = {
-                        'count': 0,
-                        'avg_gpa': 0.0,
-                        'gpa_sum': 0.0
-                    }
-                dept_stats[dept]['count'] += 1
-                gpa = profile.get('gpa', 0.0)
-                if gpa:
-                    dept_stats[dept]['gpa_sum'] += gpa
-            
-            for dept, stats in dept_stats.items():
-                if stats['count'] > 0:
-                    stats['avg_gpa'] = round(stats['gpa_sum'] / stats['count'], 2)
-    else:
-        # SQLite implementation
-        total_students = StudentProfile.query.count()
-        placed_students = StudentProfile.query.filter(StudentProfile.placement_status != "Not Placed").count()
+        # Overall Statistics
+        yield ['Overall Statistics']
+        yield ['Total Students', summary.total_students]
+        yield ['Placed Students', summary.placed_students]
+        yield ['Placement Rate (%)', summary.placement_rate]
+        yield []
         
-        dept_stats = db.session.query(
-            StudentProfile.department,
-            db.func.count(StudentProfile.id).label('count'),
-            db.func.avg(StudentProfile.gpa).label('avg_gpa')
-        ).group_by(StudentProfile.department).all()
-    
-    # Create CSV
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['PyTech Arena Analytics Report'])
-    writer.writerow(['Generated on:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')])
-    writer.writerow([])
-    
-    # Overall Statistics
-    writer.writerow(['Overall Statistics'])
-    writer.writerow(['Total Students', total_students])
-    writer.writerow(['Placed Students', placed_students])
-    writer.writerow(['Placement Rate (%)', round((placed_students/total_students*100), 1) if total_students > 0 else 0])
-    writer.writerow([])
-    
-    # Department-wise Statistics
-    writer.writerow(['Department-wise Statistics'])
-    writer.writerow(['Department', 'Total Students', 'Average GPA'])
-    
-    if database_manager.db_type == "firebase":
-        for dept, stats in dept_stats.items():
-            writer.writerow([dept, stats['count'], stats['avg_gpa']])
-    else:
-        for dept, count, avg_gpa in dept_stats:
-            writer.writerow([dept, count, round(avg_gpa, 2) if avg_gpa else 0.0])
-    
-    # Create response
-    output.seek(0)
-    response = Response(output.getvalue(), mimetype='text/csv')
-    response.headers['Content-Disposition'] = f'attachment; filename=analytics_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        # Department-wise Statistics
+        yield ['Department-wise Statistics']
+        yield ['Department', 'Total Students', 'Average GPA']
+        for stats in summary.departments:
+            yield [stats.department, stats.total, stats.avg_gpa]
     
-    return response
+    return csv_response(generate(), f'analytics_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv')
 
 
 @app.route("/admin/student/<int:student_id>/delete", methods=["POST"])
@@ -1236,6 +2445,7 @@ def admin_edit_recruiter(recruiter_id):
             'company_name': company_name
         }
         user_ref.update(updates)
+        database_manager.invalidate_user(recruiter_id)
     else:
         # SQLite implementation
         user = User.query.get_or_404(recruiter_id)
@@ -1249,6 +2459,8 @@ def admin_edit_recruiter(recruiter_id):
         user.company_name = company_name
         db.session.commit()
     
+    render_context_cache.pop(str(recruiter_id))
+    
     flash("Recruiter updated successfully.", "success")
     return redirect(url_for("admin_recruiters"))
 
@@ -1276,81 +2488,162 @@ def admin_delete_recruiter(recruiter_id):
 @roles_required("admin")
 def admin_export_recruiters():
     """Export recruiters data as CSV."""
-    import csv
-    from io import StringIO
-    from flask import Response
+    def generate():
+        yield ['ID', 'Name', 'Email', 'Company', 'Registration Date', 'Last Login']
+        
+        if database_manager.db_type == "firebase":
+            users_ref = database_manager.user_manager.firebase.get_reference('users').get()
+            for user_id, user_data in (users_ref or {}).items():
+                if user_data.get('role') != 'recruiter':
+                    continue
+                created_at = user_data.get('created_at', 'N/A')
+                yield [
+                    user_id,
+                    user_data.get('name', user_data.get('username', 'N/A')),
+                    user_data.get('email', 'N/A'),
+                    user_data.get('company_name', 'Not specified'),
+                    created_at[:10] if created_at != 'N/A' else 'N/A',
+                    user_data.get('last_login', 'Never')
+                ]
+        else:
+            for r in stream_query(User.query.filter_by(role="recruiter")):
+                yield [
+                    r.id,
+                    r.name,
+                    r.email,
+                    getattr(r, 'company_name', 'Not specified'),
+                    r.created_at.strftime('%Y-%m-%d') if r.created_at else 'N/A',
+                    r.last_login.strftime('%Y-%m-%d %H:%M') if getattr(r, 'last_login', None) else 'Never'
+                ]
     
-    # Get recruiters data
-    if database_manager.db_type == "firebase":
-        users_ref = database_manager.user_manager.firebase.get_reference('users').get()
-        recruiters = []
-        if users_ref:
-            for user_id, user_data in users_ref.items():
-                if user_data.get('role') == 'recruiter':
-                    recruiters.append({
-                        'id': user_id,
-                        'name': user_data.get('name', user_data.get('username', 'N/A')),
-                        'email': user_data.get('email', 'N/A'),
-                        'company_name': user_data.get('company_name', 'Not specified'),
-                        'created_at': user_data.get('created_at', 'N/A'),
-                        'last_login': user_data.get('last_login', 'Never')
-                    })
-    else:
-        recruiters_data = User.query.filter_by(role="recruiter").all()
-        recruiters = []
-        for r in recruiters_data:
-            recruiters.append({
-                'id': r.id,
-                'name': r.name,
-                'email': r.email,
-                'company_name': getattr(r, 'company_name', 'Not specified'),
-                'created_at': r.created_at.strftime('%Y-%m-%d') if r.created_at else 'N/A',
-                'last_login': r.last_login.strftime('%Y-%m-%d %H:%M') if getattr(r, 'last_login', None) else 'Never'
-            })
-    
-    # Create CSV
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(['ID', 'Name', 'Email', 'Company', 'Registration Date', 'Last Login'])
-    
-    for recruiter in recruiters:
-        writer.writerow([
-            recruiter['id'],
-            recruiter['name'],
-            recruiter['email'],
-            recruiter['company_name'],
-            recruiter['created_at'][:10] if recruiter['created_at'] != 'N/A' else 'N/A',
-            recruiter['last_login']
-        ])
-    
-    output.seek(0)
-    return Response(
-        output,
-        mimetype="text/csv",
-        headers={"Content-Disposition": "attachment;filename=recruiters_export.csv"}
-    )
+    return csv_response(generate(), "recruiters_export.csv")
 
 
 @app.route("/recruiter/dashboard")
 @login_required
 @roles_required("recruiter")
+@query_budget(8)
 def recruiter_dashboard():
+    students, next_students = recruiter_students_page()
+    job_applications, next_applications = recruiter_applications_page()
+    postings = JobPosting.query.filter_by(is_active=True).order_by(JobPosting.title).all()
+    
+    return render_template(
+        "recruiter_dashboard.html",
+        postings=postings,
+        students=students,
+        job_applications=job_applications,
+        next_students=next_students,
+        next_applications=next_applications
+    )
+
+
+def recruiter_students_page():
+    """One keyset page of candidates for the recruiter filters in request.args.
+    
+    Ordered by search relevance when a skill or resume search is given,
+    otherwise by (gpa, id) descending; ``students_after`` is the cursor.
+    """
     min_gpa = request.args.get("min_gpa", type=float, default=0.0)
     skill = request.args.get("skill")
+    # Keywords searched inside the text extracted from uploaded resumes
+    resume_text = request.args.get("resume_q")
     department = request.args.get("department")
+    # Comma separated skill lists: every one of all_skills, at least one of any_skills
+    all_skills = split_skills(request.args.get("all_skills"))
+    any_skills = split_skills(request.args.get("any_skills"))
+    # Only students on this posting's precomputed eligible-candidate list
+    job_id = request.args.get("job_id", type=int)
 
-    query = StudentProfile.query.join(User).filter(StudentProfile.gpa >= min_gpa)
-    if skill:
-        query = query.filter(StudentProfile.skills.ilike(f"%{skill}%"))
+    query = StudentProfile.query.join(User).options(contains_eager(StudentProfile.user)).filter(StudentProfile.gpa >= min_gpa)
     if department:
         query = query.filter(StudentProfile.department == department)
+    query = apply_skill_filters(query, all_skills, any_skills)
+    if job_id:
+        query = query.join(JobCandidate, JobCandidate.profile_id == StudentProfile.id).filter(JobCandidate.job_id == job_id)
+    query, score = search_candidates(query, skill)
+    query, resume_score = search_resumes(query, resume_text)
+    if resume_score is not None:
+        score = resume_score if score is None else (score + resume_score).label("score")
+
+    if score is not None:
+        sort_keys = [score, StudentProfile.id]
+    elif job_id:
+        # Same order as StudentProfile (gpa, id), read straight off ix_job_candidate_job_gpa
+        sort_keys = [JobCandidate.gpa, JobCandidate.profile_id]
+    else:
+        sort_keys = [StudentProfile.gpa, StudentProfile.id]
+    return keyset_paginate(
+        query, sort_keys,
+        cursor=request.args.get("students_after"),
+        per_page=request.args.get("per_page", type=int)
+    )
 
-    students = query.all()
-    
-    # Get all job applications ordered by most recent
-    job_applications = JobApplication.query.order_by(JobApplication.applied_at.desc()).all()
-    
-    return render_template("recruiter_dashboard.html", students=students, job_applications=job_applications)
+
+def recruiter_applications_page():
+    """One keyset page of job applications, newest first; ``applications_after`` is the cursor."""
+    return keyset_paginate(
+        JobApplication.query.options(joinedload(JobApplication.student)),
+        [JobApplication.applied_at, JobApplication.id],
+        cursor=request.args.get("applications_after"),
+        per_page=request.args.get("per_page", type=int)
+    )
+
+
+def serialize_student_profile(profile):
+    return {
+        'id': profile.id,
+        'name': profile.user.name if profile.user else None,
+        'email': profile.user.email if profile.user else None,
+        'department': profile.department,
+        'gpa': profile.gpa,
+        'skills': profile.skills,
+        'placement_status': profile.placement_status,
+        'has_resume': bool(profile.resume_filename)
+    }
+
+
+def serialize_job_application(application):
+    return {
+        'id': application.id,
+        'student_id': application.student_id,
+        'job_posting_id': application.job_posting_id,
+        'company_name': application.company_name,
+        'job_title': application.job_title,
+        'full_name': application.full_name,
+        'email': application.email,
+        'department': application.department,
+        'cgpa': application.cgpa,
+        'skills': application.skills,
+        'status': application.status,
+        'applied_at': application.applied_at.isoformat() if application.applied_at else None
+    }
+
+
+@app.route("/api/recruiter/students")
+@login_required
+@roles_required("recruiter")
+@query_budget(6)
+def api_recruiter_students():
+    """Keyset-paginated candidates for infinite scroll (same filters as the dashboard)."""
+    students, next_cursor = recruiter_students_page()
+    return jsonify({
+        'items': [serialize_student_profile(profile) for profile in students],
+        'next_cursor': next_cursor
+    })
+
+
+@app.route("/api/recruiter/applications")
+@login_required
+@roles_required("recruiter")
+@query_budget(6)
+def api_recruiter_applications():
+    """Keyset-paginated job applications for infinite scroll."""
+    applications, next_cursor = recruiter_applications_page()
+    return jsonify({
+        'items': [serialize_job_application(application) for application in applications],
+        'next_cursor': next_cursor
+    })
 
 
 @app.route("/student/upload", methods=["GET", "POST"])
@@ -1362,25 +2655,102 @@ def student_upload():
     profile = StudentProfile.query.filter_by(user_id=user_id).first()
     
     if request.method == "POST":
-        resume = request.files.get("resume")
-        photo = request.files.get("photo")
-        
-        if resume and resume.filename:
-            resume_filename = f"resume_{user_id}_{resume.filename}"
-            resume.save(os.path.join(app.config["UPLOAD_FOLDER"], resume_filename))
-            profile.resume_filename = resume_filename
-            flash("Resume uploaded successfully.", "success")
-        
-        if photo and photo.filename:
-            photo_filename = f"photo_{user_id}_{photo.filename}"
-            photo.save(os.path.join(app.config["UPLOAD_FOLDER"], photo_filename))
-            profile.photo_filename = photo_filename
-            flash("Photo uploaded successfully.", "success")
+        for kind, column in UPLOAD_KINDS.items():
+            upload = request.files.get(kind)
+            if not upload or not upload.filename:
+                continue
+            if not allowed_file(upload.filename):
+                flash(f"That {kind} file type is not allowed.", "danger")
+                continue
+            try:
+                setattr(profile, column, store_upload(upload, kind))
+                flash(f"{kind.capitalize()} uploaded successfully.", "success")
+            except BlobTooLarge:
+                flash(f"The {kind} file is too large.", "danger")
         
         db.session.commit()
         return redirect(url_for("student_dashboard"))
     
-    return render_template("student_upload.html", profile=profile)
+    return render_template("student_upload.html", profile=profile,
+                           upload_chunk_size=app.config["UPLOAD_CHUNK_SIZE"])
+
+
+def get_owned_upload(upload_id):
+    """Status of an upload session belonging to the logged-in student, or 404."""
+    try:
+        upload = resumable_uploads.status(upload_id)
+    except KeyError:
+        abort(404)
+    if upload["owner"] != str(session["user_id"]):
+        abort(404)
+    return upload
+
+
+@app.route("/student/uploads", methods=["POST"])
+@login_required
+@roles_required("student")
+def start_resumable_upload():
+    """Open a resumable upload session: JSON {kind, filename, size}."""
+    data = request.get_json(silent=True) or request.form
+    kind = data.get("kind")
+    filename = secure_filename(data.get("filename") or "")
+    try:
+        size = int(data.get("size"))
+    except (TypeError, ValueError):
+        size = -1
+    if kind not in UPLOAD_KINDS or not allowed_file(filename):
+        return jsonify({'error': 'Unsupported upload kind or file type'}), 400
+    if not 0 < size <= upload_limit(kind):
+        return jsonify({'error': f'Size must be between 1 and {upload_limit(kind)} bytes'}), 400
+
+    upload = resumable_uploads.create(session["user_id"], kind, filename, size)
+    upload["chunk_size"] = app.config["UPLOAD_CHUNK_SIZE"]
+    return jsonify(upload), 201
+
+
+@app.route("/student/uploads/<upload_id>", methods=["GET"])
+@login_required
+@roles_required("student")
+def resumable_upload_status(upload_id):
+    """Current offset of an upload, so an interrupted client knows where to resume."""
+    return jsonify(get_owned_upload(upload_id))
+
+
+@app.route("/student/uploads/<upload_id>", methods=["PUT"])
+@login_required
+@roles_required("student")
+def append_resumable_upload(upload_id):
+    """Append the request body at the Upload-Offset header; the last chunk attaches the file."""
+    get_owned_upload(upload_id)
+    try:
+        offset = int(request.headers.get("Upload-Offset", ""))
+        upload = resumable_uploads.append(upload_id, offset, request.stream)
+    except ValueError as e:
+        # UploadOffsetMismatch and BlobTooLarge are ValueErrors too
+        expected = getattr(e, "expected", None)
+        status = 409 if expected is not None else 400
+        return jsonify({'error': str(e), 'offset': expected}), status
+
+    if upload["offset"] < upload["size"]:
+        return jsonify(upload)
+
+    # Check before complete() consumes the upload, so it can still be finished later
+    profile = StudentProfile.query.filter_by(user_id=session["user_id"]).first()
+    if profile is None:
+        return jsonify({'error': 'Complete your profile before uploading documents'}), 409
+    name = resumable_uploads.complete(upload_id)
+    setattr(profile, UPLOAD_KINDS[upload["kind"]], name)
+    db.session.commit()
+    return jsonify(dict(upload, complete=True, stored_name=name))
+
+
+@app.route("/student/uploads/<upload_id>", methods=["DELETE"])
+@login_required
+@roles_required("student")
+def cancel_resumable_upload(upload_id):
+    get_owned_upload(upload_id)
+    resumable_uploads.discard(upload_id)
+    return "", 204
 
 
 @app.route("/student/status")
@@ -1484,16 +2854,19 @@ def contact_student(student_id):
 @roles_required("recruiter")
 def view_resume(student_id):
     """View student resume (recruiter function)."""
-    from flask import send_from_directory
     profile = StudentProfile.query.get_or_404(student_id)
     
     if profile.resume_filename:
-        # Serve the resume file
-        return send_from_directory(
-            app.config["UPLOAD_FOLDER"],
-            profile.resume_filename,
-            as_attachment=False
-        )
+        # Serve the resume with ETag/Range support, or hand it to the front-end server
+        try:
+            return send_blob(
+                blob_store, profile.resume_filename,
+                max_age=app.config["RESUME_CACHE_MAX_AGE"],
+                mode=app.config["RESUME_SENDFILE"],
+                accel_prefix=app.config["RESUME_ACCEL_PREFIX"],
+            )
+        except FileNotFoundError:
+            abort(404)
     else:
         flash("This student has not uploaded a resume yet.", "warning")
         return redirect(url_for("recruiter_dashboard"))
@@ -1507,7 +2880,12 @@ def admin_login():
         password = request.form.get("password")
         
         # Use database manager to verify admin credentials (consistent with regular login)
-        user = database_manager.verify_password(email, password)
+        try:
+            user = database_manager.verify_password(email, password)
+        except PasswordHasherBusy:
+            app.logger.warning(f'Admin login rejected, password hashing queue full: {password_hasher.stats()}')
+            flash("The server is busy. Please try logging in again in a moment.", "warning")
+            return render_template("admin_login.html"), 503
         
         if not user:
             flash("Admin account not found. Please check your credentials.", "danger")
@@ -1673,9 +3051,154 @@ def init_db():
         db.session.commit()
         print("Sample job postings created.")
     
+    rebuild_placement_stats()
+    rebuild_student_skills()
     print("Database initialization complete!")
 
 
+# Queries the app runs on (almost) every request; checked by `flask index-report`
+index_advisor = IndexAdvisor()
+
+
+@index_advisor.hot_query("profile by user")
+def _hot_profile_by_user():
+    return StudentProfile.query.filter_by(user_id="1")
+
+
+@index_advisor.hot_query("students by department and status")
+def _hot_students_by_department():
+    return StudentProfile.query.filter(
+        StudentProfile.department == "CSE", StudentProfile.placement_status != "Not Placed"
+    )
+
+
+@index_advisor.hot_query("students by placement status")
+def _hot_students_by_status():
+    return StudentProfile.query.filter(StudentProfile.placement_status == "Placed")
+
+
+@index_advisor.hot_query("candidate page by gpa")
+def _hot_candidate_page():
+    return StudentProfile.query.filter(StudentProfile.gpa >= 7.0).order_by(
+        StudentProfile.gpa.desc(), StudentProfile.id.desc()
+    ).limit(26)
+
+
+@index_advisor.hot_query("unread notifications")
+def _hot_unread_notifications():
+    return db.select(db.func.count(Notification.id)).where(
+        Notification.user_id == 1, Notification.is_read.is_(False)
+    )
+
+
+@index_advisor.hot_query("notification list")
+def _hot_notification_list():
+    return Notification.query.filter_by(user_id=1).order_by(Notification.created_at.desc())
+
+
+@index_advisor.hot_query("existing application check")
+def _hot_existing_application():
+    return JobApplication.query.filter_by(student_id=1, job_posting_id=1)
+
+
+@index_advisor.hot_query("student applications")
+def _hot_student_applications():
+    return JobApplication.query.filter_by(student_id=1).order_by(JobApplication.applied_at.desc())
+
+
+@index_advisor.hot_query("recent applications page")
+def _hot_recent_applications():
+    return JobApplication.query.order_by(
+        JobApplication.applied_at.desc(), JobApplication.id.desc()
+    ).limit(26)
+
+
+@index_advisor.hot_query("applications by posting and status")
+def _hot_applications_by_posting():
+    return JobApplication.query.filter_by(job_posting_id=1, status="Shortlisted")
+
+
+@index_advisor.hot_query("active job postings")
+def _hot_active_jobs():
+    return JobPosting.query.filter_by(is_active=True)
+
+
+@index_advisor.hot_query("users by role")
+def _hot_users_by_role():
+    return User.query.filter_by(role="recruiter")
+
+
+@app.cli.command("index-report")
+def index_report():
+    """EXPLAIN QUERY PLAN every hot query and flag full table scans."""
+    import sys
+    
+    with db.engine.connect() as connection:
+        plans = index_advisor.report(connection)
+    
+    flagged = 0
+    for plan in plans:
+        if plan.full_scans:
+            status = "FULL SCAN"
+        elif plan.temp_sorts:
+            status = "temp sort"
+        else:
+            status = "ok"
+        print(f"[{status}] {plan.name}")
+        for step in plan.steps:
+            print(f"    {step}")
+        if plan.full_scans:
+            flagged += 1
+    
+    print(f"{len(plans)} hot queries checked, {flagged} with full table scans.")
+    if flagged:
+        sys.exit(1)
+
+
+@app.cli.command("rebuild-search-index")
+def rebuild_search_index():
+    """Re-index every student profile in the candidate search index."""
+    if not candidate_search.available():
+        print("Full-text search is not available on this database; using substring filtering.")
+        return
+    with db.engine.begin() as connection:
+        count = candidate_search.rebuild(connection)
+    print(f"Indexed {count} student profiles.")
+
+
+@app.cli.command("rebuild-skills")
+def rebuild_skills():
+    """Re-derive the skill dictionary and student_skill rows from profiles."""
+    rebuild_student_skills()
+    print(f"Skill index rebuilt: {Skill.query.count()} distinct skills.")
+
+
+@app.cli.command("rebuild-stats")
+def rebuild_stats():
+    """Recompute the materialized placement_stats summary from student profiles."""
+    rebuild_placement_stats()
+    summary = get_placement_summary()
+    print(f"Placement stats rebuilt: {summary['total_students']} students, "
+          f"{summary['placed_students']} placed, {len(summary['dept_stats'])} departments.")
+
+
+@app.cli.command("rebuild-funnels")
+def rebuild_funnels():
+    """Recount the per-posting and per-company application funnel counters."""
+    count = application_funnel.rebuild(db.session.connection(), JobApplication.__table__)
+    db.session.commit()
+    print(f"Application funnels rebuilt from {count} applications.")
+
+
+@app.cli.command("rebuild-analytics-rollups")
+def rebuild_analytics_rollups():
+    """Recompute the hourly and daily analytics rollups from the event log."""
+    count = event_log.rebuild_rollups(db.session.connection())
+    db.session.commit()
+    analytics.invalidate()
+    print(f"Analytics rollups rebuilt from {count} events.")
+
+
 # Company data
 COMPANIES = {
     "cognizant": {
@@ -1818,7 +3341,7 @@ def update_application_status(application_id):
     application = JobApplication.query.get_or_404(application_id)
     new_status = request.form.get("status")
     
-    if new_status in ["Pending", "Reviewed", "Shortlisted", "Rejected"]:
+    if new_status in APPLICATION_STATUSES:
         application.status = new_status
         db.session.commit()
         flash(f"Application status updated to {new_status} successfully!", "success")
@@ -1828,6 +3351,48 @@ def update_application_status(application_id):
     return redirect(url_for("recruiter_dashboard"))
 
 
+@app.route("/api/recruiter/applications/status", methods=["POST"])
+@login_required
+@roles_required("recruiter")
+def api_bulk_application_status():
+    """Move many applications to one status and notify their students.
+
+    JSON body: ``{"status": "Shortlisted", "ids": [1, 2, ...]}`` or
+    ``{"status": "Shortlisted", "filter": {"job_posting_id": 7, "status": "Reviewed"}}``.
+    Returns counts of updated, unchanged and unknown applications.
+    """
+    data = request.get_json(silent=True) or {}
+    status = data.get("status")
+    if status not in APPLICATION_STATUSES:
+        return jsonify({"error": f"status must be one of {', '.join(APPLICATION_STATUSES)}"}), 400
+    ids, filters = data.get("ids"), data.get("filter")
+    if (ids is None) == (filters is None):
+        return jsonify({"error": "Give either ids or filter"}), 400
+
+    if ids is not None:
+        if not isinstance(ids, list) or not all(type(application_id) is int for application_id in ids):
+            return jsonify({"error": "ids must be a list of application ids"}), 400
+        if len(ids) > app.config["BULK_STATUS_MAX_IDS"]:
+            return jsonify({"error": f"At most {app.config['BULK_STATUS_MAX_IDS']} ids per request"}), 400
+        report = bulk_status_updater.update(status, ids=ids)
+    else:
+        # A filter is scoped to one posting; a status alone would reach every application
+        if not isinstance(filters, dict) or set(filters) - {"job_posting_id", "status"}:
+            return jsonify({"error": "filter takes job_posting_id and optionally status"}), 400
+        if type(filters.get("job_posting_id")) is not int:
+            return jsonify({"error": "filter needs an integer job_posting_id"}), 400
+        where = [JobApplication.job_posting_id == filters["job_posting_id"]]
+        if "status" in filters:
+            if filters["status"] not in APPLICATION_STATUSES:
+                return jsonify({"error": f"filter status must be one of {', '.join(APPLICATION_STATUSES)}"}), 400
+            where.append(JobApplication.status == filters["status"])
+        report = bulk_status_updater.update(status, where=where)
+
+    app.logger.info(f'Recruiter {session["user_id"]} moved {report.updated} applications to {status} '
+                    f'in {report.chunks} chunks ({report.seconds:.2f}s)')
+    return jsonify(report.as_dict())
+
+
 # Company Management Routes
 @app.route("/admin/companies")
 @login_required
@@ -1904,9 +3469,10 @@ def admin_delete_company(company_id):
 @app.route("/admin/jobs")
 @login_required
 @roles_required("admin")
+@query_budget(6)
 def admin_jobs():
     """Manage job postings."""
-    jobs = JobPosting.query.join(Company).all()
+    jobs = JobPosting.query.join(Company).options(contains_eager(JobPosting.company)).all()
     companies = Company.query.all()
     return render_template("admin_jobs.html", jobs=jobs, companies=companies)
 
@@ -2000,6 +3566,80 @@ def notifications():
     return render_template("notifications.html", notifications=notifications)
 
 
+@app.route("/api/admin/password-hasher")
+@login_required
+@roles_required("admin")
+def api_password_hasher_stats():
+    """Queue depth and counters of this worker's password hashing pool."""
+    return jsonify(password_hasher.stats())
+
+
+@app.route("/api/jobs/<int:job_id>/candidates")
+@login_required
+@roles_required("admin", "recruiter")
+@query_budget(6)
+def api_job_candidates(job_id):
+    """Keyset-paginated eligible students of a posting, highest GPA first.
+
+    Served from the precomputed job_candidate list; ``after`` is the cursor.
+    """
+    job = JobPosting.query.get_or_404(job_id)
+    query = (
+        StudentProfile.query.join(JobCandidate, JobCandidate.profile_id == StudentProfile.id)
+        .join(User).options(contains_eager(StudentProfile.user))
+        .filter(JobCandidate.job_id == job.id)
+    )
+    students, next_cursor = keyset_paginate(
+        query, [JobCandidate.gpa, JobCandidate.profile_id],
+        cursor=request.args.get("after"),
+        per_page=request.args.get("per_page", type=int)
+    )
+    return jsonify({
+        'job_id': job.id,
+        'criteria': job_criteria(job)._asdict(),
+        'total': job_candidates.count(db.session.connection(), job.id),
+        'items': [serialize_student_profile(profile) for profile in students],
+        'next_cursor': next_cursor
+    })
+
+
+@app.route("/api/live")
+@login_required
+def live_events():
+    """Server-sent event stream of the user's new notifications and application status changes.
+
+    A reconnecting browser sends ``Last-Event-ID`` and first receives what
+    it missed. The database session is released before streaming starts,
+    so an open stream holds no connection.
+    """
+    if database_manager.db_type == "firebase" or not app.config["LIVE_EVENTS_ENABLED"]:
+        abort(404)
+    if live_broker.connections >= app.config["LIVE_EVENTS_MAX_STREAMS"]:
+        return jsonify({"error": "Too many live connections, try again later"}), 503, {"Retry-After": "30"}
+
+    user_id = str(session["user_id"])
+    cursor = parse_cursor(request.headers.get("Last-Event-ID"))
+    subscription = live_broker.subscribe(user_id, cursor)
+    try:
+        backlog = fetch_live_events(cursor, user_id) if cursor else []
+    except Exception:
+        live_broker.unsubscribe(subscription)
+        raise
+    db.session.remove()
+
+    response = app.response_class(
+        live_broker.stream(
+            subscription, backlog,
+            heartbeat=app.config["LIVE_EVENTS_HEARTBEAT"],
+            lifetime=app.config["LIVE_EVENTS_LIFETIME"] or None,
+        ),
+        mimetype="text/event-stream",
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Don't let nginx buffer the stream
+    return response
+
+
 @app.route("/api/notifications/mark-read/<int:notification_id>", methods=["POST"])
 @login_required
 def mark_notification_read(notification_id):
@@ -2019,19 +3659,21 @@ def mark_notification_read(notification_id):
 @app.route("/student/jobs")
 @login_required
 @roles_required("student")
+@query_budget(10)  # 6 plus the eligibility matcher's occasional 4-query reload
 def student_jobs():
     """View available job postings."""
     user_id = session["user_id"]
     profile = StudentProfile.query.filter_by(user_id=user_id).first()
     
-    # Get active job postings
-    jobs = JobPosting.query.filter_by(is_active=True).join(Company).all()
-    
-    # Filter jobs based on student profile
-    eligible_jobs = []
-    for job in jobs:
-        if profile.gpa >= 6.0:  # Basic GPA requirement
-            eligible_jobs.append(job)
+    # Active job postings whose parsed eligibility criteria the student meets
+    if profile is not None:
+        eligible_ids = eligibility_matcher.jobs_for_student(profile.gpa, profile.department, split_skills(profile.skills))
+    else:
+        eligible_ids = []
+    eligible_jobs = (
+        JobPosting.query.filter(JobPosting.id.in_(eligible_ids)).join(Company)
+        .options(contains_eager(JobPosting.company)).order_by(JobPosting.id).all()
+    ) if eligible_ids else []
     
     # Get student's applications
     applications = JobApplication.query.filter_by(student_id=user_id).all()
@@ -2077,15 +3719,13 @@ def student_apply_job(job_id):
         )
         
         db.session.add(application)
-        db.session.commit()
-        
-        # Create notification for student
-        create_notification(
+        enqueue_notification(
             user_id,
             "Application Submitted",
             f"Your application for {job.title} at {job.company.name} has been submitted successfully.",
             "success"
         )
+        db.session.commit()
         
         flash("Application submitted successfully!", "success")
         return redirect(url_for("student_jobs"))
@@ -2107,6 +3747,7 @@ def student_applications():
 @app.route("/admin/reports")
 @login_required
 @roles_required("admin")
+@conditional_get(page=True)
 def admin_reports():
     """Generate placement reports."""
     report_data = generate_placement_report()
@@ -2118,50 +3759,46 @@ def admin_reports():
 @roles_required("admin")
 def export_csv_report():
     """Export placement data as CSV file."""
-    import csv
-    from io import StringIO
-    
-    # Get student data
     students = db.session.query(
         User.name, User.email, StudentProfile.department, 
         StudentProfile.gpa, StudentProfile.placement_status,
         StudentProfile.skills
-    ).join(StudentProfile).all()
-    
-    # Create CSV in memory
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow(['Name', 'Email', 'Department', 'GPA', 'Placement Status', 'Skills'])
-    
-    # Write data
-    for student in students:
-        writer.writerow([
-            student.name, student.email, student.department,
-            student.gpa, student.placement_status, student.skills or ""
-        ])
-    
-    # Create response
-    output.seek(0)
-    return app.response_class(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=placement_report.csv'}
-    )
+    ).join(StudentProfile)
+    
+    def generate():
+        yield ['Name', 'Email', 'Department', 'GPA', 'Placement Status', 'Skills']
+        for student in stream_query(students):
+            yield [
+                student.name, student.email, student.department,
+                student.gpa, student.placement_status, student.skills or ""
+            ]
+    
+    return csv_response(generate(), "placement_report.csv")
 
 
 @app.route("/api/analytics/dashboard")
 @login_required
 @roles_required("admin")
+@conditional_get(page=False)
+@query_budget(6)
 def api_analytics_dashboard():
-    """API endpoint for dashboard analytics."""
+    """API endpoint for dashboard analytics.
+    
+    Funnels come straight from the application_funnel counters, one read
+    per scope, so no query here aggregates JobApplication rows.
+    """
     report_data = generate_placement_report()
+    if database_manager.db_type == "firebase":
+        posting_funnels, overall = [], None
+    else:
+        connection = db.session.connection()
+        posting_funnels = application_funnel.funnels(connection, POSTING, label=JobPosting.__table__.c.title)
+        overall = next(iter(application_funnel.funnels(connection, ALL)), None)
     
     # Prepare chart data
-    dept_labels = [dept.department for dept in report_data['dept_stats']]
-    dept_placed = [dept.placed for dept in report_data['dept_stats']]
-    dept_total = [dept.total for dept in report_data['dept_stats']]
+    dept_labels = [dept['department'] for dept in report_data['dept_stats']]
+    dept_placed = [dept['placed'] for dept in report_data['dept_stats']]
+    dept_total = [dept['total'] for dept in report_data['dept_stats']]
     
     return jsonify({
         'summary': {
@@ -2181,7 +3818,70 @@ def api_analytics_dashboard():
                 'shortlisted': company.shortlisted
             }
             for company in report_data['company_stats']
-        ]
+        ],
+        'funnel': {
+            'stages': ['applied'] + list(STAGE_COLUMNS.values()),
+            'overall': overall.as_dict() if overall else None,
+            'companies': [
+                dict(funnel.as_dict(), company_id=funnel.scope_id, name=funnel.name)
+                for funnel in report_data['company_funnels']
+            ],
+            'postings': [
+                dict(funnel.as_dict(), job_posting_id=funnel.scope_id, title=funnel.name)
+                for funnel in posting_funnels
+            ]
+        }
+    })
+
+
+# Default range of /api/analytics/timeseries per bucket, and the most buckets one response may hold
+TIMESERIES_DEFAULT_RANGE = {
+    "hour": timedelta(hours=48),
+    "day": timedelta(days=30),
+    "week": timedelta(weeks=12),
+    "month": timedelta(days=365),
+}
+MAX_TIMESERIES_POINTS = 2000
+
+
+@app.route("/api/analytics/timeseries")
+@login_required
+@roles_required("admin")
+@conditional_get(page=False, period=3600)
+@query_budget(3)
+def api_analytics_timeseries():
+    """Counts per hour/day/week/month for registrations, applications, status changes and placements.
+
+    Query: ``metrics`` (comma separated; e.g. shortlists, rejections or
+    any ``status:<Status>``), ``bucket``, ``start`` and ``end`` (ISO
+    dates). Served from the event log rollups; empty buckets are zeros.
+    """
+    bucket = request.args.get("bucket", "day")
+    if bucket not in TIMESERIES_DEFAULT_RANGE:
+        return jsonify({'error': f"bucket must be one of {', '.join(TIMESERIES_DEFAULT_RANGE)}"}), 400
+    metrics = [m.strip() for m in request.args.get("metrics", "").split(",") if m.strip()] or list(DEFAULT_METRICS)
+    try:
+        end = datetime.fromisoformat(request.args["end"]) if request.args.get("end") else datetime.utcnow()
+        start = (
+            datetime.fromisoformat(request.args["start"]) if request.args.get("start")
+            else end - TIMESERIES_DEFAULT_RANGE[bucket]
+        )
+    except ValueError:
+        return jsonify({'error': 'start and end must be ISO dates (YYYY-MM-DD[THH:MM])'}), 400
+    if start >= end:
+        return jsonify({'error': 'start must be before end'}), 400
+    if bucket_count(start, end, bucket) > MAX_TIMESERIES_POINTS:
+        return jsonify({'error': f'range covers more than {MAX_TIMESERIES_POINTS} {bucket} buckets'}), 400
+    
+    series = event_log.series(db.session.connection(), metrics, start, end, bucket)
+    return jsonify({
+        'bucket': bucket,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'series': {
+            metric: [{'bucket': point.bucket, 'count': point.count} for point in points]
+            for metric, points in series.items()
+        }
     })
 
 
@@ -2217,6 +3917,15 @@ def admin_add_drive():
             if company:
                 drive.participating_companies.append(company)
         
+        # Notify every student who has not been placed yet (the same rule as analytics.is_placed)
+        enqueue_notifications(
+            db.select(User.id).join(StudentProfile).filter(db.or_(
+                StudentProfile.placement_status == NOT_PLACED, StudentProfile.placement_status.is_(None)
+            )),
+            "New Placement Drive",
+            f"{drive.name} runs from {drive.start_date:%d %b %Y} to {drive.end_date:%d %b %Y}.",
+            "info"
+        )
         db.session.commit()
         flash("Placement drive added successfully!", "success")
         return redirect(url_for("admin_drives"))
@@ -2237,6 +3946,118 @@ def admin_delete_drive(drive_id):
     return redirect(url_for("admin_drives"))
 
 
+@app.cli.command("import-students")
+@click.argument("csv_file", type=click.File("rb"))
+@click.option("--default-password", help="Password for rows without a password column value.")
+def import_students_command(csv_file, default_password):
+    """Create student accounts from a registrar CSV (name, email, department, gpa, ...)"""
+    report = student_importer.import_csv(
+        csv_file, default_password=default_password,
+        progress=lambda created: print(f"  {created} students created", end="\r")
+    )
+    print(f"Created {report.created} students in {report.seconds:.1f}s "
+          f"({report.rows_per_second:.0f} rows/s), {len(report.errors)} rows rejected")
+    for error in report.errors:
+        print(f"  line {error.line} {error.email}: {error.message}")
+
+
+@app.cli.command("migrate-uploads")
+def migrate_uploads_command():
+    """Move legacy uploads into the content-addressed store and drop duplicates"""
+    migrated = {}
+    profiles = StudentProfile.query.filter(
+        db.or_(StudentProfile.resume_filename.isnot(None), StudentProfile.photo_filename.isnot(None))
+    )
+    for profile in profiles:
+        for column in UPLOAD_KINDS.values():
+            name = getattr(profile, column)
+            if not name or blob_store.is_stored(name):
+                continue
+            legacy_path = blob_store.path(name)
+            if not os.path.isfile(legacy_path):
+                print(f"  missing: {name}")
+                continue
+            if legacy_path not in migrated:
+                migrated[legacy_path] = blob_store.import_file(legacy_path)
+            setattr(profile, column, migrated[legacy_path])
+    db.session.commit()
+
+    for legacy_path in migrated:
+        os.remove(legacy_path)
+    print(f"Migrated {len(migrated)} files into {len(set(migrated.values()))} blobs")
+
+
+@app.cli.command("expire-uploads")
+def expire_uploads_command():
+    """Delete resumable upload sessions abandoned for longer than UPLOAD_SESSION_TTL"""
+    expired = resumable_uploads.expire(app.config["UPLOAD_SESSION_TTL"])
+    print(f"Expired {expired} abandoned upload sessions")
+
+
+@app.cli.command("extract-resumes")
+@click.option("--all", "requeue_all", is_flag=True, help="Re-extract every uploaded resume, not just pending jobs.")
+@click.option("--stale-after", type=float, default=3600, show_default=True,
+              help="Seconds after which a job still marked running is retried.")
+def extract_resumes_command(requeue_all, stale_after):
+    """Run pending resume text extraction jobs now and summarize the job table"""
+    if requeue_all:
+        print(f"Queued {enqueue_resume_extraction()} resumes")
+    requeued = resume_extractor.requeue_stale(stale_after)
+    if requeued:
+        print(f"Retrying {requeued} stalled jobs")
+    print(f"Processed {resume_extractor.drain()} extraction jobs")
+
+    jobs = ResumeExtractionJob.__table__
+    summary = db.session.execute(
+        db.select(jobs.c.status, db.func.count(), db.func.avg(jobs.c.duration_ms), db.func.max(jobs.c.duration_ms))
+        .group_by(jobs.c.status).order_by(jobs.c.status)
+    ).all()
+    for status, count, avg_ms, max_ms in summary:
+        timing = f", avg {avg_ms:.0f} ms, max {max_ms} ms" if avg_ms is not None else ""
+        print(f"  {status}: {count}{timing}")
+
+
+@app.cli.command("rebuild-job-candidates")
+def rebuild_job_candidates_command():
+    """Recompute every posting's eligible-candidate list from scratch"""
+    with db.engine.begin() as connection:
+        count = job_candidates.rebuild_all(connection)
+    print(f"Stored {count} eligible (job, student) pairs.")
+
+
+@app.cli.command("eligibility-report")
+@click.option("--reparse", is_flag=True, help="Re-parse every job's eligibility text first.")
+def eligibility_report_command(reparse):
+    """Evaluate every student against every active job and print eligible counts"""
+    if reparse:
+        backfill_job_eligibility()
+    started = time.perf_counter()
+    eligibility_matcher.refresh()
+    loaded = time.perf_counter()
+    job_ids, student_ids, eligible = eligibility_matcher.matrix()
+    finished = time.perf_counter()
+    print(f"{len(student_ids)} students x {len(job_ids)} active jobs: "
+          f"loaded in {(loaded - started) * 1000:.0f} ms, matched in {(finished - loaded) * 1000:.1f} ms")
+    jobs = {job.id: job for job in JobPosting.query.filter(JobPosting.id.in_(job_ids.tolist()))}
+    for job_id, count in zip(job_ids.tolist(), eligible.sum(axis=1).tolist()):
+        print(f"  #{job_id} {jobs[job_id].title}: {count} eligible {job_criteria(jobs[job_id])}")
+
+
+@app.cli.command("drain-notifications")
+def drain_notifications_command():
+    """Deliver every queued notification now"""
+    count = notification_dispatcher.drain()
+    print(f"Delivered {count} queued notifications")
+
+
+@app.cli.command("sqlite-settings")
+def sqlite_settings_command():
+    """Print the effective SQLite pragmas and pool configuration"""
+    print(f"Profile: {app.config['SQLITE_PROFILE']}")
+    for name, value in effective_settings(db.engine).items():
+        print(f"  {name}: {value}")
+
+
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
@@ -0,0 +1,176 @@
+"""
+Application Funnel Counters for PyTech Arena
+Per-posting, per-company and overall counts of applications at each stage
+(applied, pending, reviewed, shortlisted, rejected, placed), adjusted by
+deltas as applications are submitted and their status changes
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import sqlalchemy as sa
+
+
+# Application status -> counter column; "applied" counts every application
+STAGE_COLUMNS = {
+    "Pending": "pending",
+    "Reviewed": "reviewed",
+    "Shortlisted": "shortlisted",
+    "Rejected": "rejected",
+    "Placed": "placed",
+}
+COUNTER_COLUMNS = ("applied",) + tuple(STAGE_COLUMNS.values())
+
+POSTING = "posting"
+COMPANY = "company"
+ALL = "all"
+
+
+class Funnel(NamedTuple):
+    scope: str
+    scope_id: int
+    applied: int
+    pending: int
+    reviewed: int
+    shortlisted: int
+    rejected: int
+    placed: int
+    # Company name or posting title when read with a label column
+    name: Optional[str] = None
+
+    @property
+    def shortlist_rate(self) -> float:
+        """Share of applications shortlisted or placed, in percent."""
+        return round((self.shortlisted + self.placed) / self.applied * 100, 1) if self.applied else 0
+
+    @property
+    def placement_rate(self) -> float:
+        return round(self.placed / self.applied * 100, 1) if self.applied else 0
+
+    def as_dict(self) -> Dict:
+        counts = {column: getattr(self, column) for column in COUNTER_COLUMNS}
+        return dict(counts, shortlist_rate=self.shortlist_rate, placement_rate=self.placement_rate)
+
+
+class ApplicationFunnel:
+    """Maintains ``(scope, scope_id) -> counters`` rows.
+
+    Every application counts towards its posting, the posting's company
+    and the ``all`` row; applications without a posting (the legacy
+    free-text apply form) only count towards ``all``. Changes are applied
+    as ``UPDATE ... SET col = col + :delta`` through the caller's
+    connection, so they commit with the application change itself.
+    """
+
+    def __init__(self, table, posting_table):
+        self.table = table
+        self.postings = posting_table
+
+    @staticmethod
+    def contribution(job_posting_id: Optional[int], status: Optional[str], sign: int) -> Tuple:
+        """``(posting id, {column: delta})`` one application adds (sign=1) or removes (sign=-1)."""
+        deltas = {"applied": sign}
+        if status in STAGE_COLUMNS:
+            deltas[STAGE_COLUMNS[status]] = sign
+        return job_posting_id, deltas
+
+    def _company_ids(self, connection, posting_ids) -> Dict[int, int]:
+        posting_ids = [posting_id for posting_id in posting_ids if posting_id is not None]
+        if not posting_ids:
+            return {}
+        rows = connection.execute(
+            sa.select(self.postings.c.id, self.postings.c.company_id).where(self.postings.c.id.in_(posting_ids))
+        )
+        return dict(rows.all())
+
+    def apply(self, connection, contributions: Iterable[Tuple]) -> None:
+        """Add the ``(posting id, {column: delta})`` contributions to every scope they count towards."""
+        contributions = list(contributions)
+        if not contributions:
+            return
+        company_of = self._company_ids(connection, {posting_id for posting_id, _ in contributions})
+        totals: Dict[Tuple[str, int], Dict[str, int]] = {}
+
+        def add(key, deltas):
+            entry = totals.setdefault(key, {})
+            for column, delta in deltas.items():
+                entry[column] = entry.get(column, 0) + delta
+
+        for posting_id, deltas in contributions:
+            add((ALL, 0), deltas)
+            if posting_id is not None:
+                add((POSTING, posting_id), deltas)
+                if posting_id in company_of:
+                    add((COMPANY, company_of[posting_id]), deltas)
+
+        self._add(connection, totals)
+
+    def move_posting(self, connection, posting_id: int, old_company_id: Optional[int], new_company_id: int) -> None:
+        """Move a posting's counts from its old company's row to its new one.
+
+        Call before applying contributions from the same flush, which
+        already count towards the new company.
+        """
+        table = self.table
+        row = connection.execute(
+            sa.select(*[table.c[column] for column in COUNTER_COLUMNS])
+            .where(table.c.scope == POSTING, table.c.scope_id == posting_id)
+        ).first()
+        if row is None:
+            return
+        counts = dict(row._mapping)
+        totals = {(COMPANY, new_company_id): counts}
+        if old_company_id is not None:
+            totals[(COMPANY, old_company_id)] = {column: -count for column, count in counts.items()}
+        self._add(connection, totals)
+
+    def _add(self, connection, totals: Dict[Tuple[str, int], Dict[str, int]]) -> None:
+        table = self.table
+        for (scope, scope_id), deltas in totals.items():
+            deltas = {column: delta for column, delta in deltas.items() if delta}
+            if not deltas:
+                continue
+            result = connection.execute(
+                table.update()
+                .where(table.c.scope == scope, table.c.scope_id == scope_id)
+                .values({column: table.c[column] + delta for column, delta in deltas.items()})
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert().values(
+                    scope=scope, scope_id=scope_id,
+                    **{column: deltas.get(column, 0) for column in COUNTER_COLUMNS}
+                ))
+
+    def rebuild(self, connection, application_table) -> int:
+        """Recount every row from the applications; returns how many applications were counted."""
+        applications = application_table
+        columns = [sa.func.count().label("applied")] + [
+            sa.func.sum(sa.case((applications.c.status == status, 1), else_=0)).label(column)
+            for status, column in STAGE_COLUMNS.items()
+        ]
+
+        def counted(scope, query):
+            return [
+                dict({name: row._mapping[name] or 0 for name in COUNTER_COLUMNS}, scope=scope, scope_id=row.scope_id)
+                for row in connection.execute(query) if row.scope_id is not None
+            ]
+
+        posting_id, company_id = applications.c.job_posting_id, self.postings.c.company_id
+        rows = counted(POSTING, sa.select(posting_id.label("scope_id"), *columns).group_by(posting_id))
+        rows += counted(COMPANY, sa.select(company_id.label("scope_id"), *columns).select_from(
+            applications.join(self.postings, self.postings.c.id == posting_id)
+        ).group_by(company_id))
+        rows += counted(ALL, sa.select(sa.literal(0).label("scope_id"), *columns).select_from(applications))
+        connection.execute(self.table.delete())
+        rows = [row for row in rows if row["applied"]]
+        if rows:
+            connection.execute(self.table.insert(), rows)
+        return sum(row["applied"] for row in rows if row["scope"] == ALL)
+
+    def funnels(self, connection, scope: str, label=None) -> List[Funnel]:
+        """Every row of ``scope``; ``label`` is a name column of the table ``scope_id`` refers to."""
+        table = self.table
+        columns = [table.c.scope, table.c.scope_id] + [table.c[column] for column in COUNTER_COLUMNS]
+        query = sa.select(*columns).where(table.c.scope == scope).order_by(table.c.scope_id)
+        if label is not None:
+            query = query.add_columns(label).outerjoin_from(table, label.table, label.table.c.id == table.c.scope_id)
+        return [Funnel(*row) for row in connection.execute(query)]
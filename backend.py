@@ -11,6 +11,7 @@ from datetime import datetime, timedelta
 from flask import Flask, render_template_string, request, redirect, url_for, flash, session, Response
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user, login_required
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event as sa_event
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
 from dotenv import load_dotenv
@@ -20,6 +21,8 @@ load_dotenv()
 
 # Import frontend templates
 from frontend import get_template
+from database_manager import TTLCache, USER_CACHE_SIZE, USER_CACHE_TTL
+from analytics import AnalyticsEngine, DataVersion, SQLAnalytics
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -110,6 +113,9 @@ class JobApplication(db.Model):
 class FirebaseManager:
     def __init__(self):
         self.db = None
+        # uid -> user record and email -> uid, so login is one small indexed read
+        self.user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+        self.email_index = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
         if FIREBASE_AVAILABLE and os.getenv('FIREBASE_CREDENTIALS_PATH'):
             try:
                 cred = credentials.Certificate(os.getenv('FIREBASE_CREDENTIALS_PATH'))
@@ -129,6 +135,56 @@ class FirebaseManager:
                 return None
         return None
     
+    def get_user(self, uid):
+        """Fetch a single user record by uid (cached, without its password hash)."""
+        user_data = self.user_cache.get(uid)
+        if user_data is None and self.db:
+            try:
+                user_data = self.db.child('users').child(uid).get()
+            except:
+                return None
+            if user_data:
+                user_data = self.cache_user(uid, user_data)
+        return user_data
+    
+    def find_user_by_email(self, email):
+        """Return (uid, user_data) for an email via the users/email index.
+        
+        Requires ".indexOn": ["email"] on users in the database rules.
+        """
+        uid = self.email_index.get(email)
+        if uid is not None:
+            user_data = self.get_user(uid)
+            if user_data and user_data.get('email') == email:
+                return uid, user_data
+        
+        if self.db:
+            try:
+                matches = self.db.child('users').order_by_child('email').equal_to(email).limit_to_first(1).get()
+            except:
+                return None, None
+            if matches:
+                uid, user_data = next(iter(matches.items()))
+                return uid, self.cache_user(uid, user_data)
+        return None, None
+    
+    def cache_user(self, uid, user_data):
+        # The hash is never cached: a changed password must stop working at once
+        user_data = {key: value for key, value in user_data.items() if key != 'password_hash'}
+        self.user_cache.set(uid, user_data)
+        if user_data.get('email'):
+            self.email_index.set(user_data['email'], uid)
+        return user_data
+    
+    def get_password_hash(self, uid):
+        """Current password hash of a user, always read from Firebase."""
+        if self.db:
+            try:
+                return self.db.child('users').child(uid).child('password_hash').get()
+            except:
+                return None
+        return None
+    
     def get_student_profiles(self):
         if self.db:
             try:
@@ -148,6 +204,32 @@ class FirebaseManager:
 # Initialize Firebase Manager
 firebase_manager = FirebaseManager()
 
+# Analytics, recomputed only after a commit touches profiles, applications or users
+analytics_version = DataVersion()
+analytics = AnalyticsEngine(
+    SQLAnalytics(db, StudentProfile.__table__, time_series={
+        'registrations': (User.__table__.c.created_at, User.__table__.c.role == 'student'),
+    }),
+    version=analytics_version.current,
+    ttl=float(os.getenv('ANALYTICS_TTL', '60')),
+)
+
+@sa_event.listens_for(db.session, 'before_flush')
+def flag_analytics_changes(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (StudentProfile, JobApplication, User)):
+            session.info['analytics_changed'] = True
+            return
+
+@sa_event.listens_for(db.session, 'after_commit')
+def bump_analytics_version(session):
+    if session.info.pop('analytics_changed', False):
+        analytics_version.bump()
+
+@sa_event.listens_for(db.session, 'after_rollback')
+def discard_analytics_changes(session):
+    session.info.pop('analytics_changed', None)
+
 # User loader for Flask-Login
 @login_manager.user_loader
 def load_user(user_id):
@@ -181,18 +263,13 @@ def login():
         user = None
         
         if firebase_manager.db:
-            users_data = firebase_manager.get_users()
-            if users_data:
-                for uid, user_data in users_data.items():
-                    if user_data.get('email') == email:
-                        # Simple password check (in production, use proper hashing)
-                        if check_password_hash(user_data.get('password_hash', ''), password):
-                            user = User()
-                            user.id = uid
-                            user.name = user_data.get('name')
-                            user.email = user_data.get('email')
-                            user.role = user_data.get('role')
-                            break
+            uid, user_data = firebase_manager.find_user_by_email(email)
+            if user_data and check_password_hash(firebase_manager.get_password_hash(uid) or '', password):
+                user = User()
+                user.id = uid
+                user.name = user_data.get('name')
+                user.email = user_data.get('email')
+                user.role = user_data.get('role')
         
         if not user:
             user = User.query.filter_by(email=email).first()
@@ -235,12 +312,9 @@ def register():
         existing_user = None
         
         if firebase_manager.db:
-            users_data = firebase_manager.get_users()
-            if users_data:
-                for uid, user_data in users_data.items():
-                    if user_data.get('email') == email:
-                        existing_user = True
-                        break
+            uid, user_data = firebase_manager.find_user_by_email(email)
+            if user_data:
+                existing_user = True
         
         if not existing_user:
             existing_user = User.query.filter_by(email=email).first()
@@ -306,26 +380,15 @@ def dashboard():
 @login_required
 @roles_required('admin')
 def admin_dashboard():
-    # Get statistics
-    total_students = StudentProfile.query.count()
-    placed_students = StudentProfile.query.filter(StudentProfile.placement_status != 'Not Placed').count()
+    summary = analytics.summary()
     total_recruiters = User.query.filter_by(role='recruiter').count()
     
-    # Department statistics
-    dept_stats = db.session.query(
-        StudentProfile.department,
-        db.func.count(StudentProfile.id).label('count'),
-        db.func.avg(StudentProfile.gpa).label('avg_gpa')
-    ).group_by(StudentProfile.department).all()
-    
-    placement_rate = (placed_students / total_students * 100) if total_students > 0 else 0
-    
     return render_template_string(get_template('admin_dashboard.html'),
-                         total_students=total_students,
-                         placed_students=placed_students,
+                         total_students=summary.total_students,
+                         placed_students=summary.placed_students,
                          total_recruiters=total_recruiters,
-                         placement_rate=placement_rate,
-                         dept_stats=dept_stats)
+                         placement_rate=summary.placement_rate,
+                         dept_stats=summary.dept_stats)
 
 @app.route('/admin/students')
 @login_required
@@ -345,36 +408,21 @@ def admin_recruiters():
 @login_required
 @roles_required('admin')
 def admin_analytics():
-    # Get comprehensive analytics data
-    total_students = StudentProfile.query.count()
-    placed_students = StudentProfile.query.filter(StudentProfile.placement_status != 'Not Placed').count()
-    not_placed_students = total_students - placed_students
-    
-    # Department statistics
-    dept_stats = {}
-    dept_query = db.session.query(
-        StudentProfile.department,
-        db.func.count(StudentProfile.id).label('count'),
-        db.func.avg(StudentProfile.gpa).label('avg_gpa')
-    ).group_by(StudentProfile.department).all()
-    
-    for dept, count, avg_gpa in dept_query:
-        dept_stats[dept] = {
-            'count': count,
-            'avg_gpa': round(avg_gpa, 2) if avg_gpa else 0
-        }
-    
+    summary = analytics.summary()
     total_recruiters = User.query.filter_by(role='recruiter').count()
-    placement_rate = (placed_students / total_students * 100) if total_students > 0 else 0
+    recent_students = sum(
+        bucket.count for bucket in
+        analytics.by_time_bucket('registrations', 'day', since=datetime.utcnow() - timedelta(days=6))
+    )
     
     return render_template_string(get_template('admin_analytics.html'),
-                         total_students=total_students,
-                         placed_students=placed_students,
-                         not_placed_students=not_placed_students,
-                         placement_rate=placement_rate,
-                         dept_stats=dept_stats,
+                         total_students=summary.total_students,
+                         placed_students=summary.placed_students,
+                         not_placed_students=summary.not_placed_students,
+                         placement_rate=summary.placement_rate,
+                         dept_stats=summary.dept_stats,
                          total_recruiters=total_recruiters,
-                         recent_students=0)
+                         recent_students=recent_students)
 
 @app.route('/admin/analytics/export')
 @login_required
@@ -390,27 +438,20 @@ def admin_analytics_export():
     writer.writerow([])
     
     # Overall Statistics
-    total_students = StudentProfile.query.count()
-    placed_students = StudentProfile.query.filter(StudentProfile.placement_status != 'Not Placed').count()
+    summary = analytics.summary()
     
     writer.writerow(['Overall Statistics'])
-    writer.writerow(['Total Students', total_students])
-    writer.writerow(['Placed Students', placed_students])
-    writer.writerow(['Placement Rate (%)', round((placed_students/total_students*100), 1) if total_students > 0 else 0])
+    writer.writerow(['Total Students', summary.total_students])
+    writer.writerow(['Placed Students', summary.placed_students])
+    writer.writerow(['Placement Rate (%)', summary.placement_rate])
     writer.writerow([])
     
     # Department-wise Statistics
     writer.writerow(['Department-wise Statistics'])
     writer.writerow(['Department', 'Total Students', 'Average GPA'])
     
-    dept_query = db.session.query(
-        StudentProfile.department,
-        db.func.count(StudentProfile.id).label('count'),
-        db.func.avg(StudentProfile.gpa).label('avg_gpa')
-    ).group_by(StudentProfile.department).all()
-    
-    for dept, count, avg_gpa in dept_query:
-        writer.writerow([dept, count, round(avg_gpa, 2) if avg_gpa else 0])
+    for stats in summary.departments:
+        writer.writerow([stats.department, stats.total, stats.avg_gpa])
     
     # Create response
     output.seek(0)
@@ -0,0 +1,281 @@
+"""
+Content-Addressed Upload Storage for PyTech Arena
+Uploads are streamed to disk in chunks while a SHA-256 is computed and stored
+once per distinct content under a sharded directory, plus resumable chunked
+uploads for unreliable connections
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import secrets
+import tempfile
+import threading
+import time
+from typing import BinaryIO, Dict, Optional, Tuple
+
+from flask import current_app, request
+from werkzeug.utils import send_file
+
+
+CHUNK_SIZE = 64 * 1024
+
+# "<sha256>.<ext>" names written by BlobStore; anything else is a legacy upload
+_BLOB_NAME = re.compile(r"^([0-9a-f]{64})(\.[a-z0-9]{1,10})?$")
+_UPLOAD_ID = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+
+class BlobTooLarge(ValueError):
+    """Raised when an upload exceeds its size limit."""
+
+
+class UploadOffsetMismatch(ValueError):
+    """Raised when a chunk does not start where the partial upload ends."""
+
+    def __init__(self, expected: int):
+        super().__init__(f"chunk must start at offset {expected}")
+        self.expected = expected
+
+
+class BlobStore:
+    """Files stored as ``root/ab/cd/<sha256>.<ext>``.
+
+    Identical content is written once no matter how many profiles reference
+    it. The stored name (``<sha256>.<ext>``) is what profiles keep; names
+    that do not look like a digest resolve to the flat legacy layout in
+    ``root``.
+    """
+
+    def __init__(self, root: str, shard_levels: int = 2):
+        self.root = root
+        self.shard_levels = shard_levels
+        self.incoming = os.path.join(root, "incoming")
+        os.makedirs(self.incoming, exist_ok=True)
+
+    @staticmethod
+    def stored_name(digest: str, filename: Optional[str]) -> str:
+        extension = os.path.splitext(filename or "")[1].lower()
+        return digest + (extension if re.fullmatch(r"\.[a-z0-9]{1,10}", extension) else "")
+
+    def path(self, name: str) -> str:
+        """Absolute path of a stored or legacy upload name."""
+        match = _BLOB_NAME.match(name or "")
+        if not match:
+            return os.path.join(self.root, os.path.basename(name or ""))
+        digest = match.group(1)
+        shards = [digest[2 * level:2 * level + 2] for level in range(self.shard_levels)]
+        return os.path.join(self.root, *shards, name)
+
+    @staticmethod
+    def is_stored(name: Optional[str]) -> bool:
+        """Whether ``name`` is a content-addressed name rather than a legacy filename."""
+        return bool(_BLOB_NAME.match(name or ""))
+
+    def exists(self, name: str) -> bool:
+        return os.path.isfile(self.path(name))
+
+    def commit(self, temp_path: str, digest: str, filename: Optional[str]) -> str:
+        """Move a fully written temp file into place; returns the stored name.
+
+        When the content is already stored the temp file is discarded.
+        """
+        name = self.stored_name(digest, filename)
+        final_path = self.path(name)
+        if os.path.exists(final_path):
+            os.remove(temp_path)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(temp_path, final_path)
+        return name
+
+    def save(self, stream: BinaryIO, filename: Optional[str], max_bytes: Optional[int] = None) -> Tuple[str, int]:
+        """Stream ``stream`` to disk in chunks; returns ``(stored name, size)``."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.incoming, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise BlobTooLarge(f"file is larger than {max_bytes} bytes")
+                    digest.update(chunk)
+                    out.write(chunk)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        return self.commit(temp_path, digest.hexdigest(), filename), size
+
+    def import_file(self, path: str, filename: Optional[str] = None) -> str:
+        """Copy an existing file into the store (used to migrate legacy uploads)."""
+        with open(path, "rb") as source:
+            name, _ = self.save(source, filename or os.path.basename(path))
+        return name
+
+
+def send_blob(store: BlobStore, name: str, download_name: Optional[str] = None,
+              max_age: int = 300, mode: str = "", accel_prefix: str = "/protected-uploads/"):
+    """Response for a stored upload with validators and byte-range support.
+
+    Content-addressed names get a strong ETag equal to their SHA-256, so a
+    re-opened resume revalidates with a 304 instead of re-downloading, and
+    ``Range`` requests (PDF viewers fetching pages) are answered with 206.
+    Legacy files fall back to werkzeug's mtime/size ETag.
+
+    ``mode`` hands the byte transfer to the front-end server:
+    ``"x-sendfile"`` (Apache / lighttpd) or ``"x-accel"`` (nginx, serving
+    ``accel_prefix`` as an ``internal`` alias of the upload folder).
+    Raises FileNotFoundError when the file is missing.
+    """
+    path = store.path(name)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    etag = name.split(".", 1)[0] if store.is_stored(name) else True
+    mimetype = mimetypes.guess_type(download_name or name)[0] or "application/octet-stream"
+
+    if mode == "x-accel":
+        response = current_app.response_class(mimetype=mimetype)
+        relative = os.path.relpath(path, store.root).replace(os.sep, "/")
+        response.headers["X-Accel-Redirect"] = accel_prefix.rstrip("/") + "/" + relative
+        if etag is True:
+            stat = os.stat(path)
+            etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        response.set_etag(etag)
+        response.make_conditional(request.environ)
+    else:
+        response = send_file(
+            path, request.environ, mimetype=mimetype, download_name=download_name,
+            conditional=True, etag=etag, max_age=max_age,
+            use_x_sendfile=(mode == "x-sendfile"), response_class=current_app.response_class,
+        )
+        # Advertise range support up front so PDF viewers fetch pages lazily
+        response.accept_ranges = "bytes"
+
+    response.cache_control.private = True
+    response.cache_control.public = False
+    response.cache_control.max_age = max_age
+    return response
+
+
+class ResumableUploads:
+    """Chunked uploads that survive dropped connections.
+
+    A session is a ``<id>.part`` file plus ``<id>.json`` metadata in the
+    store's ``incoming`` directory, so any worker can accept the next chunk
+    and the current offset is just the size of the part file. The running
+    SHA-256 is kept per process while chunks arrive in order; if a chunk
+    lands on another worker, the part file is re-hashed once at the end.
+    """
+
+    def __init__(self, store: BlobStore):
+        self.store = store
+        # upload id -> (bytes hashed so far, running sha256)
+        self._hashers: Dict[str, Tuple[int, object]] = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, upload_id: str) -> Tuple[str, str]:
+        if not _UPLOAD_ID.match(upload_id or ""):
+            raise KeyError(upload_id)
+        base = os.path.join(self.store.incoming, upload_id)
+        return base + ".part", base + ".json"
+
+    def create(self, owner: str, kind: str, filename: str, size: int) -> Dict:
+        upload_id = secrets.token_urlsafe(24)
+        part_path, meta_path = self._paths(upload_id)
+        meta = {"id": upload_id, "owner": str(owner), "kind": kind, "filename": filename, "size": int(size)}
+        open(part_path, "wb").close()
+        with open(meta_path, "w") as f:
+            json.dump(meta, f)
+        with self._lock:
+            self._hashers[upload_id] = (0, hashlib.sha256())
+        return dict(meta, offset=0)
+
+    def status(self, upload_id: str) -> Dict:
+        """Session metadata with the current ``offset``; KeyError if unknown."""
+        part_path, meta_path = self._paths(upload_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            meta["offset"] = os.path.getsize(part_path)
+        except FileNotFoundError:
+            raise KeyError(upload_id) from None
+        return meta
+
+    def append(self, upload_id: str, offset: int, stream: BinaryIO) -> Dict:
+        """Append the chunk in ``stream`` at ``offset``; returns the updated status."""
+        meta = self.status(upload_id)
+        if offset != meta["offset"]:
+            raise UploadOffsetMismatch(meta["offset"])
+        part_path, _ = self._paths(upload_id)
+
+        with self._lock:
+            cached = self._hashers.pop(upload_id, None)
+        hasher = cached[1] if cached and cached[0] == offset else None
+
+        written = offset
+        with open(part_path, "r+b") as out:
+            out.seek(offset)
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > meta["size"]:
+                    out.truncate(offset)
+                    raise BlobTooLarge(f"upload is larger than the declared {meta['size']} bytes")
+                out.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+
+        if hasher is not None:
+            with self._lock:
+                self._hashers[upload_id] = (written, hasher)
+        meta["offset"] = written
+        return meta
+
+    def complete(self, upload_id: str) -> str:
+        """Move a fully received upload into the blob store; returns its stored name."""
+        meta = self.status(upload_id)
+        if meta["offset"] != meta["size"]:
+            raise UploadOffsetMismatch(meta["offset"])
+        part_path, meta_path = self._paths(upload_id)
+
+        with self._lock:
+            cached = self._hashers.pop(upload_id, None)
+        if cached and cached[0] == meta["size"]:
+            digest = cached[1].hexdigest()
+        else:
+            hasher = hashlib.sha256()
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+
+        name = self.store.commit(part_path, digest, meta["filename"])
+        os.remove(meta_path)
+        return name
+
+    def discard(self, upload_id: str) -> None:
+        with self._lock:
+            self._hashers.pop(upload_id, None)
+        for path in self._paths(upload_id):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def expire(self, max_age: float) -> int:
+        """Drop sessions untouched for ``max_age`` seconds; returns how many."""
+        cutoff = time.time() - max_age
+        expired = 0
+        for entry in os.scandir(self.store.incoming):
+            if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                upload_id = entry.name[:-len(".json")]
+                part_path, _ = self._paths(upload_id)
+                if not os.path.exists(part_path) or os.path.getmtime(part_path) < cutoff:
+                    self.discard(upload_id)
+                    expired += 1
+        return expired
@@ -0,0 +1,110 @@
+"""
+Bulk Application Status Updates for PyTech Arena
+Moves many job applications to one status with a single
+UPDATE ... WHERE id IN (...) per chunk
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import sqlalchemy as sa
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+class StatusChange(NamedTuple):
+    application_id: int
+    student_id: int
+    job_posting_id: Optional[int]
+    job_title: str
+    company_name: str
+    old_status: Optional[str]
+
+
+class BulkStatusReport(NamedTuple):
+    status: str
+    requested: int
+    updated: int
+    unchanged: int
+    # Requested ids with no application; always empty for filter updates
+    not_found: List[int]
+    chunks: int
+    seconds: float
+
+    def as_dict(self) -> Dict:
+        return dict(self._asdict(), seconds=round(self.seconds, 3))
+
+
+def _chunks(values: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class BulkStatusUpdater:
+    """Set the status of many applications in chunked transactions.
+
+    Every chunk is one transaction on ``db.session``: a SELECT of the
+    chunk's current rows, then one UPDATE of those whose status actually
+    changes. ``after_update(connection, changes, status)`` runs inside that
+    transaction, so the caller can keep derived tables in step (Core
+    updates bypass the ORM flush listeners).
+    """
+
+    def __init__(self, db, application_table, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 after_update: Optional[Callable] = None):
+        self.db = db
+        self.applications = application_table
+        self.chunk_size = chunk_size
+        self.after_update = after_update
+
+    def _update_chunk(self, ids: Sequence[int], status: str):
+        table = self.applications
+        session = self.db.session
+        connection = session.connection()
+        try:
+            rows = connection.execute(
+                sa.select(table.c.id, table.c.student_id, table.c.job_posting_id,
+                          table.c.job_title, table.c.company_name, table.c.status)
+                .where(table.c.id.in_(ids))
+                .with_for_update()
+            ).all()
+            changes = [StatusChange(*row) for row in rows if row.status != status]
+            if changes:
+                connection.execute(
+                    table.update()
+                    .where(table.c.id.in_([change.application_id for change in changes]))
+                    .values(status=status)
+                )
+                if self.after_update:
+                    self.after_update(connection, changes, status)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return {row.id for row in rows}, len(changes)
+
+    def update(self, status: str, ids: Optional[Iterable[int]] = None, where=()) -> BulkStatusReport:
+        """Move the applications ``ids``, or every one matching the ``where`` clauses, to ``status``."""
+        started = time.perf_counter()
+        table = self.applications
+        if ids is None:
+            ids = self.db.session.execute(sa.select(table.c.id).where(*where)).scalars().all()
+        ids = sorted(set(ids))
+
+        found, updated, chunks = set(), 0, 0
+        for chunk in _chunks(ids, self.chunk_size):
+            chunk_found, chunk_updated = self._update_chunk(chunk, status)
+            found |= chunk_found
+            updated += chunk_updated
+            chunks += 1
+
+        return BulkStatusReport(
+            status=status,
+            requested=len(ids),
+            updated=updated,
+            unchanged=len(found) - updated,
+            not_found=[application_id for application_id in ids if application_id not in found],
+            chunks=chunks,
+            seconds=time.perf_counter() - started,
+        )
@@ -0,0 +1,64 @@
+"""
+Test fixtures for PyTech Arena
+Points the app at a throwaway SQLite database before it is imported, so the
+tests never touch placement.db, and runs background work inline.
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_workdir = tempfile.mkdtemp(prefix="pytech-tests-")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(_workdir, "test.db"))
+os.environ.setdefault("DATA_VERSION_FILE", os.path.join(_workdir, "data_version"))
+os.environ.setdefault("UPLOAD_FOLDER", os.path.join(_workdir, "uploads"))
+os.environ.setdefault("IMPORT_FOLDER", os.path.join(_workdir, "imports"))
+os.environ.setdefault("NOTIFICATION_DISPATCH", "inline")
+os.environ.setdefault("RESUME_EXTRACTION", "inline")
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("FLASK_DEBUG", "true")
+
+
+@pytest.fixture
+def app():
+    """The application with an empty schema, dropped again after the test."""
+    from app import app, db
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def login_as(app):
+    """Return a test client already logged in as ``(user_id, role)``."""
+    def client_for(user_id, role):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["user_id"] = str(user_id)
+            session["role"] = role
+            session["_user_id"] = str(user_id)
+            session["_fresh"] = True
+        return client
+    return client_for
+
+
+@pytest.fixture
+def make_student(app):
+    """Create a committed student user and profile; returns the profile."""
+    from app import db, StudentProfile, User
+    created = []
+
+    def create(department="CSE", gpa=7.5, skills="Python, SQL"):
+        user_id = str(len(created) + 100)
+        user = User(id=user_id, name=f"Student {user_id}", email=f"student{user_id}@example.com", role="student")
+        user.password_hash = "unused"
+        profile = StudentProfile(user_id=user_id, department=department, gpa=gpa, skills=skills)
+        db.session.add_all([user, profile])
+        db.session.commit()
+        created.append(profile)
+        return profile
+    return create
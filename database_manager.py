@@ -3,9 +3,63 @@ Database Abstraction Layer for PyTech Arena
 Supports both SQLite (SQLAlchemy) and Firebase Firestore
 """
 
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import os
+import threading
+import time
+
+from sqlalchemy.orm import joinedload
+from werkzeug.security import check_password_hash
+
+from password_hashing import PasswordHasherBusy
+
+
+# Per-process user record cache used by the Firebase lookups
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "2048"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Return a live entry and mark it most recently used."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value) -> None:
+        """Store an entry, evicting the least recently used one when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key, default=None):
+        """Remove an entry and return its value."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[1] if entry else default
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
 
 
 class DatabaseManager:
@@ -14,14 +68,19 @@ class DatabaseManager:
     def __init__(self, db_type: str):
         self.db_type = db_type
     
-    def create_user(self, name: str, email: str, password: str, role: str = "student") -> str:
-        """Create a new user."""
+    def create_user(self, name: str, email: str, password: str, role: str = "student",
+                    notifications: Iterable[Tuple[str, str, str]] = ()) -> str:
+        """Create a new user, queueing ``(title, message, type)`` notifications for them."""
         raise NotImplementedError
     
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Get user by email."""
         raise NotImplementedError
     
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID."""
+        raise NotImplementedError
+    
     def verify_password(self, email: str, password: str) -> Optional[Dict]:
         """Verify user password."""
         raise NotImplementedError
@@ -75,9 +134,11 @@ class SQLiteDatabaseManager(DatabaseManager):
         self.JobPosting = models['JobPosting']
         self.JobApplication = models['JobApplication']
         self.Notification = models['Notification']
+        self.NotificationOutbox = models['NotificationOutbox']
     
-    def create_user(self, name: str, email: str, password: str, role: str = "student") -> str:
-        """Create a new user in SQLite."""
+    def create_user(self, name: str, email: str, password: str, role: str = "student",
+                    notifications: Iterable[Tuple[str, str, str]] = ()) -> str:
+        """Create a new user in SQLite; the user, profile and notifications commit together."""
         user = self.User(name=name, email=email, role=role)
         user.set_password(password)
         self.db.session.add(user)
@@ -92,6 +153,10 @@ class SQLiteDatabaseManager(DatabaseManager):
             )
             self.db.session.add(profile)
         
+        for title, message, notification_type in notifications:
+            self.db.session.add(self.NotificationOutbox(
+                user_id=int(user.id), title=title, message=message, type=notification_type
+            ))
         self.db.session.commit()
         return str(user.id)
     
@@ -108,10 +173,30 @@ class SQLiteDatabaseManager(DatabaseManager):
             }
         return None
     
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID from SQLite."""
+        user = self.db.session.get(self.User, user_id)
+        if user:
+            return {
+                'id': str(user.id),
+                'name': user.name,
+                'email': user.email,
+                'role': user.role
+            }
+        return None
+    
     def verify_password(self, email: str, password: str) -> Optional[Dict]:
-        """Verify user password in SQLite."""
+        """Verify user password in SQLite, upgrading outdated hashes."""
         user = self.User.query.filter_by(email=email).first()
         if user and user.check_password(password):
+            if user.password_needs_rehash():
+                # The upgrade is opportunistic: with the hashing queue full,
+                # log in on the old hash and upgrade on a later login
+                try:
+                    user.set_password(password)
+                    self.db.session.commit()
+                except PasswordHasherBusy:
+                    pass
             return {
                 'id': str(user.id),
                 'name': user.name,
@@ -163,7 +248,7 @@ class SQLiteDatabaseManager(DatabaseManager):
     
     def get_all_jobs(self) -> List[Dict]:
         """Get all active job postings from SQLite."""
-        jobs = self.JobPosting.query.filter_by(is_active=True).all()
+        jobs = self.JobPosting.query.filter_by(is_active=True).options(joinedload(self.JobPosting.company)).all()
         return [{
             'id': str(job.id),
             'title': job.title,
@@ -234,16 +319,16 @@ class SQLiteDatabaseManager(DatabaseManager):
     
     def create_notification(self, user_id: str, title: str, message: str, 
                           notification_type: str = "info") -> str:
-        """Create notification in SQLite."""
-        notification = self.Notification(
+        """Queue notification in the SQLite outbox; returns the outbox entry id."""
+        entry = self.NotificationOutbox(
             user_id=int(user_id),
             title=title,
             message=message,
             type=notification_type
         )
-        self.db.session.add(notification)
+        self.db.session.add(entry)
         self.db.session.commit()
-        return str(notification.id)
+        return str(entry.id)
     
     def get_user_notifications(self, user_id: str, unread_only: bool = False) -> List[Dict]:
         """Get notifications for a user from SQLite."""
@@ -262,11 +347,30 @@ class SQLiteDatabaseManager(DatabaseManager):
 
 
 class FirebaseDatabaseManager(DatabaseManager):
-    """Firebase database manager using Firestore or Realtime Database."""
-    
-    def __init__(self, firebase_managers):
+    """Firebase database manager using Firestore or Realtime Database.
+    
+    On the Realtime Database, user lookups read a single child by uid or run
+    an ``orderByChild('email').equalTo(email)`` query instead of downloading
+    the whole ``users`` tree; records are kept in a per-process TTL/LRU cache.
+    The email query needs ``".indexOn": ["email"]`` on ``users`` in the
+    database rules. Cached records leave out ``password_hash``:
+    ``verify_password`` always reads the hash fresh and checks it with
+    ``check_password`` (the app passes its hashing pool's ``verify``), so a
+    changed password takes effect at once. When ``needs_rehash`` and
+    ``hash_password`` are given, a hash made with an outdated method is
+    replaced on successful login, as on SQLite; on Firestore, verification
+    is left to the user manager and hashes are not upgraded.
+    """
+    
+    def __init__(self, firebase_managers, check_password=check_password_hash,
+                 needs_rehash=None, hash_password=None):
         super().__init__("firebase")
+        self.check_password = check_password
+        self.needs_rehash = needs_rehash
+        self.hash_password = hash_password
         self.database_type = firebase_managers.get('database_type', 'firestore')
+        self._user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+        self._email_index = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
         
         if self.database_type == 'realtime':
             self.user_manager = firebase_managers['user_manager']
@@ -280,17 +384,91 @@ class FirebaseDatabaseManager(DatabaseManager):
             self.job_manager = firebase_managers['job_manager']
             self.notification_manager = firebase_managers['notification_manager']
     
-    def create_user(self, name: str, email: str, password: str, role: str = "student") -> str:
-        """Create a new user in Firebase."""
-        return self.user_manager.create_user(name, email, password, role)
+    def create_user(self, name: str, email: str, password: str, role: str = "student",
+                    notifications: Iterable[Tuple[str, str, str]] = ()) -> str:
+        """Create a new user in Firebase, then their notifications (Firebase has no
+        multi-path transaction here)."""
+        user_id = self.user_manager.create_user(name, email, password, role)
+        for title, message, notification_type in notifications:
+            self.notification_manager.create_notification(user_id, title, message, notification_type)
+        return user_id
+    
+    def _users_ref(self):
+        return self.user_manager.firebase.get_reference('users')
+    
+    def _cache_user(self, user: Dict) -> Dict:
+        user = {key: value for key, value in user.items() if key != 'password_hash'}
+        self._user_cache.set(user['id'], user)
+        if user.get('email'):
+            self._email_index.set(user['email'], user['id'])
+        return user
+    
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop a cached user record after it was changed outside this manager."""
+        user = self._user_cache.pop(user_id)
+        if user and user.get('email'):
+            self._email_index.pop(user['email'])
+    
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID from Firebase with a single child read."""
+        cached = self._user_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
+        user_data = self._users_ref().child(user_id).get()
+        if not user_data:
+            return None
+        return self._cache_user(dict(user_data, id=user_id))
     
     def get_user_by_email(self, email: str) -> Optional[Dict]:
-        """Get user by email from Firebase."""
-        return self.user_manager.get_user_by_email(email)
+        """Get user by email from Firebase using the email index."""
+        if self.database_type != 'realtime':
+            return self.user_manager.get_user_by_email(email)
+        
+        user_id = self._email_index.get(email)
+        if user_id is not None:
+            user = self.get_user_by_id(user_id)
+            if user and user.get('email') == email:
+                return user
+        
+        matches = self._users_ref().order_by_child('email').equal_to(email).limit_to_first(1).get()
+        if not matches:
+            return None
+        user_id, user_data = next(iter(matches.items()))
+        return self._cache_user(dict(user_data, id=user_id))
     
     def verify_password(self, email: str, password: str) -> Optional[Dict]:
         """Verify user password in Firebase."""
-        return self.user_manager.verify_password(email, password)
+        if self.database_type != 'realtime':
+            return self.user_manager.verify_password(email, password)
+        
+        user = self.get_user_by_email(email)
+        if not user:
+            return None
+        # Read the hash itself uncached
+        stored = self._users_ref().child(user['id']).get()
+        if not stored or stored.get('email') != email:
+            self.invalidate_user(user['id'])
+            return None
+        user = self._cache_user(dict(stored, id=user['id']))
+        if self.check_password(stored.get('password_hash', ''), password):
+            self._upgrade_password_hash(user['id'], stored.get('password_hash', ''), password)
+            return {
+                'id': user['id'],
+                'name': user.get('name'),
+                'email': user.get('email'),
+                'role': user.get('role')
+            }
+        return None
+    
+    def _upgrade_password_hash(self, user_id: str, stored_hash: str, password: str) -> None:
+        """Rewrite a hash made with an outdated method; skipped while the hashing queue is full."""
+        if not self.needs_rehash or not self.hash_password or not self.needs_rehash(stored_hash):
+            return
+        try:
+            self._users_ref().child(user_id).update({'password_hash': self.hash_password(password)})
+        except PasswordHasherBusy:
+            pass
     
     def create_student_profile(self, user_id: str, profile_data: Dict) -> str:
         """Create student profile in Firebase."""
@@ -330,9 +508,13 @@ class FirebaseDatabaseManager(DatabaseManager):
         return self.notification_manager.get_user_notifications(user_id, unread_only)
 
 
-def get_database_manager(database_type: str, db=None, models=None, firebase_managers=None):
+def get_database_manager(database_type: str, db=None, models=None, firebase_managers=None,
+                         check_password=check_password_hash, needs_rehash=None, hash_password=None):
     """Factory function to get the appropriate database manager."""
     if database_type == "firebase" and firebase_managers:
-        return FirebaseDatabaseManager(firebase_managers)
+        return FirebaseDatabaseManager(
+            firebase_managers, check_password=check_password,
+            needs_rehash=needs_rehash, hash_password=hash_password
+        )
     else:
         return SQLiteDatabaseManager(db, models)
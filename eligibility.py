@@ -0,0 +1,414 @@
+"""
+Eligibility Matching for PyTech Arena
+Parses free-text job eligibility into structured criteria and evaluates every
+student against every active job as NumPy array operations
+"""
+
+import itertools
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import sqlalchemy as sa
+
+from search_index import normalize_skill, normalize_text
+
+
+# Indian universities convert an aggregate percentage to a 10-point CGPA as percent / 9.5
+PERCENT_PER_GPA_POINT = 9.5
+
+# Department spellings -> the codes used on the registration form
+DEPARTMENT_ALIASES = {
+    "cse": "CSE", "cs": "CSE", "computer science": "CSE", "computer science engineering": "CSE",
+    "computer science and engineering": "CSE",
+    "it": "IT", "information technology": "IT",
+    "ece": "ECE", "electronics communication": "ECE", "electronics and communication": "ECE",
+    "electronics communication engineering": "ECE", "electronics and communication engineering": "ECE",
+    "eee": "EEE", "ee": "EEE", "electrical": "EEE", "electrical engineering": "EEE",
+    "electrical electronics": "EEE", "electrical and electronics": "EEE",
+    "electrical and electronics engineering": "EEE",
+    "mech": "MECH", "me": "MECH", "mechanical": "MECH", "mechanical engineering": "MECH",
+    "civil": "CIVIL", "ce": "CIVIL", "civil engineering": "CIVIL",
+    "mba": "MBA", "bba": "MBA", "business administration": "MBA",
+}
+
+_ALL_BRANCHES = re.compile(r"\b(?:all|any)\s+(?:branches|branch|departments|department|streams|disciplines)\b", re.I)
+_PERCENT = re.compile(r"(\d{2}(?:\.\d+)?)\s*%")
+_GPA = re.compile(
+    r"(?:c?gpa|cpi)\s*(?:of|:|>=|above|atleast|at least|minimum|min\.?)?\s*(\d{1,2}(?:\.\d+)?)"
+    r"|(\d{1,2}(?:\.\d+)?)\s*(?:\+\s*)?(?:c?gpa|cpi)\b",
+    re.I,
+)
+_SKILL_PHRASE = re.compile(
+    r"(?:strong|proficient|proficiency|skilled|expertise|experience|knowledge|hands-on|familiar|familiarity)"
+    r"\s+(?:in|with|of)\s+((?:[^.;()]|\.(?=\w))+)"
+    r"|skills?\s*:\s*((?:[^.;()]|\.(?=\w))+)",
+    re.I,
+)
+_LIST_SEPARATORS = re.compile(r",|/|&|\band\b|\bor\b", re.I)
+_DEPARTMENT_PATTERN = re.compile(
+    r"(?<![a-z])(" + "|".join(sorted((re.escape(a) for a in DEPARTMENT_ALIASES), key=len, reverse=True)) + r")(?![a-z])"
+)
+
+
+def normalize_department(department: Optional[str]) -> str:
+    """Canonical department code, e.g. ``"Computer Science"`` -> ``"CSE"``."""
+    text = normalize_text((department or "").replace("&", " and "))
+    return DEPARTMENT_ALIASES.get(text, text.upper())
+
+
+class EligibilityCriteria(NamedTuple):
+    min_gpa: Optional[float] = None
+    # Department codes; empty means every department is eligible
+    departments: Tuple[str, ...] = ()
+    skills: Tuple[str, ...] = ()
+
+    def admits(self, gpa: Optional[float], department: Optional[str], skills: Iterable[str]) -> bool:
+        """Row-at-a-time check of one student, for callers without the arrays."""
+        if self.min_gpa is not None and (gpa is None or gpa < self.min_gpa):
+            return False
+        if self.departments and normalize_department(department) not in self.departments:
+            return False
+        return set(self.skills) <= set(skills)
+
+
+def parse_eligibility(text: Optional[str]) -> EligibilityCriteria:
+    """Structured criteria from text like "B.Tech (CSE, IT, ECE) with 65% aggregate"."""
+    if not text:
+        return EligibilityCriteria()
+
+    thresholds = [float(value) / PERCENT_PER_GPA_POINT for value in _PERCENT.findall(text) if float(value) <= 100]
+    for direct, trailing in _GPA.findall(text):
+        value = float(direct or trailing)
+        if value <= 10:
+            thresholds.append(value)
+    min_gpa = round(max(thresholds), 2) if thresholds else None
+
+    departments = ()
+    if not _ALL_BRANCHES.search(text):
+        # Short codes are only trusted in capitals ("IT", not "it")
+        found = []
+        for match in _DEPARTMENT_PATTERN.finditer(text.lower()):
+            alias = match.group(1)
+            original = text[match.start():match.end()]
+            if len(alias) <= 4 and original != original.upper():
+                continue
+            code = DEPARTMENT_ALIASES[alias]
+            if code not in found:
+                found.append(code)
+        departments = tuple(found)
+
+    skills = []
+    for phrase, listed in _SKILL_PHRASE.findall(text):
+        for part in _LIST_SEPARATORS.split(phrase or listed):
+            skill = normalize_skill(part)
+            if skill and skill not in skills:
+                skills.append(skill)
+    return EligibilityCriteria(min_gpa, departments, tuple(skills))
+
+
+def _join(values: Sequence[str]) -> Optional[str]:
+    return ",".join(values) or None
+
+
+def criteria_columns(criteria: EligibilityCriteria) -> Dict:
+    """JobPosting column values for ``criteria``."""
+    return {
+        "min_gpa": criteria.min_gpa,
+        "eligible_departments": _join(criteria.departments),
+        "required_skills": _join(criteria.skills),
+    }
+
+
+def stored_criteria(min_gpa, departments, skills) -> EligibilityCriteria:
+    """Inverse of ``criteria_columns``."""
+    return EligibilityCriteria(
+        min_gpa,
+        tuple(d for d in (departments or "").split(",") if d),
+        tuple(s for s in (skills or "").split(",") if s),
+    )
+
+
+class EligibilityMatcher:
+    """Students and active jobs as NumPy arrays for vectorized eligibility.
+
+    Students are ``gpa``, a department code index and a packed
+    skill bitset (``uint64`` words indexed by ``Skill.id``); jobs are a
+    minimum GPA, a department mask and a required-skill bitset. A single
+    student or job is always evaluated with its current values against the
+    cached arrays of the other side, and ``matrix`` evaluates all students x
+    all jobs at once.
+
+    Edits in this process patch the rows they touch through
+    ``update_students`` and ``update_jobs``. The whole arrays are rebuilt
+    only on first use, after ``invalidate`` (a rollback or a bulk import)
+    or after ``ttl`` seconds, which picks up other workers' writes.
+    """
+
+    def __init__(self, db, profile_table, student_skill_table, skill_table, job_table, ttl: float = 60.0):
+        self.db = db
+        self.profiles = profile_table
+        self.student_skill = student_skill_table
+        self.skill = skill_table
+        self.jobs = job_table
+        self.ttl = ttl
+        self._state = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _ensure_fresh(self):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.refresh()
+        return self._state
+
+    def refresh(self) -> None:
+        """Reload every student and job; for startup, backfills and the TTL."""
+        session = self.db.session
+        skill_ids = dict(session.execute(sa.select(self.skill.c.name, self.skill.c.id)).all())
+        words = max(skill_ids.values(), default=0) // 64 + 1
+
+        profiles = session.execute(
+            sa.select(self.profiles.c.id, self.profiles.c.gpa, self.profiles.c.department)
+            .order_by(self.profiles.c.id)
+        ).all()
+        departments: Dict[str, int] = {}
+        pairs = session.execute(sa.select(self.student_skill.c.profile_id, self.student_skill.c.skill_id))
+        students = self._student_arrays(profiles, pairs, departments, words)
+
+        jobs = session.execute(
+            sa.select(self.jobs.c.id, self.jobs.c.min_gpa, self.jobs.c.eligible_departments, self.jobs.c.required_skills)
+            .where(self.jobs.c.is_active.is_(True))
+            .order_by(self.jobs.c.id)
+        ).all()
+        criteria = [stored_criteria(job.min_gpa, job.eligible_departments, job.required_skills) for job in jobs]
+        job_ids = np.fromiter((job.id for job in jobs), dtype=np.int64, count=len(jobs))
+
+        with self._lock:
+            self._state = dict(
+                students,
+                **self._job_arrays(job_ids, criteria, departments, skill_ids, words),
+                skill_ids=skill_ids, words=words, departments=departments,
+                # Required skills no student had at load time; see jobs_for_student
+                unresolved_skills={name for item in criteria for name in item.skills if name not in skill_ids},
+            )
+            self._loaded_at = time.monotonic()
+
+    @staticmethod
+    def _student_arrays(profiles, pairs: Iterable, departments: Dict[str, int], words: int) -> Dict:
+        """Arrays of ``profiles`` (rows by ascending id) with their ``(profile_id, skill_id)`` pairs."""
+        student_ids = np.fromiter((row.id for row in profiles), dtype=np.int64, count=len(profiles))
+        gpa = np.fromiter((row.gpa if row.gpa is not None else -np.inf for row in profiles),
+                          dtype=np.float64, count=len(profiles))
+        # Normalize each distinct spelling once rather than once per student
+        code_of = {
+            raw: departments.setdefault(normalize_department(raw), len(departments))
+            for raw in {row.department for row in profiles}
+        }
+        department_codes = np.fromiter((code_of[row.department] for row in profiles), dtype=np.int32, count=len(profiles))
+
+        bits = np.zeros((len(profiles), words), dtype=np.uint64)
+        # Flattened straight from the rows: np.array() over Row objects probes each one key by key
+        pairs = np.fromiter(
+            itertools.chain.from_iterable(pairs),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        if len(pairs):
+            rows = np.searchsorted(student_ids, pairs[:, 0])
+            known = (rows < len(student_ids)) & (student_ids[np.minimum(rows, len(student_ids) - 1)] == pairs[:, 0])
+            rows, skill = rows[known], pairs[known, 1]
+            np.bitwise_or.at(bits, (rows, skill // 64), np.left_shift(np.uint64(1), (skill % 64).astype(np.uint64)))
+        return {"student_ids": student_ids, "gpa": gpa, "department_codes": department_codes, "bits": bits}
+
+    @classmethod
+    def _job_arrays(cls, job_ids: np.ndarray, criteria: List[EligibilityCriteria],
+                    departments: Dict[str, int], skill_ids: Dict[str, int], words: int) -> Dict:
+        for item in criteria:
+            for department in item.departments:
+                departments.setdefault(department, len(departments))
+        min_gpa = np.array([c.min_gpa if c.min_gpa is not None else -np.inf for c in criteria], dtype=np.float64)
+        any_department = np.array([not c.departments for c in criteria], dtype=bool)
+        department_mask = np.zeros((len(criteria), max(len(departments), 1)), dtype=bool)
+        required = np.zeros((len(criteria), words), dtype=np.uint64)
+        for index, item in enumerate(criteria):
+            department_mask[index, [departments[d] for d in item.departments]] = True
+            required[index] = cls._skill_bits(item.skills, skill_ids, words)
+        return {"job_ids": job_ids, "min_gpa": min_gpa, "any_department": any_department,
+                "department_mask": department_mask, "required": required}
+
+    def update_students(self, profile_ids: Iterable[int]) -> None:
+        """Re-read just these profiles (dropping deleted ones) into the cached arrays.
+
+        Costs a query for the given rows plus an in-memory merge, so a
+        profile edit does not reload every student. Runs on the caller's
+        session, so an uncommitted change is visible; roll back with
+        ``invalidate``.
+        """
+        profile_ids = sorted(set(profile_ids))
+        if not profile_ids:
+            return
+        state = self._ensure_fresh()
+        session = self.db.session
+        profiles = session.execute(
+            sa.select(self.profiles.c.id, self.profiles.c.gpa, self.profiles.c.department)
+            .where(self.profiles.c.id.in_(profile_ids))
+            .order_by(self.profiles.c.id)
+        ).all()
+        pairs = session.execute(
+            sa.select(self.student_skill.c.profile_id, self.student_skill.c.skill_id)
+            .where(self.student_skill.c.profile_id.in_(profile_ids))
+        ).all()
+        known_skills = set(state["skill_ids"].values())
+        new_skills = dict(session.execute(
+            sa.select(self.skill.c.name, self.skill.c.id)
+            .where(self.skill.c.id.in_({skill_id for _, skill_id in pairs} - known_skills))
+        ).all()) if any(skill_id not in known_skills for _, skill_id in pairs) else {}
+        if state["unresolved_skills"].intersection(new_skills):
+            # Some job requires a skill no student had at load time (see jobs_for_student)
+            self.refresh()
+            return
+        with self._lock:
+            state = self._state
+            skill_ids = dict(state["skill_ids"], **new_skills)
+            words = max(state["words"], max(skill_ids.values(), default=0) // 64 + 1)
+            departments = dict(state["departments"])
+            changed = self._student_arrays(profiles, pairs, departments, words)
+            keep = ~np.isin(state["student_ids"], profile_ids)
+            current = {key: state[key][keep] for key in changed}
+            current["bits"] = self._pad_words(current["bits"], words)
+            merged = {key: np.concatenate([current[key], changed[key]]) for key in changed}
+            order = np.argsort(merged["student_ids"], kind="stable")
+            self._state = dict(
+                state, skill_ids=skill_ids, words=words, departments=departments,
+                department_mask=self._widen(state["department_mask"], len(departments)),
+                required=self._pad_words(state["required"], words),
+                **{key: values[order] for key, values in merged.items()},
+            )
+
+    def update_jobs(self, job_ids: Iterable[int]) -> None:
+        """Re-read just these jobs (dropping deleted and inactive ones) into the cached arrays."""
+        job_ids = sorted(set(job_ids))
+        if not job_ids:
+            return
+        self._ensure_fresh()
+        jobs = self.db.session.execute(
+            sa.select(self.jobs.c.id, self.jobs.c.min_gpa, self.jobs.c.eligible_departments, self.jobs.c.required_skills)
+            .where(self.jobs.c.id.in_(job_ids), self.jobs.c.is_active.is_(True))
+            .order_by(self.jobs.c.id)
+        ).all()
+        criteria = [stored_criteria(job.min_gpa, job.eligible_departments, job.required_skills) for job in jobs]
+        with self._lock:
+            state = self._state
+            departments = dict(state["departments"])
+            changed = self._job_arrays(
+                np.fromiter((job.id for job in jobs), dtype=np.int64, count=len(jobs)),
+                criteria, departments, state["skill_ids"], state["words"],
+            )
+            width = max(len(departments), 1)
+            keep = ~np.isin(state["job_ids"], job_ids)
+            current = {key: state[key][keep] for key in changed}
+            current["department_mask"] = self._widen(current["department_mask"], width)
+            changed["department_mask"] = self._widen(changed["department_mask"], width)
+            merged = {key: np.concatenate([current[key], changed[key]]) for key in changed}
+            order = np.argsort(merged["job_ids"], kind="stable")
+            self._state = dict(
+                state, departments=departments,
+                unresolved_skills=state["unresolved_skills"] | {
+                    name for item in criteria for name in item.skills if name not in state["skill_ids"]
+                },
+                **{key: values[order] for key, values in merged.items()},
+            )
+
+    @staticmethod
+    def _pad_words(bits: np.ndarray, words: int) -> np.ndarray:
+        """``bits`` with zero words appended for skill ids beyond its width."""
+        if bits.shape[1] >= words:
+            return bits
+        return np.hstack([bits, np.zeros((bits.shape[0], words - bits.shape[1]), dtype=np.uint64)])
+
+    @staticmethod
+    def _widen(mask: np.ndarray, width: int) -> np.ndarray:
+        """``mask`` with False columns added for departments first seen since it was built."""
+        if mask.shape[1] >= width:
+            return mask
+        return np.hstack([mask, np.zeros((mask.shape[0], width - mask.shape[1]), dtype=bool)])
+
+    @staticmethod
+    def _skill_bits(skills: Iterable[str], skill_ids: Dict[str, int], words: int,
+                    unknown_matches_nobody: bool = True) -> np.ndarray:
+        """Bitset of ``skills`` over ``Skill.id``.
+
+        A required skill missing from the dictionary sets bit 0, which no
+        student has (skill ids start at 1), so nobody qualifies.
+        """
+        vector = np.zeros(words, dtype=np.uint64)
+        for name in skills:
+            skill_id = skill_ids.get(name)
+            if skill_id is None:
+                if unknown_matches_nobody:
+                    vector[0] |= np.uint64(1)
+            else:
+                vector[skill_id // 64] |= np.uint64(1) << np.uint64(skill_id % 64)
+        return vector
+
+    def jobs_for_student(self, gpa: Optional[float], department: Optional[str], skills: Iterable[str]) -> List[int]:
+        """Ids of active jobs a student with these values is eligible for."""
+        skills = list(skills)
+        state = self._ensure_fresh()
+        if state["unresolved_skills"].intersection(skills):
+            # The first student with a skill some job requires: reload so that
+            # job's requirement points at the skill's new id
+            self.refresh()
+            state = self._state
+        if gpa is None:
+            gpa = -np.inf
+        eligible = state["min_gpa"] <= gpa
+        code = state["departments"].get(normalize_department(department))
+        in_department = state["department_mask"][:, code] if code is not None else False
+        eligible &= state["any_department"] | in_department
+        student_bits = self._skill_bits(skills, state["skill_ids"], state["words"], unknown_matches_nobody=False)
+        eligible &= ((state["required"] & student_bits) == state["required"]).all(axis=1)
+        return state["job_ids"][eligible].tolist()
+
+    def students_for_job(self, criteria: EligibilityCriteria) -> List[int]:
+        """Ids of student profiles meeting ``criteria``."""
+        return self.eligible_students(criteria)[0].tolist()
+
+    def eligible_students(self, criteria: EligibilityCriteria) -> Tuple[np.ndarray, np.ndarray]:
+        """``(profile ids, gpas)`` of the students meeting ``criteria``, by ascending id."""
+        state = self._ensure_fresh()
+        eligible = state["gpa"] >= (criteria.min_gpa if criteria.min_gpa is not None else -np.inf)
+        if criteria.departments:
+            codes = [state["departments"][d] for d in criteria.departments if d in state["departments"]]
+            eligible &= np.isin(state["department_codes"], codes)
+        required = self._skill_bits(criteria.skills, state["skill_ids"], state["words"])
+        for word in np.flatnonzero(required):
+            eligible &= (state["bits"][:, word] & required[word]) == required[word]
+        return state["student_ids"][eligible], state["gpa"][eligible]
+
+    def matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(job_ids, student_ids, eligible)`` with ``eligible[j, s]`` for every active job and student."""
+        state = self._ensure_fresh()
+        # Jobs repeat a handful of distinct criteria (same cut-off, branch list and
+        # skills), so each distinct one is evaluated against the students once and
+        # the rows are then gathered back out to every job
+        departments = state["department_mask"] | state["any_department"][:, None]
+        signatures = np.hstack([
+            state["min_gpa"].view(np.uint64)[:, None],
+            departments.astype(np.uint64),
+            state["required"],
+        ])
+        _, first, job_group = np.unique(signatures, axis=0, return_index=True, return_inverse=True)
+
+        eligible = state["gpa"][None, :] >= state["min_gpa"][first][:, None]
+        eligible &= departments[first][:, state["department_codes"]]
+        for word in range(state["words"]):
+            needs = state["required"][first, word][:, None]
+            if needs.any():
+                eligible &= (state["bits"][None, :, word] & needs) == needs
+        eligible = eligible[job_group.ravel()]
+        return state["job_ids"], state["student_ids"], eligible
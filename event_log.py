@@ -0,0 +1,192 @@
+"""
+Placement Event Log for PyTech Arena
+Append-only log of registrations, applications, status changes and
+placements, with hourly and daily rollup counters kept in the same
+transaction so trend queries never scan the raw rows
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+import sqlalchemy as sa
+
+from analytics import BUCKET_FORMATS, TimeBucket, bucket_start
+
+
+STUDENT_REGISTERED = "student_registered"
+APPLICATION_SUBMITTED = "application_submitted"
+APPLICATION_STATUS_CHANGED = "application_status_changed"
+PLACEMENT_RECORDED = "placement_recorded"
+
+# Granularities kept in the rollup table; weeks and months are summed from days
+ROLLUP_GRANULARITIES = ("hour", "day")
+
+_KIND_METRICS = {
+    STUDENT_REGISTERED: "registrations",
+    APPLICATION_SUBMITTED: "applications",
+    PLACEMENT_RECORDED: "placements",
+}
+
+# Friendly names for the per-status metrics ("status:<new status>")
+METRIC_ALIASES = {
+    "reviews": "status:Reviewed",
+    "shortlists": "status:Shortlisted",
+    "rejections": "status:Rejected",
+}
+
+DEFAULT_METRICS = ("registrations", "applications", "shortlists", "placements")
+
+
+class Event(NamedTuple):
+    kind: str
+    occurred_at: datetime
+    user_id: Optional[str] = None
+    application_id: Optional[int] = None
+    job_posting_id: Optional[int] = None
+    # New status of a status change, or the placement status recorded
+    value: Optional[str] = None
+
+
+def event_metric(event: Event) -> str:
+    """Rollup metric an event is counted under."""
+    if event.kind == APPLICATION_STATUS_CHANGED:
+        return f"status:{event.value}"
+    return _KIND_METRICS[event.kind]
+
+
+def resolve_metric(name: str) -> str:
+    return METRIC_ALIASES.get(name, name)
+
+
+def next_bucket(start: datetime, bucket: str) -> datetime:
+    if bucket == "hour":
+        return start + timedelta(hours=1)
+    if bucket == "day":
+        return start + timedelta(days=1)
+    if bucket == "week":
+        return start + timedelta(days=7)
+    year, month = (start.year + 1, 1) if start.month == 12 else (start.year, start.month + 1)
+    return start.replace(year=year, month=month, day=1)
+
+
+def iter_buckets(start: datetime, end: datetime, bucket: str) -> Iterator[datetime]:
+    """Start of every bucket overlapping ``[start, end)``."""
+    current = bucket_start(start, bucket)
+    while current < end:
+        yield current
+        current = next_bucket(current, bucket)
+
+
+def bucket_count(start: datetime, end: datetime, bucket: str) -> int:
+    """Number of buckets ``iter_buckets`` would yield, without iterating."""
+    first = bucket_start(start, bucket)
+    if end <= first:
+        return 0
+    if bucket == "month":
+        last = bucket_start(end - timedelta(microseconds=1), bucket)
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    step = {"hour": 3600, "day": 86400, "week": 7 * 86400}[bucket]
+    return -int(-(end - first).total_seconds() // step)
+
+
+class EventLog:
+    """Writes events and keeps ``(granularity, metric, bucket_start) -> count`` rollups.
+
+    ``record`` appends the events and increments the hourly and daily
+    counters through the caller's connection, so both commit (or roll back)
+    with the change that produced them. Counters are incremented with
+    ``UPDATE ... SET count = count + :n`` so concurrent writers never lose
+    each other's updates. Ranges are answered from the rollups alone.
+    """
+
+    def __init__(self, event_table, rollup_table):
+        self.events = event_table
+        self.rollups = rollup_table
+
+    def record(self, connection, events: Iterable[Event]) -> int:
+        events = list(events)
+        if not events:
+            return 0
+        connection.execute(self.events.insert(), [event._asdict() for event in events])
+        self._increment(connection, self._count(events))
+        return len(events)
+
+    @staticmethod
+    def _count(events: Iterable[Event]) -> Dict:
+        counts: Dict = {}
+        for event in events:
+            metric = event_metric(event)
+            for granularity in ROLLUP_GRANULARITIES:
+                key = (granularity, metric, bucket_start(event.occurred_at, granularity))
+                counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    def _increment(self, connection, counts: Dict) -> None:
+        table = self.rollups
+        for (granularity, metric, start), count in counts.items():
+            result = connection.execute(
+                table.update()
+                .where(table.c.granularity == granularity, table.c.metric == metric, table.c.bucket_start == start)
+                .values(count=table.c.count + count)
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert().values(
+                    granularity=granularity, metric=metric, bucket_start=start, count=count
+                ))
+
+    def rebuild_rollups(self, connection, batch_size: int = 10000) -> int:
+        """Recompute every counter from the event log; returns the number of events."""
+        columns = [self.events.c[name] for name in Event._fields]
+        result = connection.execute(sa.select(*columns).execution_options(yield_per=batch_size))
+        counts: Dict = {}
+        total = 0
+        for rows in result.partitions():
+            for key, count in self._count(Event(*row) for row in rows).items():
+                counts[key] = counts.get(key, 0) + count
+            total += len(rows)
+        connection.execute(self.rollups.delete())
+        if counts:
+            connection.execute(self.rollups.insert(), [
+                {"granularity": granularity, "metric": metric, "bucket_start": start, "count": count}
+                for (granularity, metric, start), count in counts.items()
+            ])
+        return total
+
+    def series(self, connection, metrics: Sequence[str], start: Optional[datetime] = None,
+               end: Optional[datetime] = None, bucket: str = "day") -> Dict[str, List[TimeBucket]]:
+        """Counts per ``bucket`` for each metric over ``[start, end)``.
+
+        Buckets with no events are included as zeros when ``start`` is
+        given, so every series has the same labels. Weeks and months are
+        summed from the daily rollups.
+        """
+        if bucket not in BUCKET_FORMATS:
+            raise ValueError(f"unknown bucket {bucket!r}; expected one of {', '.join(BUCKET_FORMATS)}")
+        granularity = "hour" if bucket == "hour" else "day"
+        table = self.rollups
+        resolved = {name: resolve_metric(name) for name in metrics}
+        conditions = [table.c.granularity == granularity, table.c.metric.in_(set(resolved.values()))]
+        if start is not None:
+            start = bucket_start(start, bucket)
+            conditions.append(table.c.bucket_start >= start)
+        if end is not None:
+            conditions.append(table.c.bucket_start < end)
+
+        totals: Dict[str, Dict[datetime, int]] = {}
+        rows = connection.execute(
+            sa.select(table.c.metric, table.c.bucket_start, table.c.count).where(*conditions)
+        )
+        for metric, started, count in rows:
+            per_bucket = totals.setdefault(metric, {})
+            key = bucket_start(started, bucket)
+            per_bucket[key] = per_bucket.get(key, 0) + count
+
+        fmt = BUCKET_FORMATS[bucket]
+        if start is not None:
+            keys = list(iter_buckets(start, end or datetime.utcnow(), bucket))
+        else:
+            keys = sorted({key for per_bucket in totals.values() for key in per_bucket})
+        return {
+            name: [TimeBucket(key.strftime(fmt), totals.get(metric, {}).get(key, 0)) for key in keys]
+            for name, metric in resolved.items()
+        }
@@ -0,0 +1,58 @@
+"""
+Index Advisor for PyTech Arena
+Runs EXPLAIN QUERY PLAN over the application's registered hot queries and
+flags any that fall back to a full table scan.
+"""
+
+from typing import Callable, Dict, List, NamedTuple
+
+
+class QueryPlan(NamedTuple):
+    name: str
+    sql: str
+    steps: List[str]
+    full_scans: List[str]
+    temp_sorts: List[str]
+
+
+class IndexAdvisor:
+    """Registry of hot queries plus a SQLite query-plan checker."""
+
+    def __init__(self):
+        self._queries: Dict[str, Callable] = {}
+
+    def hot_query(self, name: str):
+        """Register a zero-argument function returning a Query or Select to check."""
+        def decorator(build):
+            self._queries[name] = build
+            return build
+        return decorator
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._queries)
+
+    @staticmethod
+    def full_scans(steps: List[str]) -> List[str]:
+        """Plan steps that read a whole table instead of searching an index.
+
+        ``SCAN t USING INDEX ix`` walks an index in order (used for ORDER BY
+        ... LIMIT) and is not reported; plain ``SCAN t`` is.
+        """
+        return [
+            step for step in steps
+            if step.startswith("SCAN ") and " USING " not in step and "CONSTANT ROW" not in step
+        ]
+
+    def explain(self, connection, name: str) -> QueryPlan:
+        statement = self._queries[name]()
+        statement = getattr(statement, "statement", statement)
+        sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True}))
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        steps = [row[-1] for row in rows]
+        temp_sorts = [step for step in steps if step.startswith("USE TEMP B-TREE")]
+        return QueryPlan(name, sql, steps, self.full_scans(steps), temp_sorts)
+
+    def report(self, connection) -> List[QueryPlan]:
+        """Explain every registered query."""
+        return [self.explain(connection, name) for name in self._queries]
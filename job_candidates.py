@@ -0,0 +1,92 @@
+"""
+Job Candidate Lists for PyTech Arena
+Precomputed eligible students per job posting, rebuilt when a posting is saved
+and patched per student when a profile changes
+"""
+
+from typing import Iterable
+
+import sqlalchemy as sa
+
+from eligibility import EligibilityCriteria, EligibilityMatcher
+from search_index import split_skills
+
+
+class JobCandidateLists:
+    """Maintains ``job_candidate(job_id, profile_id, gpa)`` rows.
+
+    A posting's list is recomputed in full (one vectorized pass over the
+    matcher's student arrays) only when the posting itself is saved. A
+    profile change rewrites just that student's rows, using the matcher's
+    job arrays, so the cost of an edit does not depend on how many students
+    a popular posting has. ``gpa`` is copied onto each row so a page of a
+    list is a range scan of the ``(job_id, gpa, profile_id)`` index.
+
+    All writes go through the caller's connection and commit with it.
+    Callers first patch the changed students and jobs into the matcher
+    (``update_students``/``update_jobs``) rather than reloading it, which
+    would put the full student count back into every edit.
+    """
+
+    def __init__(self, table, matcher: EligibilityMatcher):
+        self.table = table
+        self.matcher = matcher
+
+    def rebuild_job(self, connection, job_id: int, criteria: EligibilityCriteria, active: bool = True) -> int:
+        """Replace one posting's list; inactive postings get an empty list."""
+        connection.execute(self.table.delete().where(self.table.c.job_id == job_id))
+        if not active:
+            return 0
+        profile_ids, gpas = self.matcher.eligible_students(criteria)
+        if len(profile_ids):
+            connection.execute(self.table.insert(), [
+                {"job_id": job_id, "profile_id": profile_id, "gpa": gpa}
+                for profile_id, gpa in zip(profile_ids.tolist(), gpas.tolist())
+            ])
+        return len(profile_ids)
+
+    def update_profiles(self, connection, profiles: Iterable) -> None:
+        """Re-evaluate profiles (objects or rows with id, gpa, department, skills)."""
+        profiles = list(profiles)
+        if not profiles:
+            return
+        self.remove_profiles(connection, [profile.id for profile in profiles])
+        rows = [
+            {"job_id": job_id, "profile_id": profile.id, "gpa": profile.gpa}
+            for profile in profiles
+            for job_id in self.matcher.jobs_for_student(profile.gpa, profile.department, split_skills(profile.skills))
+        ]
+        if rows:
+            connection.execute(self.table.insert(), rows)
+
+    def remove_profiles(self, connection, profile_ids: Iterable[int]) -> None:
+        profile_ids = list(profile_ids)
+        if profile_ids:
+            connection.execute(self.table.delete().where(self.table.c.profile_id.in_(profile_ids)))
+
+    def remove_jobs(self, connection, job_ids: Iterable[int]) -> None:
+        job_ids = list(job_ids)
+        if job_ids:
+            connection.execute(self.table.delete().where(self.table.c.job_id.in_(job_ids)))
+
+    def rebuild_all(self, connection, batch_size: int = 50000) -> int:
+        """Recompute every list from the full eligibility matrix; returns the row count."""
+        self.matcher.refresh()
+        job_ids, profile_ids, eligible = self.matcher.matrix()
+        # Empty criteria admit every student, giving the GPAs aligned with profile_ids
+        gpas = self.matcher.eligible_students(EligibilityCriteria())[1]
+        connection.execute(self.table.delete())
+        job_index, student_index = eligible.nonzero()
+        for start in range(0, len(job_index), batch_size):
+            jobs = job_ids[job_index[start:start + batch_size]].tolist()
+            students = student_index[start:start + batch_size]
+            connection.execute(self.table.insert(), [
+                {"job_id": job_id, "profile_id": profile_id, "gpa": gpa}
+                for job_id, profile_id, gpa in zip(jobs, profile_ids[students].tolist(), gpas[students].tolist())
+            ])
+        return len(job_index)
+
+    def count(self, connection, job_id: int) -> int:
+        return connection.execute(
+            sa.select(sa.func.count()).select_from(self.table).where(self.table.c.job_id == job_id)
+        ).scalar()
@@ -0,0 +1,258 @@
+"""
+Live Event Broker for PyTech Arena
+Fans new notifications and application status changes out to the
+server-sent event streams of the users they belong to
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_HEARTBEAT = 20.0
+# Tail batch size; a larger backlog is read in several batches
+DEFAULT_BATCH_SIZE = 1000
+
+NOTIFICATION = "notification"
+STATUS = "status"
+
+# (last notification id, last status-change event id) a stream has seen
+Cursor = Tuple[int, int]
+
+
+class LiveEvent(NamedTuple):
+    kind: str  # NOTIFICATION or STATUS
+    user_id: str
+    # Notification.id or AnalyticsEvent.id, depending on kind
+    id: int
+    data: Dict
+
+
+def advance(cursor: Cursor, event: LiveEvent) -> Cursor:
+    notification_id, status_id = cursor
+    if event.kind == NOTIFICATION:
+        return max(notification_id, event.id), status_id
+    return notification_id, max(status_id, event.id)
+
+
+def seen(cursor: Cursor, event: LiveEvent) -> bool:
+    return event.id <= (cursor[0] if event.kind == NOTIFICATION else cursor[1])
+
+
+def format_cursor(cursor: Cursor) -> str:
+    return f"{cursor[0]}-{cursor[1]}"
+
+
+def parse_cursor(value: Optional[str]) -> Optional[Cursor]:
+    """Cursor from a ``Last-Event-ID`` header; None when absent or malformed."""
+    try:
+        notification_id, status_id = (int(part) for part in (value or "").split("-"))
+    except ValueError:
+        return None
+    if notification_id < 0 or status_id < 0:
+        return None
+    return notification_id, status_id
+
+
+def format_sse(event: Optional[str], data, event_id: Optional[str] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class Subscription:
+    """One open stream: a bounded queue of events for a single user.
+
+    ``cursor`` is the last position delivered, so an event that arrives
+    both from the catch-up query and from the broker is sent once. If the
+    client stops reading, the oldest queued events are dropped; it picks
+    them up again from the catch-up query when it reconnects.
+    """
+
+    def __init__(self, user_id: str, cursor: Cursor, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.user_id = user_id
+        self.cursor = cursor
+        self._events = deque(maxlen=queue_size)
+        self._ready = threading.Event()
+
+    def put(self, event: LiveEvent) -> None:
+        self._events.append(event)
+        self._ready.set()
+
+    def get(self, timeout: float) -> List[LiveEvent]:
+        """Events queued so far, waiting up to ``timeout`` seconds for the first."""
+        self._ready.wait(timeout)
+        self._ready.clear()
+        events = []
+        while self._events:
+            events.append(self._events.popleft())
+        return events
+
+    def accept(self, event: LiveEvent) -> bool:
+        """Whether this stream has yet to send ``event``; advances its cursor past it."""
+        if seen(self.cursor, event):
+            return False
+        self.cursor = advance(self.cursor, event)
+        return True
+
+
+class LiveEventBroker:
+    """In-process pub/sub between committed changes and open event streams.
+
+    A single daemon thread per process tails the notification table and
+    the status-change rows of the event log with ``fetch(cursor)`` and
+    publishes each row to the subscriptions of its user, so the database
+    sees one small query per ``poll_interval`` however many streams are
+    open, and none at all while nobody is connected. Commits made in this
+    process call ``wake`` to have the rows published at once; other
+    workers' commits are picked up on the next poll.
+
+    ``fetch(cursor, user_id=None, limit=None)`` returns the events after
+    ``cursor`` in id order; ``latest()`` returns the current cursor. The
+    thread is started lazily by the first ``subscribe`` in a process,
+    which keeps it out of a gunicorn master that forks after import.
+    Streams block on ``threading`` primitives, which gevent's monkey
+    patching turns into cooperative waits, so under a gevent worker an
+    idle stream costs a greenlet rather than a thread.
+    """
+
+    def __init__(self, app, fetch: Callable, latest: Callable,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.app = app
+        self.fetch = fetch
+        self.latest = latest
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self._subscribers: Dict[str, set] = {}
+        self._count = 0
+        self._cursor: Optional[Cursor] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    @property
+    def connections(self) -> int:
+        return self._count
+
+    def subscribe(self, user_id: str, cursor: Optional[Cursor] = None) -> Subscription:
+        """Open a stream for ``user_id`` that resumes after ``cursor`` (default: from now).
+
+        Subscribe before running the catch-up query for ``cursor``: rows
+        committed after the broker's own cursor are published to the new
+        subscription, and rows before it are in the catch-up, so nothing
+        falls between the two.
+        """
+        self._ensure_started()
+        latest = None
+        while True:
+            # The query runs outside the lock; the cursor is set and the stream
+            # counted in one critical section, so the poller cannot reset the
+            # cursor in between (it does so whenever no stream is counted)
+            with self._lock:
+                if self._cursor is None and latest is not None:
+                    self._cursor = latest
+                if self._cursor is not None:
+                    subscription = Subscription(user_id, cursor or self._cursor, self.queue_size)
+                    self._subscribers.setdefault(user_id, set()).add(subscription)
+                    self._count += 1
+                    return subscription
+            latest = self.latest()
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscribers.get(subscription.user_id)
+            if subscriptions and subscription in subscriptions:
+                subscriptions.discard(subscription)
+                self._count -= 1
+                if not subscriptions:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, events) -> int:
+        """Queue each event for its user's open streams; returns how many were queued."""
+        delivered = 0
+        with self._lock:
+            for event in events:
+                for subscription in self._subscribers.get(event.user_id, ()):
+                    subscription.put(event)
+                    delivered += 1
+        return delivered
+
+    def wake(self) -> None:
+        """Signal that rows were committed in this process."""
+        self._wakeup.set()
+
+    def poll(self) -> int:
+        """Publish everything committed since the last poll; returns the number of rows read."""
+        if self._cursor is None:
+            self._cursor = self.latest()
+            return 0
+        total = 0
+        while True:
+            events = self.fetch(self._cursor, limit=self.batch_size)
+            for event in events:
+                self._cursor = advance(self._cursor, event)
+            self.publish(events)
+            total += len(events)
+            if len(events) < self.batch_size:
+                return total
+
+    def stream(self, subscription: Subscription, backlog: List[LiveEvent],
+               heartbeat: float = DEFAULT_HEARTBEAT, lifetime: Optional[float] = None) -> Iterator[str]:
+        """Server-sent event frames for ``subscription``, starting with ``backlog``.
+
+        Ends after ``lifetime`` seconds (the browser reconnects with its
+        ``Last-Event-ID``) and unsubscribes however the response is closed.
+        """
+        deadline = time.monotonic() + lifetime if lifetime else None
+        try:
+            yield f"retry: {int(self.poll_interval * 1000)}\n\n"
+            events = backlog
+            while True:
+                for event in events:
+                    if subscription.accept(event):
+                        yield format_sse(event.kind, event.data, format_cursor(subscription.cursor))
+                remaining = deadline - time.monotonic() if deadline else heartbeat
+                if remaining <= 0:
+                    return
+                events = subscription.get(min(heartbeat, remaining))
+                if not events:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._cursor = None
+            self._thread = threading.Thread(target=self._run, name="live-event-broker", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            with self._lock:
+                if not self._count:
+                    # Start from "now" again when the next stream opens
+                    self._cursor = None
+                    continue
+            try:
+                with self.app.app_context():
+                    self.poll()
+            except Exception:
+                self.app.logger.exception("Live event poll failed; retrying on next wake-up")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Login throughput benchmark for PyTech Arena
+Fires bursts of concurrent logins at a running server and reports p50/p99
+latency per concurrency level
+
+    python login_benchmark.py --url http://127.0.0.1:8000 \\
+        --email student@example.com --password Student@2026
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+DEFAULT_LEVELS = (50, 200, 500)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def timed_login(url, email, password, start):
+    """POST one login after ``start`` fires; returns (seconds, status code or error)."""
+    with requests.Session() as http:
+        start.wait()
+        began = time.perf_counter()
+        try:
+            response = http.post(f"{url}/login", data={"email": email, "password": password},
+                                 allow_redirects=False, timeout=120)
+            outcome = response.status_code
+        except requests.RequestException as e:
+            outcome = type(e).__name__
+        return time.perf_counter() - began, outcome
+
+
+def run_level(url, email, password, concurrency):
+    """Release ``concurrency`` logins at once and collect their latencies."""
+    start = threading.Event()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(timed_login, url, email, password, start) for _ in range(concurrency)]
+        time.sleep(0.5)  # let every thread reach the start line
+        began = time.perf_counter()
+        start.set()
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - began
+
+    latencies = [seconds for seconds, outcome in results if outcome == 302]
+    failures = {}
+    for _, outcome in results:
+        if outcome != 302:
+            failures[outcome] = failures.get(outcome, 0) + 1
+    return latencies, failures, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[2])
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="Base URL of the running app")
+    parser.add_argument("--email", required=True, help="Email of an existing account")
+    parser.add_argument("--password", required=True, help="Password of that account")
+    parser.add_argument("--levels", type=int, nargs="+", default=list(DEFAULT_LEVELS),
+                        help="Concurrent logins per burst (default: 50 200 500)")
+    args = parser.parse_args()
+
+    print("🔐 Login Benchmark")
+    print("=" * 72)
+    print(f"{'concurrency':>11} {'ok':>6} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'logins/s':>9}  failures")
+    for concurrency in args.levels:
+        latencies, failures, elapsed = run_level(args.url.rstrip("/"), args.email, args.password, concurrency)
+        if latencies:
+            p50 = percentile(latencies, 0.50) * 1000
+            p99 = percentile(latencies, 0.99) * 1000
+            mean = statistics.mean(latencies) * 1000
+        else:
+            p50 = p99 = mean = float("nan")
+        throughput = len(latencies) / elapsed if elapsed else 0.0
+        print(f"{concurrency:>11} {len(latencies):>6} {p50:>9.0f} {p99:>9.0f} {mean:>9.0f} {throughput:>9.1f}  "
+              f"{failures or '-'}")
+
+
+if __name__ == "__main__":
+    main()
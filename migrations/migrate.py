@@ -100,12 +100,283 @@ class Migration004_AddPlacementDriveModel(Migration):
         print(f"Rolled back migration {self.version}: {self.description}")
 
 
+class Migration005_AddPlacementStatsModel(Migration):
+    """Add materialized PlacementStats summary to database."""
+    
+    def __init__(self):
+        super().__init__("005", "Add PlacementStats summary")
+    
+    def up(self):
+        """Create and backfill the placement_stats table."""
+        from app import rebuild_placement_stats
+        PlacementStats.__table__.create(db.engine, checkfirst=True)
+        rebuild_placement_stats()
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop placement_stats table."""
+        PlacementStats.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration006_AddNotificationCounterModel(Migration):
+    """Add per-user unread NotificationCounter to database."""
+    
+    def __init__(self):
+        super().__init__("006", "Add NotificationCounter")
+    
+    def up(self):
+        """Create notification_counter table (rows are seeded on first use)."""
+        NotificationCounter.__table__.create(db.engine, checkfirst=True)
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop notification_counter table."""
+        NotificationCounter.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration007_AddCandidateSearchIndex(Migration):
+    """Add FTS5 candidate search index to database."""
+    
+    def __init__(self):
+        super().__init__("007", "Add candidate search index")
+    
+    def up(self):
+        """Create and fill the student_search FTS table."""
+        from app import candidate_search
+        with db.engine.begin() as connection:
+            candidate_search.available(connection)
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop student_search FTS table."""
+        from app import candidate_search
+        with db.engine.begin() as connection:
+            connection.execute(db.text(f"DROP TABLE IF EXISTS {candidate_search.TABLE_NAME}"))
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration008_AddSkillModel(Migration):
+    """Add normalized Skill dictionary and student_skill association."""
+    
+    def __init__(self):
+        super().__init__("008", "Add Skill and student_skill")
+    
+    def up(self):
+        """Create skill tables and backfill them from profile skills."""
+        from app import rebuild_student_skills
+        Skill.__table__.create(db.engine, checkfirst=True)
+        student_skill.create(db.engine, checkfirst=True)
+        rebuild_student_skills()
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop skill tables."""
+        student_skill.drop(db.engine, checkfirst=True)
+        Skill.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration009_AddHotQueryIndexes(Migration):
+    """Add composite indexes for the hot queries (see `flask index-report`)."""
+    
+    TABLES = ["User", "StudentProfile", "JobApplication", "JobPosting", "Notification"]
+    
+    def __init__(self):
+        super().__init__("009", "Add hot query indexes")
+    
+    def _indexes(self):
+        for name in self.TABLES:
+            yield from globals()[name].__table__.indexes
+    
+    def up(self):
+        """Create the indexes declared in the models' __table_args__."""
+        for index in self._indexes():
+            index.create(db.engine, checkfirst=True)
+        with db.engine.begin() as connection:
+            connection.exec_driver_sql("ANALYZE")
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop the hot query indexes."""
+        for index in self._indexes():
+            index.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration010_AddNotificationOutboxModel(Migration):
+    """Add NotificationOutbox queue to database."""
+    
+    def __init__(self):
+        super().__init__("010", "Add NotificationOutbox queue")
+    
+    def up(self):
+        """Create notification_outbox table."""
+        NotificationOutbox.__table__.create(db.engine, checkfirst=True)
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop notification_outbox table."""
+        NotificationOutbox.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration011_AddResumeExtraction(Migration):
+    """Add resume extraction jobs and the resume_search FTS table."""
+    
+    def __init__(self):
+        super().__init__("011", "Add resume extraction jobs and resume search index")
+    
+    def up(self):
+        """Create resume_extraction_job and resume_search, then queue existing resumes."""
+        from app import resume_search, enqueue_resume_extraction
+        ResumeExtractionJob.__table__.create(db.engine, checkfirst=True)
+        with db.engine.begin() as connection:
+            resume_search.available(connection)
+        queued = enqueue_resume_extraction()
+        print(f"Applied migration {self.version}: {self.description} ({queued} resumes queued)")
+    
+    def down(self):
+        """Drop resume_search and resume_extraction_job."""
+        from app import resume_search
+        with db.engine.begin() as connection:
+            connection.execute(db.text(f"DROP TABLE IF EXISTS {resume_search.TABLE_NAME}"))
+        ResumeExtractionJob.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration012_AddJobEligibilityCriteria(Migration):
+    """Add structured eligibility criteria columns to JobPosting."""
+    
+    COLUMNS = (
+        ("min_gpa", "FLOAT"),
+        ("eligible_departments", "VARCHAR(255)"),
+        ("required_skills", "VARCHAR(255)"),
+    )
+    
+    def __init__(self):
+        super().__init__("012", "Add parsed eligibility criteria to job postings")
+    
+    def up(self):
+        """Add the criteria columns and parse existing eligibility text into them."""
+        from app import backfill_job_eligibility
+        existing = {column["name"] for column in db.inspect(db.engine).get_columns("job_posting")}
+        with db.engine.begin() as connection:
+            for name, column_type in self.COLUMNS:
+                if name not in existing:
+                    connection.exec_driver_sql(f"ALTER TABLE job_posting ADD COLUMN {name} {column_type}")
+        backfill_job_eligibility()
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop the criteria columns."""
+        with db.engine.begin() as connection:
+            for name, _ in self.COLUMNS:
+                connection.exec_driver_sql(f"ALTER TABLE job_posting DROP COLUMN {name}")
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration013_AddJobCandidateLists(Migration):
+    """Add precomputed eligible-candidate lists per job posting."""
+    
+    def __init__(self):
+        super().__init__("013", "Add job_candidate lists")
+    
+    def up(self):
+        """Create job_candidate and fill it from the eligibility matrix."""
+        from app import job_candidates
+        JobCandidate.__table__.create(db.engine, checkfirst=True)
+        with db.engine.begin() as connection:
+            count = job_candidates.rebuild_all(connection)
+        print(f"Applied migration {self.version}: {self.description} ({count} pairs)")
+    
+    def down(self):
+        """Drop job_candidate table."""
+        JobCandidate.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration014_AddAnalyticsEventLog(Migration):
+    """Add the analytics event log and its hourly/daily rollups."""
+    
+    def __init__(self):
+        super().__init__("014", "Add analytics_event log and analytics_rollup")
+    
+    def up(self):
+        """Create both tables and seed them from existing registrations and applications."""
+        from app import event_log, historical_events
+        AnalyticsEvent.__table__.create(db.engine, checkfirst=True)
+        AnalyticsRollup.__table__.create(db.engine, checkfirst=True)
+        with db.engine.begin() as connection:
+            if connection.execute(db.select(AnalyticsEvent.__table__.c.id).limit(1)).first():
+                count = event_log.rebuild_rollups(connection)
+            else:
+                count = event_log.record(connection, historical_events(connection))
+        print(f"Applied migration {self.version}: {self.description} ({count} events)")
+    
+    def down(self):
+        """Drop analytics_rollup and analytics_event tables."""
+        AnalyticsRollup.__table__.drop(db.engine, checkfirst=True)
+        AnalyticsEvent.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration015_AddApplicationFunnel(Migration):
+    """Add per-posting and per-company application funnel counters."""
+    
+    def __init__(self):
+        super().__init__("015", "Add application_funnel counters")
+    
+    def up(self):
+        """Create application_funnel and count the existing applications."""
+        from app import application_funnel
+        ApplicationFunnelCounter.__table__.create(db.engine, checkfirst=True)
+        with db.engine.begin() as connection:
+            count = application_funnel.rebuild(connection, JobApplication.__table__)
+        print(f"Applied migration {self.version}: {self.description} ({count} applications)")
+    
+    def down(self):
+        """Drop application_funnel table."""
+        ApplicationFunnelCounter.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
+class Migration016_AddStudentImportJobs(Migration):
+    """Add the progress table for background student imports."""
+    
+    def __init__(self):
+        super().__init__("016", "Add student_import_job table")
+    
+    def up(self):
+        """Create student_import_job table."""
+        StudentImportJob.__table__.create(db.engine, checkfirst=True)
+        print(f"Applied migration {self.version}: {self.description}")
+    
+    def down(self):
+        """Drop student_import_job table."""
+        StudentImportJob.__table__.drop(db.engine, checkfirst=True)
+        print(f"Rolled back migration {self.version}: {self.description}")
+
+
 # List of all migrations
 MIGRATIONS = [
     Migration001_AddCompanyModel(),
     Migration002_AddJobPostingModel(),
     Migration003_AddNotificationModel(),
     Migration004_AddPlacementDriveModel(),
+    Migration005_AddPlacementStatsModel(),
+    Migration006_AddNotificationCounterModel(),
+    Migration007_AddCandidateSearchIndex(),
+    Migration008_AddSkillModel(),
+    Migration009_AddHotQueryIndexes(),
+    Migration010_AddNotificationOutboxModel(),
+    Migration011_AddResumeExtraction(),
+    Migration012_AddJobEligibilityCriteria(),
+    Migration013_AddJobCandidateLists(),
+    Migration014_AddAnalyticsEventLog(),
+    Migration015_AddApplicationFunnel(),
+    Migration016_AddStudentImportJobs(),
 ]
 
 
@@ -0,0 +1,129 @@
+"""
+Notification Outbox for PyTech Arena
+Request handlers append notifications to an outbox table inside their own
+transaction; a background dispatcher moves them into the notification table
+in batches
+"""
+
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+def coalesce(rows: Iterable) -> List[Dict]:
+    """Collapse outbox rows carrying the same notification for the same user.
+
+    The earliest copy is kept, so a user who triggers the same event twice
+    before a drain sees one notification.
+    """
+    seen = {}
+    for row in rows:
+        key = (str(row.user_id), row.title, row.message, row.type)
+        if key not in seen:
+            seen[key] = {
+                "user_id": row.user_id,
+                "title": row.title,
+                "message": row.message,
+                "type": row.type,
+                "is_read": False,
+                "created_at": row.created_at,
+            }
+    return list(seen.values())
+
+
+class NotificationDispatcher:
+    """Drains the notification outbox on a daemon thread.
+
+    ``drain`` claims up to ``batch_size`` outbox rows with
+    ``DELETE ... RETURNING``, so two worker processes never deliver the same
+    row, and writes the coalesced notifications with a single executemany
+    in the same transaction. ``on_delivered(connection, {user_id: count})``
+    runs inside that transaction to keep derived counters in step, and
+    ``after_delivered({user_id: count})`` runs once it has committed.
+
+    The thread is started lazily by ``wake`` in the process that enqueues,
+    which keeps it out of a gunicorn master that forks after import.
+    """
+
+    def __init__(self, app, db, outbox_table, notification_table,
+                 on_delivered: Optional[Callable] = None,
+                 after_delivered: Optional[Callable] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.app = app
+        self.db = db
+        self.outbox = outbox_table
+        self.notifications = notification_table
+        self.on_delivered = on_delivered
+        self.after_delivered = after_delivered
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def drain_batch(self) -> int:
+        """Deliver one batch; returns the number of outbox rows consumed."""
+        with self.db.engine.begin() as connection:
+            claimed = sa.select(self.outbox.c.id).order_by(self.outbox.c.id).limit(self.batch_size)
+            rows = connection.execute(
+                self.outbox.delete()
+                .where(self.outbox.c.id.in_(claimed.scalar_subquery()))
+                .returning(self.outbox.c.user_id, self.outbox.c.title, self.outbox.c.message,
+                           self.outbox.c.type, self.outbox.c.created_at)
+            ).fetchall()
+            if not rows:
+                return 0
+
+            notifications = coalesce(rows)
+            delivered = {}
+            for notification in notifications:
+                key = str(notification["user_id"])
+                delivered[key] = delivered.get(key, 0) + 1
+            # Before the insert, so counters seeded from the table see only older rows
+            if self.on_delivered:
+                self.on_delivered(connection, delivered)
+            connection.execute(self.notifications.insert(), notifications)
+
+        if self.after_delivered:
+            self.after_delivered(delivered)
+        return len(rows)
+
+    def drain(self) -> int:
+        """Deliver batches until the outbox is empty."""
+        total = 0
+        while True:
+            count = self.drain_batch()
+            total += count
+            if count < self.batch_size:
+                return total
+
+    def wake(self) -> None:
+        """Signal that new outbox rows were committed."""
+        self._ensure_started()
+        self._wakeup.set()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                with self.app.app_context():
+                    self.drain()
+            except Exception:
+                self.app.logger.exception("Notification dispatch failed; retrying on next wake-up")
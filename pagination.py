@@ -0,0 +1,68 @@
+"""
+Keyset (cursor) pagination helpers for PyTech Arena
+Pages are fetched with ``WHERE (k1, k2) < (:v1, :v2) ORDER BY k1 DESC, k2 DESC LIMIT n``,
+so the cost of a page does not depend on how deep into the list it is.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import literal, tuple_
+
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(values: Sequence) -> str:
+    """Opaque, URL-safe cursor for the sort key of the last row on a page."""
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[List]:
+    """Inverse of ``encode_cursor``; returns None for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(payload, list):
+        return None
+    return [datetime.fromisoformat(v["dt"]) if isinstance(v, dict) and "dt" in v else v for v in payload]
+
+
+def clamp_page_size(per_page: Optional[int]) -> int:
+    if not per_page or per_page < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(per_page, MAX_PAGE_SIZE)
+
+
+def keyset_paginate(query, sort_keys: Sequence, cursor: Optional[str] = None,
+                    per_page: int = DEFAULT_PAGE_SIZE) -> Tuple[list, Optional[str]]:
+    """Return one page of ``query`` ordered by ``sort_keys`` descending.
+
+    ``sort_keys`` must end with a unique column (normally the primary key) so
+    the order is total. Returns the page items and the cursor for the next
+    page, or None when this is the last page.
+    """
+    per_page = clamp_page_size(per_page)
+    query = query.add_columns(*sort_keys)
+
+    values = decode_cursor(cursor)
+    if values is not None and len(values) == len(sort_keys):
+        bound = [literal(value, key.type) for key, value in zip(sort_keys, values)]
+        query = query.filter(tuple_(*sort_keys) < tuple_(*bound))
+
+    rows = query.order_by(None).order_by(*[key.desc() for key in sort_keys]).limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    items = [row[0] for row in rows]
+    next_cursor = encode_cursor(list(rows[-1][1:])) if has_more and rows else None
+    return items, next_cursor
@@ -0,0 +1,120 @@
+"""
+Password Hashing for PyTech Arena
+Runs werkzeug password hashing and verification on a bounded process pool so
+login storms do not pin the request threads, with a configurable hash method
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+# Processes per web worker: every gunicorn worker has its own pool, so this is
+# multiplied by the worker count and must stay small
+DEFAULT_WORKERS = min(2, os.cpu_count() or 1)
+DEFAULT_MAX_PENDING = 16
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing queue is full or an operation overruns the timeout."""
+
+
+def canonical_method(method: str) -> str:
+    """Expand a werkzeug method string to the form stored in hashes.
+
+    ``"pbkdf2"`` -> ``"pbkdf2:sha256:600000"``, ``"scrypt"`` ->
+    ``"scrypt:32768:8:1"``, so stored hashes can be compared to the
+    configured method.
+    """
+    name, *args = method.split(":")
+    if name == "pbkdf2":
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) > 1 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    if name == "scrypt" and not args:
+        return "scrypt:32768:8:1"
+    return method
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a process pool of ``workers`` processes.
+
+    At most ``max_pending`` operations are queued or running at once; a
+    caller that finds the queue full gets ``PasswordHasherBusy`` at once
+    instead of waiting for a slot, and so does one whose operation has not
+    finished within ``timeout`` seconds. ``workers=0`` hashes inline in the
+    calling thread.
+    """
+
+    def __init__(self, method: str = "pbkdf2:sha256", workers: Optional[int] = None,
+                 max_pending: int = DEFAULT_MAX_PENDING, timeout: float = 10.0):
+        self.method = canonical_method(method)
+        self.workers = DEFAULT_WORKERS if workers is None else workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # A pool inherited through fork (gunicorn preload) is not usable in the child
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._pool
+
+    def _run(self, function, *args):
+        if not self.workers:
+            return function(*args)
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise PasswordHasherBusy(f"{self.max_pending} password operations already pending")
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor().submit(function, *args).result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy(f"password operation did not finish within {self.timeout}s") from None
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        if not pwhash:
+            return False
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """Whether ``pwhash`` was made with a different method or cost than configured."""
+        stored = (pwhash or "").split("$", 1)[0]
+        return canonical_method(stored) != self.method
+
+    @property
+    def queue_depth(self) -> int:
+        """Operations currently queued or running on the pool."""
+        return self._pending
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "method": self.method,
+                "workers": self.workers,
+                "queue_depth": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
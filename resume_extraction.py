@@ -0,0 +1,338 @@
+"""
+Resume Text Extraction for PyTech Arena
+Pure-Python text extraction from uploaded PDF, DOCX, DOC and TXT resumes,
+run in a process pool by a background worker that records every job in
+the resume extraction job table
+"""
+
+import html
+import os
+import re
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # optional; the built-in parser below handles common PDFs
+    PdfReader = None
+
+
+# Text kept per resume; enough for any real CV, bounds index growth
+MAX_TEXT_CHARS = 200000
+
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_POLL_INTERVAL = 30.0
+
+
+class UnsupportedResume(ValueError):
+    """Raised for file types text cannot be extracted from."""
+
+
+# --- PDF -------------------------------------------------------------------
+
+_PDF_STREAM = re.compile(rb"<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream", re.S)
+_PDF_TEXT_OBJECT = re.compile(rb"BT(.*?)ET", re.S)
+_PDF_TEXT_TOKEN = re.compile(
+    rb"\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|\[|\]|T\*|Tj|TJ|Td|TD|'|\"|-?\d+\.?\d*"
+)
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+                b"(": b"(", b")": b")", b"\\": b"\\"}
+_CMAP_BFCHAR = re.compile(rb"beginbfchar(.*?)endbfchar", re.S)
+_CMAP_BFRANGE = re.compile(rb"beginbfrange(.*?)endbfrange", re.S)
+_HEX = re.compile(rb"<([0-9A-Fa-f]+)>")
+
+
+def _pdf_streams(data: bytes) -> List[bytes]:
+    streams = []
+    for header, body in _PDF_STREAM.findall(data):
+        if b"/FlateDecode" in header:
+            try:
+                body = zlib.decompress(body)
+            except zlib.error:
+                try:
+                    body = zlib.decompressobj().decompress(body)
+                except zlib.error:
+                    continue
+        elif b"/Filter" in header:
+            continue  # images and other encodings carry no text
+        streams.append(body)
+    return streams
+
+
+def _unicode_from_hex(value: bytes) -> str:
+    raw = bytes.fromhex(value.decode())
+    try:
+        return raw.decode("utf-16-be")
+    except UnicodeDecodeError:
+        return ""
+
+
+def _parse_cmaps(streams: List[bytes]) -> Tuple[Dict[int, str], int]:
+    """Merge every ToUnicode CMap in the file into one code -> text table.
+
+    Also returns the code width in bytes (2 for the usual Identity-H fonts).
+    """
+    mapping: Dict[int, str] = {}
+    width = 1
+    for stream in streams:
+        if b"beginbf" not in stream:
+            continue
+        for block in _CMAP_BFCHAR.findall(stream):
+            values = _HEX.findall(block)
+            for code, text in zip(values[0::2], values[1::2]):
+                mapping[int(code, 16)] = _unicode_from_hex(text)
+                width = max(width, len(code) // 2)
+        for block in _CMAP_BFRANGE.findall(stream):
+            for line in block.splitlines():
+                values = _HEX.findall(line)
+                if len(values) == 3:
+                    width = max(width, len(values[0]) // 2)
+                    start, end, base = (int(v, 16) for v in values)
+                    for offset in range(min(end - start, 0xFFFF) + 1):
+                        mapping[start + offset] = chr(base + offset) if base + offset < 0x110000 else ""
+    return mapping, width
+
+
+def _pdf_literal(token: bytes) -> bytes:
+    body = token[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        char = body[i:i + 1]
+        if char == b"\\" and i + 1 < len(body):
+            nxt = body[i + 1:i + 2]
+            if nxt in _PDF_ESCAPES:
+                out += _PDF_ESCAPES[nxt]
+                i += 2
+                continue
+            octal = re.match(rb"[0-7]{1,3}", body[i + 1:i + 4])
+            if octal:
+                out.append(int(octal.group(), 8) & 0xFF)
+                i += 1 + len(octal.group())
+                continue
+            i += 1
+            continue
+        out += char
+        i += 1
+    return bytes(out)
+
+
+def _decode_pdf_string(token: bytes, cmap: Dict[int, str], width: int) -> str:
+    if token.startswith(b"("):
+        raw = _pdf_literal(token)
+    else:
+        raw = bytes.fromhex(re.sub(rb"\s", b"", token[1:-1]).decode().ljust(2, "0"))
+    if cmap:
+        codes = [int.from_bytes(raw[i:i + width], "big") for i in range(0, len(raw), width)]
+        if all(code in cmap for code in codes):
+            return "".join(cmap[code] for code in codes)
+    return raw.decode("latin-1")
+
+
+def _pdf_text_builtin(data: bytes) -> str:
+    streams = _pdf_streams(data)
+    cmap, width = _parse_cmaps(streams)
+    lines = []
+    for stream in streams:
+        for block in _PDF_TEXT_OBJECT.findall(stream):
+            parts = []
+            for token in _PDF_TEXT_TOKEN.findall(block):
+                if token[:1] in (b"(", b"<"):
+                    parts.append(_decode_pdf_string(token, cmap, width))
+                elif token in (b"T*", b"Td", b"TD", b"'", b'"'):
+                    parts.append("\n")
+                elif token[:1] in b"-0123456789" and token.lstrip(b"-").split(b".")[0].isdigit():
+                    # Large negative kerning inside TJ arrays separates words
+                    if token.startswith(b"-") and float(token) < -200:
+                        parts.append(" ")
+            lines.append("".join(parts))
+    return "\n".join(lines)
+
+
+def extract_pdf_text(path: str) -> str:
+    if PdfReader is not None:
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    with open(path, "rb") as f:
+        return _pdf_text_builtin(f.read())
+
+
+# --- Word ------------------------------------------------------------------
+
+_DOCX_PARAGRAPH = re.compile(r"</w:p>|<w:br\s*/>|<w:tab\s*/>")
+_DOCX_TEXT = re.compile(r"<w:t(?:\s[^>]*)?>([^<]*)</w:t>|(\n)")
+_DOC_TEXT = re.compile(r"[\w][\w .,;:@&()+#/'-]{3,}")
+
+
+def extract_docx_text(path: str) -> str:
+    with zipfile.ZipFile(path) as archive:
+        xml = archive.read("word/document.xml").decode("utf-8", "ignore")
+    xml = _DOCX_PARAGRAPH.sub("\n", xml)
+    return html.unescape("".join(text or newline for text, newline in _DOCX_TEXT.findall(xml)))
+
+
+def extract_doc_text(path: str) -> str:
+    """Best-effort text from a binary Word 97-2003 file (stored as UTF-16LE runs)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return "\n".join(_DOC_TEXT.findall(data.decode("utf-16-le", "ignore")))
+
+
+def extract_text(path: str, filename: Optional[str] = None) -> str:
+    """Plain text of a resume, chosen by file extension."""
+    extension = os.path.splitext(filename or path)[1].lower()
+    if extension == ".pdf":
+        text = extract_pdf_text(path)
+    elif extension == ".docx":
+        text = extract_docx_text(path)
+    elif extension == ".doc":
+        text = extract_doc_text(path)
+    elif extension == ".txt":
+        with open(path, "rb") as f:
+            text = f.read().decode("utf-8", "ignore")
+    else:
+        raise UnsupportedResume(f"cannot extract text from {extension or 'extensionless'} files")
+    return text[:MAX_TEXT_CHARS]
+
+
+def run_extraction(item: Tuple[int, str, str]):
+    """Pool task: ``(job_id, path, name)`` -> ``(job_id, text, status, error, seconds)``."""
+    job_id, path, name = item
+    started = time.perf_counter()
+    try:
+        text = extract_text(path, name)
+        status, error = "done", None
+    except UnsupportedResume as e:
+        text, status, error = None, "skipped", str(e)
+    except Exception as e:
+        text, status, error = None, "failed", f"{type(e).__name__}: {e}"
+    return job_id, text, status, error, time.perf_counter() - started
+
+
+# --- Worker ----------------------------------------------------------------
+
+class ResumeExtractionWorker:
+    """Runs pending extraction jobs on a process pool from a daemon thread.
+
+    Jobs are claimed with ``UPDATE ... RETURNING`` (pending -> running), so
+    several app processes can share one job table. Each result is written in
+    one transaction together with its index update; a job whose profile has
+    since uploaded a different resume is marked ``superseded``.
+    ``store_text(connection, profile_id, text)`` writes the index.
+    """
+
+    def __init__(self, app, db, job_table, profile_table, resolve_path, store_text,
+                 workers: int = 1, batch_size: int = DEFAULT_BATCH_SIZE,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.app = app
+        self.db = db
+        self.jobs = job_table
+        self.profiles = profile_table
+        self.resolve_path = resolve_path
+        self.store_text = store_text
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pool = None
+        self._pid = None
+        self._thread_pid = None
+        self._lock = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._pool
+
+    def _claim(self):
+        jobs = self.jobs
+        with self.db.engine.begin() as connection:
+            pending = (
+                sa.select(jobs.c.id).where(jobs.c.status == "pending")
+                .order_by(jobs.c.id).limit(self.batch_size)
+            )
+            return connection.execute(
+                jobs.update()
+                .where(jobs.c.id.in_(pending.scalar_subquery()), jobs.c.status == "pending")
+                .values(status="running", started_at=datetime.utcnow())
+                .returning(jobs.c.id, jobs.c.profile_id, jobs.c.blob_name)
+            ).fetchall()
+
+    def _record(self, claimed, results) -> None:
+        jobs, profiles = self.jobs, self.profiles
+        profile_of = {job.id: job for job in claimed}
+        with self.db.engine.begin() as connection:
+            for job_id, text, status, error, seconds in results:
+                job = profile_of[job_id]
+                current = connection.execute(
+                    sa.select(profiles.c.resume_filename).where(profiles.c.id == job.profile_id)
+                ).scalar()
+                if current != job.blob_name:
+                    status, text = "superseded", None
+                if text is not None:
+                    self.store_text(connection, job.profile_id, text)
+                connection.execute(
+                    jobs.update().where(jobs.c.id == job_id).values(
+                        status=status, error=error, chars=len(text) if text is not None else None,
+                        finished_at=datetime.utcnow(), duration_ms=int(seconds * 1000),
+                    )
+                )
+
+    def process_batch(self) -> int:
+        """Run one batch of pending jobs; returns how many were processed."""
+        claimed = self._claim()
+        if not claimed:
+            return 0
+        items = [(job.id, self.resolve_path(job.blob_name), job.blob_name) for job in claimed]
+        if self.workers:
+            results = list(self._executor().map(run_extraction, items))
+        else:
+            results = [run_extraction(item) for item in items]
+        self._record(claimed, results)
+        return len(claimed)
+
+    def drain(self) -> int:
+        total = 0
+        while True:
+            count = self.process_batch()
+            total += count
+            if count < self.batch_size:
+                return total
+
+    def requeue_stale(self, max_age: float) -> int:
+        """Put jobs left ``running`` by a crashed worker back to ``pending``."""
+        cutoff = datetime.utcfromtimestamp(time.time() - max_age)
+        with self.db.engine.begin() as connection:
+            return connection.execute(
+                self.jobs.update()
+                .where(self.jobs.c.status == "running", self.jobs.c.started_at < cutoff)
+                .values(status="pending", started_at=None)
+            ).rowcount
+
+    def wake(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive() or self._thread_pid != os.getpid():
+                self._thread_pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="resume-extraction", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                with self.app.app_context():
+                    self.drain()
+            except Exception:
+                self.app.logger.exception("Resume extraction batch failed; retrying on next wake-up")
@@ -0,0 +1,219 @@
+"""
+Candidate Search Index for PyTech Arena
+SQLite FTS5 indexes over student skills, projects, internships and certifications,
+and over text extracted from uploaded resumes
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+
+
+# Spellings that tokenizers would otherwise mangle ("c++" -> "c") or split apart
+_TOKEN_REWRITES = [
+    (re.compile(r"c\+\+"), " cpp "),
+    (re.compile(r"c#"), " csharp "),
+    (re.compile(r"f#"), " fsharp "),
+    (re.compile(r"(?<![a-z0-9])\.net\b"), " dotnet "),
+    (re.compile(r"\b([a-z]+)\.js\b"), r" \1js "),
+]
+
+# Whole-skill synonyms mapped to one canonical name
+SKILL_ALIASES = {
+    "golang": "go",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "reactjs": "react",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_SKILL_SEPARATORS = re.compile(r"[,;/|\n]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lowercase text and reduce it to space separated alphanumeric tokens."""
+    if not text:
+        return ""
+    text = text.lower()
+    for pattern, replacement in _TOKEN_REWRITES:
+        text = pattern.sub(replacement, text)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def normalize_skill(skill: Optional[str]) -> str:
+    """Canonical form of a single skill, e.g. ``" Node.js "`` -> ``"nodejs"``."""
+    skill = normalize_text(skill)
+    return SKILL_ALIASES.get(skill, skill)
+
+
+def split_skills(skills: Optional[str]) -> List[str]:
+    """Split a free-text, comma separated skills field into unique canonical skills."""
+    seen = []
+    for part in _SKILL_SEPARATORS.split(skills or ""):
+        skill = normalize_skill(part)
+        if skill and skill not in seen:
+            seen.append(skill)
+    return seen
+
+
+def build_match_query(text: Optional[str], match_all: bool = False) -> Optional[str]:
+    """Translate user search text into an FTS5 MATCH expression.
+
+    Every term is a prefix match, so ``java`` still finds ``javascript`` the
+    way the old ``ILIKE '%java%'`` filter did. Terms are ORed and bm25 ranks
+    profiles matching more of them first; ``match_all`` requires every term.
+    """
+    terms = []
+    for term in normalize_text(text).split():
+        term = SKILL_ALIASES.get(term, term)
+        terms.extend(term.split())
+    if not terms:
+        return None
+    joiner = " AND " if match_all else " OR "
+    return joiner.join(f'"{term}"*' for term in dict.fromkeys(terms))
+
+
+class CandidateSearchIndex:
+    """FTS5 index of student profiles keyed by ``StudentProfile.id``.
+
+    The index row for a profile uses the profile id as its rowid. Rows are
+    written through ``sync`` from the session flush, so the index commits or
+    rolls back together with the profile change. On databases without FTS5
+    ``available`` is False and callers fall back to ``ILIKE`` filtering.
+    """
+
+    TABLE_NAME = "student_search"
+    COLUMNS = ("skills", "projects", "internships", "certifications")
+    # bm25 weights per column: a skill hit outranks a mention in a project
+    WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+    MATCH_NAME = "candidate_match"
+
+    def __init__(self, db, profile_model):
+        self.db = db
+        self.StudentProfile = profile_model
+        self._available = None
+        self.table = sa.table(self.TABLE_NAME, sa.column("rowid"), *[sa.column(c) for c in self.COLUMNS])
+
+    def available(self, connection=None) -> bool:
+        """Whether the FTS table exists, creating it on first use."""
+        if self._available is None:
+            if connection is None:
+                with self.db.engine.begin() as conn:
+                    return self.available(conn)
+            if connection.dialect.name != "sqlite":
+                self._available = False
+                return False
+            try:
+                exists = connection.execute(
+                    sa.text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": self.TABLE_NAME}
+                ).first()
+                if not exists:
+                    self.create(connection)
+                    self.rebuild(connection)
+                self._available = True
+            except sa.exc.OperationalError:
+                # SQLite built without FTS5
+                self._available = False
+        return self._available
+
+    def create(self, connection) -> None:
+        columns = ", ".join(self.COLUMNS)
+        connection.execute(sa.text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.TABLE_NAME} "
+            f"USING fts5({columns}, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+
+    def document(self, profile) -> Dict:
+        """Index row for a profile: canonical skills plus normalized free text."""
+        return {
+            "rowid": profile.id,
+            "skills": " ".join(split_skills(profile.skills)),
+            "projects": normalize_text(profile.projects),
+            "internships": normalize_text(profile.internships),
+            "certifications": normalize_text(profile.certifications),
+        }
+
+    def sync(self, connection, upserts: Iterable = (), deletes: Iterable[int] = ()) -> None:
+        """Write changed profiles to the index and drop deleted ones."""
+        if not self.available(connection):
+            return
+        delete_ids = [profile_id for profile_id in deletes]
+        documents = [self.document(profile) for profile in upserts]
+        delete_ids.extend(doc["rowid"] for doc in documents)
+        if delete_ids:
+            connection.execute(sa.delete(self.table).where(self.table.c.rowid.in_(delete_ids)))
+        if documents:
+            connection.execute(sa.insert(self.table), documents)
+
+    def rebuild(self, connection, batch_size: int = 1000) -> int:
+        """Re-index every profile; returns the number of indexed rows."""
+        connection.execute(sa.delete(self.table))
+        profiles = self.StudentProfile.__table__
+        result = connection.execute(
+            sa.select(profiles.c.id, profiles.c.skills, profiles.c.projects,
+                      profiles.c.internships, profiles.c.certifications)
+            .execution_options(yield_per=batch_size)
+        )
+        count = 0
+        for rows in result.partitions():
+            connection.execute(sa.insert(self.table), [self.document(row) for row in rows])
+            count += len(rows)
+        return count
+
+    def match(self, text: Optional[str], match_all: bool = False):
+        """Subquery of ``(profile_id, rank)`` for profiles matching ``text``.
+
+        Lower rank is better; join it to StudentProfile and order by
+        ``rank``. Returns None when the text has no searchable terms.
+        """
+        expression = build_match_query(text, match_all)
+        if expression is None:
+            return None
+        table = sa.literal_column(self.TABLE_NAME)
+        rank = sa.func.bm25(table, *self.WEIGHTS)
+        return (
+            sa.select(self.table.c.rowid.label("profile_id"), rank.label("rank"))
+            .select_from(self.table)
+            .where(table.op("MATCH")(expression))
+            .subquery(self.MATCH_NAME)
+        )
+
+    def search(self, text: Optional[str], limit: int = 50, match_all: bool = False) -> List[int]:
+        """Ranked profile ids for ``text``."""
+        subquery = self.match(text, match_all)
+        if subquery is None or not self.available():
+            return []
+        statement = sa.select(subquery.c.profile_id).order_by(subquery.c.rank).limit(limit)
+        return list(self.db.session.execute(statement).scalars())
+
+
+class ResumeSearchIndex(CandidateSearchIndex):
+    """FTS5 index of extracted resume text keyed by ``StudentProfile.id``.
+
+    Rows are written by the resume extraction worker rather than from the
+    profile itself, so ``rebuild`` cannot recreate them; re-run the
+    extraction jobs instead.
+    """
+
+    TABLE_NAME = "resume_search"
+    COLUMNS = ("content",)
+    WEIGHTS = (1.0,)
+    MATCH_NAME = "resume_match"
+
+    def document(self, item) -> Dict:
+        """Index row for ``item`` with ``id`` (profile id) and raw ``content``."""
+        return {"rowid": item.id, "content": normalize_text(item.content)}
+
+    def rebuild(self, connection, batch_size: int = 1000) -> int:
+        return 0
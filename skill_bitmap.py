@@ -0,0 +1,102 @@
+"""
+Skill Bitmap Index for PyTech Arena
+In-memory per-skill bitsets over StudentProfile ids for fast skill filters
+"""
+
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import sqlalchemy as sa
+
+from search_index import normalize_skill
+
+
+class SkillBitmapIndex:
+    """Per-skill Python int bitsets keyed by ``StudentProfile.id``.
+
+    Bit ``n`` of a skill's bitmap is set when profile ``n`` lists that skill,
+    so "Python AND SQL" is one ``&`` and "Go OR Rust" one ``|`` over the
+    bitmaps, followed by a single ``id IN (...)`` fetch.
+
+    Writes made in this process are applied as soon as they commit (see
+    ``apply_changes``). Writes from other worker processes are picked up
+    when the bitmaps are reloaded from ``student_skill`` after ``ttl``
+    seconds.
+    """
+
+    def __init__(self, db, skill_table, student_skill_table, ttl: float = 60.0):
+        self.db = db
+        self.skill = skill_table
+        self.student_skill = student_skill_table
+        self.ttl = ttl
+        self._bitmaps: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Reload every bitmap from the student_skill association."""
+        bitmaps: Dict[str, int] = {}
+        statement = (
+            sa.select(self.skill.c.name, self.student_skill.c.profile_id)
+            .select_from(self.student_skill.join(self.skill, self.skill.c.id == self.student_skill.c.skill_id))
+            .execution_options(yield_per=5000)
+        )
+        for name, profile_id in self.db.session.execute(statement):
+            bitmaps[name] = bitmaps.get(name, 0) | (1 << profile_id)
+
+        with self._lock:
+            self._bitmaps = bitmaps
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+            self.refresh()
+
+    def apply_changes(self, changes: Dict[int, Optional[Iterable[str]]]) -> None:
+        """Apply committed ``{profile_id: skills}`` changes; ``None`` removes the profile."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for profile_id, skills in changes.items():
+                bit = 1 << profile_id
+                for name in list(self._bitmaps):
+                    if self._bitmaps[name] & bit:
+                        self._bitmaps[name] &= ~bit
+                for name in skills or ():
+                    self._bitmaps[name] = self._bitmaps.get(name, 0) | bit
+
+    def match(self, all_skills: Iterable[str] = (), any_skills: Iterable[str] = ()) -> Optional[int]:
+        """Bitmap of profiles having every skill in ``all_skills`` and at least
+        one in ``any_skills``. Returns None when neither filter is given.
+        """
+        all_skills = [normalize_skill(s) for s in all_skills if normalize_skill(s)]
+        any_skills = [normalize_skill(s) for s in any_skills if normalize_skill(s)]
+        if not all_skills and not any_skills:
+            return None
+
+        self._ensure_fresh()
+        bitmaps = self._bitmaps
+        result = None
+        for name in all_skills:
+            bits = bitmaps.get(name, 0)
+            result = bits if result is None else result & bits
+            if not result:
+                return 0
+        if any_skills:
+            union = 0
+            for name in any_skills:
+                union |= bitmaps.get(name, 0)
+            result = union if result is None else result & union
+        return result
+
+    @staticmethod
+    def to_ids(bits: int) -> List[int]:
+        """Expand a bitmap into the sorted list of set bit positions."""
+        ids = []
+        digits = bin(bits)[:1:-1]
+        position = digits.find("1")
+        while position != -1:
+            ids.append(position)
+            position = digits.find("1", position + 1)
+        return ids
@@ -0,0 +1,135 @@
+"""
+SQLite Tuning for PyTech Arena
+Connection pragmas and pool settings for running the SQLite database under
+several gunicorn workers, plus a report of the settings actually in effect
+"""
+
+import os
+import sqlite3
+import sys
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+# Pragmas applied to every new connection, by profile name
+SQLITE_PROFILES = {
+    # Flask-SQLAlchemy / sqlite3 defaults: rollback journal, no busy wait
+    "default": {},
+    # WAL lets readers run alongside the single writer; NORMAL sync is
+    # durable across application crashes and only fsyncs at checkpoints
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "mmap_size": 268435456,
+        "cache_size": -65536,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Environment overrides, e.g. SQLITE_BUSY_TIMEOUT=10000
+PRAGMA_ENV = {
+    "journal_mode": "SQLITE_JOURNAL_MODE",
+    "synchronous": "SQLITE_SYNCHRONOUS",
+    "busy_timeout": "SQLITE_BUSY_TIMEOUT",
+    "mmap_size": "SQLITE_MMAP_SIZE",
+    "cache_size": "SQLITE_CACHE_SIZE",
+    "temp_store": "SQLITE_TEMP_STORE",
+}
+
+
+# Background threads that each hold a connection of their own: the notification
+# dispatcher, the resume extractor and the live event poller
+BACKGROUND_CONNECTIONS = 3
+# Pool size for a gevent/eventlet worker. Its greenlets each keep a connection
+# checked out for the length of a request (event streams release theirs), so
+# the pool covers the requests in flight rather than the worker's threads
+ASYNC_POOL_SIZE = 20
+
+
+def async_worker() -> bool:
+    """Whether this process runs under a gevent or eventlet worker.
+
+    Both worker classes monkey-patch ``socket`` before the app is imported;
+    neither library is imported here if the worker has not loaded it.
+    """
+    gevent_monkey = sys.modules.get("gevent.monkey")
+    if gevent_monkey is not None and gevent_monkey.is_module_patched("socket"):
+        return True
+    eventlet_patcher = sys.modules.get("eventlet.patcher")
+    return eventlet_patcher is not None and eventlet_patcher.is_monkey_patched("socket")
+
+
+def is_sqlite_file(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas(profile: str = "production") -> Dict[str, object]:
+    """Pragmas for ``profile`` with any ``SQLITE_*`` environment overrides applied."""
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile {profile!r}; expected one of {sorted(SQLITE_PROFILES)}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for name, env in PRAGMA_ENV.items():
+        value = os.getenv(env)
+        if value:
+            pragmas[name] = int(value) if value.lstrip("-").isdigit() else value
+    return pragmas
+
+
+def engine_options(uri: str, pragmas: Dict[str, object], threads: Optional[int] = None) -> Dict:
+    """``SQLALCHEMY_ENGINE_OPTIONS`` for a file-backed SQLite database.
+
+    Each gunicorn worker is its own process with its own pool. Under a sync
+    or threaded worker the pool covers that worker's request threads
+    (``GUNICORN_THREADS``, 1 for sync workers) plus the background threads.
+    Anything beyond that would just queue on SQLite's single write lock. A
+    gevent/eventlet worker runs many requests at once, so it gets
+    ``ASYNC_POOL_SIZE``. ``SQLITE_POOL_SIZE`` and ``SQLITE_MAX_OVERFLOW``
+    override both. In-memory and non-SQLite URIs get no options.
+    """
+    if not is_sqlite_file(uri):
+        return {}
+    if async_worker():
+        size = ASYNC_POOL_SIZE
+    else:
+        size = (threads or int(os.getenv("GUNICORN_THREADS", "1"))) + BACKGROUND_CONNECTIONS
+    busy_seconds = int(pragmas.get("busy_timeout", 5000)) / 1000
+    return {
+        "pool_size": int(os.getenv("SQLITE_POOL_SIZE", size)),
+        "max_overflow": int(os.getenv("SQLITE_MAX_OVERFLOW", size)),
+        "pool_timeout": max(busy_seconds, 1),
+        "pool_recycle": int(os.getenv("SQLITE_POOL_RECYCLE", "3600")),
+        "connect_args": {"timeout": busy_seconds, "check_same_thread": False},
+    }
+
+
+def install_pragmas(engine, pragmas: Dict[str, object]) -> None:
+    """Run ``pragmas`` on every connection ``engine`` opens."""
+    if not pragmas or engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+def effective_settings(engine) -> Dict[str, object]:
+    """Pragma values read back from a live connection plus the pool configuration."""
+    report = {"database": engine.url.database, "pool": engine.pool.status()}
+    if engine.dialect.name != "sqlite":
+        return report
+    with engine.connect() as connection:
+        for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size",
+                     "cache_size", "temp_store"):
+            report[name] = connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+    return report
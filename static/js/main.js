@@ -344,4 +344,200 @@ const Utils = {
             timeout = setTimeout(later, wait);
         };
     }
-};
\ No newline at end of file
+};
+// Resumable chunked uploads for <input type="file" data-resumable-upload="resume|photo">
+document.addEventListener('DOMContentLoaded', function() {
+    const inputs = document.querySelectorAll('input[type="file"][data-resumable-upload]');
+    if (!inputs.length || !window.fetch || !window.Blob || !Blob.prototype.slice) {
+        return; // Fall back to the regular form post
+    }
+
+    const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+    async function startOrResume(file, kind) {
+        const key = `upload:${kind}:${file.name}:${file.size}:${file.lastModified}`;
+        const saved = localStorage.getItem(key);
+        if (saved) {
+            const response = await fetch(`/student/uploads/${saved}`);
+            if (response.ok) {
+                return { key, upload: await response.json() };
+            }
+            localStorage.removeItem(key);
+        }
+        const response = await fetch('/student/uploads', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ kind: kind, filename: file.name, size: file.size })
+        });
+        const upload = await response.json();
+        if (!response.ok) {
+            throw new Error(upload.error || 'Upload could not be started');
+        }
+        localStorage.setItem(key, upload.id);
+        return { key, upload };
+    }
+
+    async function uploadFile(input, status) {
+        const file = input.files[0];
+        const kind = input.dataset.resumableUpload;
+        const chunkSize = parseInt(input.dataset.chunkSize, 10) || 1024 * 1024;
+        let { key, upload } = await startOrResume(file, kind);
+        let offset = upload.offset;
+        let failures = 0;
+
+        while (offset < file.size) {
+            try {
+                const response = await fetch(`/student/uploads/${upload.id}`, {
+                    method: 'PUT',
+                    headers: { 'Upload-Offset': String(offset) },
+                    body: file.slice(offset, offset + chunkSize)
+                });
+                const result = await response.json();
+                if (response.status === 409 && typeof result.offset === 'number') {
+                    offset = result.offset; // Server has a different offset; continue from there
+                    continue;
+                }
+                if (!response.ok) {
+                    throw new Error(result.error || 'Upload failed');
+                }
+                offset = result.offset;
+                failures = 0;
+                status.textContent = `Uploading… ${Math.floor(offset * 100 / file.size)}%`;
+            } catch (error) {
+                failures += 1;
+                if (failures > 8) {
+                    throw error;
+                }
+                status.textContent = 'Connection lost, retrying…';
+                await sleep(Math.min(30000, 1000 * 2 ** failures));
+                const response = await fetch(`/student/uploads/${upload.id}`);
+                if (response.ok) {
+                    offset = (await response.json()).offset;
+                }
+            }
+        }
+        localStorage.removeItem(key);
+    }
+
+    inputs.forEach(input => {
+        const status = document.createElement('p');
+        status.className = 'mt-1';
+        input.insertAdjacentElement('afterend', status);
+
+        input.addEventListener('change', async function() {
+            if (!input.files.length) {
+                return;
+            }
+            try {
+                await uploadFile(input, status);
+                status.textContent = 'Uploaded ✓';
+                input.value = ''; // Already attached; don't send it again with the form
+            } catch (error) {
+                status.textContent = `${error.message}. The file will be sent with the form instead.`;
+            }
+        });
+    });
+});
+
+// Live notifications and application status changes over server-sent events (/api/live)
+document.addEventListener('DOMContentLoaded', function() {
+    const url = document.body.dataset.liveEvents;
+    if (!url || !window.EventSource) {
+        return;
+    }
+    const badge = document.querySelector('[data-notification-count]');
+    const categories = { error: 'danger', success: 'success', warning: 'warning' };
+
+    function showNotice(text, category) {
+        let container = document.querySelector('.flash-messages');
+        if (!container) {
+            container = document.createElement('div');
+            container.className = 'flash-messages';
+            document.querySelector('main').prepend(container);
+        }
+        const alert = document.createElement('div');
+        alert.className = `alert alert-${category}`;
+        const icon = document.createElement('i');
+        icon.className = 'fas fa-bell';
+        alert.append(icon, ' ', text);
+        container.appendChild(alert);
+        setTimeout(() => alert.remove(), 8000);
+    }
+
+    function connect() {
+        const source = new EventSource(url);
+
+        source.addEventListener('notification', function(e) {
+            const notification = JSON.parse(e.data);
+            if (badge) {
+                badge.textContent = String((parseInt(badge.textContent, 10) || 0) + 1);
+            }
+            showNotice(`${notification.title}: ${notification.message}`, categories[notification.type] || 'info');
+        });
+
+        source.addEventListener('status', function(e) {
+            const change = JSON.parse(e.data);
+            document.querySelectorAll(`[data-application-status="${change.application_id}"]`).forEach(element => {
+                element.textContent = change.status;
+            });
+            showNotice(`Your application for ${change.job_title} at ${change.company_name} is now ${change.status}.`, 'info');
+        });
+
+        source.addEventListener('error', function() {
+            // Dropped streams are retried by the browser; an error response (e.g. 503) closes the source
+            if (source.readyState === EventSource.CLOSED) {
+                setTimeout(connect, 60000);
+            }
+        });
+    }
+
+    connect();
+});
+
+// Bulk status changes for the selected applications (recruiter dashboard)
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('form[data-bulk-status]');
+    if (!form || !window.fetch) {
+        return;
+    }
+    const boxes = () => Array.from(document.querySelectorAll('input[data-bulk-select]'));
+    const result = form.querySelector('[data-bulk-result]');
+
+    form.querySelector('[data-bulk-select-all]').addEventListener('change', function() {
+        boxes().forEach(box => { box.checked = this.checked; });
+    });
+
+    form.addEventListener('submit', async function(e) {
+        e.preventDefault();
+        const ids = boxes().filter(box => box.checked).map(box => parseInt(box.value, 10));
+        const button = form.querySelector('button[type="submit"]');
+        if (!ids.length) {
+            result.textContent = 'Select at least one application.';
+            button.disabled = false;
+            return;
+        }
+        const status = form.elements.status.value;
+        try {
+            const response = await fetch(form.dataset.bulkStatus, {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ status: status, ids: ids })
+            });
+            const summary = await response.json();
+            if (!response.ok) {
+                throw new Error(summary.error || 'Update failed');
+            }
+            ids.forEach(id => {
+                document.querySelectorAll(`[data-application-status="${id}"]`).forEach(element => {
+                    element.textContent = status;
+                });
+            });
+            result.textContent = `${summary.updated} updated, ${summary.unchanged} already ${status}` +
+                (summary.not_found.length ? `, ${summary.not_found.length} not found` : '') + '.';
+        } catch (error) {
+            result.textContent = error.message;
+        } finally {
+            button.disabled = false;
+        }
+    });
+});
@@ -0,0 +1,291 @@
+"""
+Bulk Student Importer for PyTech Arena
+Streams a registrar CSV, validates rows and hashes passwords in a process
+pool, and inserts User + StudentProfile rows in batched transactions
+"""
+
+import csv
+import io
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import sqlalchemy as sa
+from werkzeug.security import generate_password_hash
+
+from validation import sanitize_input, validate_email, validate_phone, validate_rows
+
+
+REQUIRED_COLUMNS = ("name", "email", "department", "gpa")
+PROFILE_COLUMNS = ("skills", "phone", "linkedin", "github", "portfolio", "placement_status")
+
+DEFAULT_BATCH_SIZE = 500
+# Attempts at a batch whose user ids or emails were taken by a concurrent writer
+INSERT_ATTEMPTS = 5
+
+
+class RowError(NamedTuple):
+    line: int
+    email: str
+    message: str
+
+
+class ImportReport(NamedTuple):
+    created: int
+    errors: List[RowError]
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.created / self.seconds if self.seconds else 0.0
+
+
+def read_rows(stream) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """Yield ``(line_number, row)`` from a CSV file without reading it all.
+
+    ``stream`` may be a text or binary file object (e.g. an upload); header
+    names are matched case-insensitively.
+    """
+    if not isinstance(stream, io.TextIOBase):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None:
+        return
+    reader.fieldnames = [(name or "").strip().lower() for name in reader.fieldnames]
+    missing = [column for column in REQUIRED_COLUMNS if column not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"CSV is missing required columns: {', '.join(missing)}")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _required(column):
+    def rule(value):
+        return None if value else f"{column} is required"
+    return rule
+
+
+def _email_error(value):
+    if not value:
+        return "email is required"
+    return None if validate_email(value) else "invalid email address"
+
+
+def _gpa_error(value):
+    if not value:
+        return "gpa is required"
+    try:
+        gpa = float(value)
+    except ValueError:
+        return f"gpa {value!r} is not a number"
+    return None if 0 <= gpa <= 10 else "gpa must be between 0 and 10"
+
+
+def _phone_error(value):
+    return None if not value or validate_phone(value) else "invalid phone number"
+
+
+# Checked in order; a row is reported with the first failing column
+ROW_RULES = {
+    "name": _required("name"),
+    "email": _email_error,
+    "department": _required("department"),
+    "gpa": _gpa_error,
+    "phone": _phone_error,
+}
+
+
+def prepare_rows(item: Tuple[List[Tuple[int, Dict[str, str]]], Optional[str], str]):
+    """Validate a chunk of rows and hash their passwords.
+
+    Runs in a worker process. Returns ``(line, record, None)`` for each valid
+    row and ``(line, None, RowError)`` for each rejected one.
+    """
+    chunk, default_password, password_method = item
+    rows = []
+    for _, row in chunk:
+        row = {key: (value or "").strip() for key, value in row.items() if key}
+        row["email"] = row.get("email", "").lower()
+        rows.append(row)
+    failures = dict(validate_rows(rows, ROW_RULES))
+
+    results = []
+    for index, ((line, _), row) in enumerate(zip(chunk, rows)):
+        if index in failures:
+            results.append((line, None, RowError(line, row["email"], next(iter(failures[index].values())))))
+            continue
+        password = row.get("password") or default_password
+        if not password:
+            results.append((line, None, RowError(line, row["email"], "password is required (or pass a default password)")))
+            continue
+        record = {
+            "name": sanitize_input(row["name"]),
+            "email": row["email"],
+            "department": sanitize_input(row["department"]),
+            "gpa": float(row["gpa"]),
+            "password_hash": generate_password_hash(password, password_method),
+        }
+        for column in PROFILE_COLUMNS:
+            record[column] = row.get(column) or None
+        record["placement_status"] = record["placement_status"] or "Not Placed"
+        results.append((line, record, None))
+    return results
+
+
+def _batches(items: Iterable, size: int) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class StudentImporter:
+    """Create student accounts from a CSV in batches.
+
+    Every batch is one transaction on ``db.session``: a single executemany
+    for the users and one for their profiles. While a batch is inserted, the
+    next one is already being validated and hashed in the process pool.
+
+    ``before_insert(connection, records)`` and
+    ``after_insert(connection, profiles)`` run inside the batch transaction,
+    around the profile insert, so the caller can keep derived tables in step
+    (Core inserts bypass the ORM flush listeners). ``after_import()`` runs
+    once at the end, for caches that are cheaper to reload than to patch
+    per batch.
+
+    User ids continue the numeric sequence from ``max(id) + 1``. A
+    concurrent import or registration can take the same ids (or one of the
+    emails) between that read and the insert; the batch is then rolled back
+    and retried with fresh ids and a fresh email check.
+    """
+
+    def __init__(self, db, user_table, profile_table,
+                 batch_size: int = DEFAULT_BATCH_SIZE, workers: Optional[int] = None,
+                 password_method: str = "pbkdf2:sha256",
+                 before_insert: Optional[Callable] = None, after_insert: Optional[Callable] = None,
+                 after_import: Optional[Callable] = None):
+        self.db = db
+        self.users = user_table
+        self.profiles = profile_table
+        self.batch_size = batch_size
+        self.workers = workers
+        self.password_method = password_method
+        self.before_insert = before_insert
+        self.after_insert = after_insert
+        self.after_import = after_import
+
+    def _next_user_id(self, connection) -> int:
+        # user.id is a string key; imported accounts continue the numeric sequence
+        current = connection.execute(
+            sa.select(sa.func.max(sa.cast(self.users.c.id, sa.Integer)))
+        ).scalar()
+        return (current or 0) + 1
+
+    def _insert_batch(self, prepared, errors: List[RowError], seen_emails: set) -> int:
+        records = []
+        for line, record, error in prepared:
+            if error is not None:
+                errors.append(error)
+            elif record["email"] in seen_emails:
+                errors.append(RowError(line, record["email"], "duplicate email in file"))
+            else:
+                seen_emails.add(record["email"])
+                records.append((line, record))
+        if not records:
+            return 0
+
+        for attempt in range(INSERT_ATTEMPTS):
+            rejected: List[RowError] = []
+            try:
+                created = self._insert_records(records, rejected)
+            except sa.exc.IntegrityError:
+                if attempt == INSERT_ATTEMPTS - 1:
+                    raise
+                continue
+            errors.extend(rejected)
+            return created
+
+    def _insert_records(self, records, rejected: List[RowError]) -> int:
+        session = self.db.session
+        connection = session.connection()
+        existing = set(connection.execute(
+            sa.select(self.users.c.email).where(self.users.c.email.in_([r["email"] for _, r in records]))
+        ).scalars())
+        for line, record in records:
+            if record["email"] in existing:
+                rejected.append(RowError(line, record["email"], "email already registered"))
+        records = [record for _, record in records if record["email"] not in existing]
+        if not records:
+            return 0
+
+        try:
+            next_id = self._next_user_id(connection)
+            created_at = datetime.utcnow()
+            for offset, record in enumerate(records):
+                record["user_id"] = str(next_id + offset)
+
+            connection.execute(self.users.insert(), [
+                {"id": r["user_id"], "name": r["name"], "email": r["email"],
+                 "password_hash": r["password_hash"], "role": "student", "created_at": created_at}
+                for r in records
+            ])
+            if self.before_insert:
+                self.before_insert(connection, records)
+            profile_rows = [
+                {"user_id": r["user_id"], "department": r["department"], "gpa": r["gpa"],
+                 **{column: r[column] for column in PROFILE_COLUMNS}}
+                for r in records
+            ]
+            inserted = connection.execute(
+                self.profiles.insert().returning(self.profiles.c.id, sort_by_parameter_order=True),
+                profile_rows,
+            ).scalars().all()
+            for profile_id, row in zip(inserted, profile_rows):
+                row["id"] = profile_id
+            if self.after_insert:
+                self.after_insert(connection, profile_rows)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        return len(records)
+
+    def import_csv(self, stream, default_password: Optional[str] = None,
+                   progress: Optional[Callable[[int], None]] = None,
+                   workers: Optional[int] = None) -> ImportReport:
+        """Import every row of ``stream``; returns counts, per-row errors and timing.
+
+        ``workers`` overrides the hashing pool size for this import.
+        """
+        started = time.perf_counter()
+        created = 0
+        errors: List[RowError] = []
+        seen_emails: set = set()
+        chunk_rows = max(1, self.batch_size // 16)
+
+        with ProcessPoolExecutor(max_workers=workers or self.workers) as pool:
+            # One batch is prepared in the pool while the previous one is inserted
+            pending = deque()
+            for batch in _batches(read_rows(stream), self.batch_size):
+                chunks = [(chunk, default_password, self.password_method) for chunk in _batches(batch, chunk_rows)]
+                pending.append(chain.from_iterable(pool.map(prepare_rows, chunks)))
+                if len(pending) > 1:
+                    created += self._insert_batch(pending.popleft(), errors, seen_emails)
+                    if progress:
+                        progress(created)
+            while pending:
+                created += self._insert_batch(pending.popleft(), errors, seen_emails)
+                if progress:
+                    progress(created)
+
+        if created and self.after_import:
+            self.after_import()
+        errors.sort(key=lambda error: error.line)
+        return ImportReport(created, errors, time.perf_counter() - started)
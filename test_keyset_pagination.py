@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Keyset pagination tests for PyTech Arena
+Following next_cursor page by page must return exactly the rows, in the
+same order, that one ORDER BY ... LIMIT/OFFSET walk returns
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db, JobApplication, StudentProfile
+from pagination import decode_cursor, encode_cursor
+
+
+def walk(client, url, cursor_param):
+    """Follow next_cursor until the last page; returns every item id and the page count."""
+    ids, pages, cursor = [], 0, None
+    while True:
+        response = client.get(url + (f"&{cursor_param}={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        body = response.get_json()
+        ids.extend(item["id"] for item in body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def offset_pages(query, per_page):
+    """The same listing read with LIMIT/OFFSET, page by page."""
+    ids, offset = [], 0
+    while True:
+        page = [row.id for row in query.limit(per_page).offset(offset)]
+        ids.extend(page)
+        offset += per_page
+        if len(page) < per_page:
+            return ids
+
+
+def test_students_match_offset_pagination(login_as, make_student):
+    # Few distinct GPAs, so most pages break inside a run of ties
+    for i in range(23):
+        make_student(gpa=6.0 + i % 3)
+    client = login_as(3, "recruiter")
+
+    ids, pages = walk(client, "/api/recruiter/students?per_page=5", "students_after")
+
+    expected = offset_pages(StudentProfile.query.order_by(StudentProfile.gpa.desc(), StudentProfile.id.desc()), 5)
+    assert ids == expected
+    assert len(set(ids)) == 23
+    assert pages == 5
+
+
+def test_applications_match_offset_pagination(login_as, make_student):
+    profile = make_student()
+    applied_at = datetime(2026, 1, 1)
+    for i in range(17):
+        db.session.add(JobApplication(
+            student_id=int(profile.user_id), job_id=str(i), company_name="Infosys", job_title="SDE",
+            full_name="Student", email="student@example.com", phone="9876543210", department="CSE",
+            cgpa="7.5", cover_letter="-",
+            # Pairs of identical timestamps exercise the id tie-breaker
+            applied_at=applied_at + timedelta(minutes=i // 2),
+        ))
+    db.session.commit()
+    client = login_as(3, "recruiter")
+
+    ids, pages = walk(client, "/api/recruiter/applications?per_page=4", "applications_after")
+
+    expected = offset_pages(JobApplication.query.order_by(JobApplication.applied_at.desc(), JobApplication.id.desc()), 4)
+    assert ids == expected
+    assert pages == 5
+
+
+def test_last_full_page_has_no_cursor(login_as, make_student):
+    for _ in range(10):
+        make_student()
+    client = login_as(3, "recruiter")
+
+    ids, pages = walk(client, "/api/recruiter/students?per_page=5", "students_after")
+
+    assert len(ids) == 10
+    assert pages == 2
+
+
+@pytest.mark.parametrize("values", [
+    [7.5, 12],
+    [datetime(2026, 3, 1, 9, 30), 4],
+])
+def test_cursor_round_trip(values):
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor([1])[:-2] + "{{"])
+def test_malformed_cursor_is_ignored(cursor):
+    assert decode_cursor(cursor) is None
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Notification outbox tests for PyTech Arena
+Draining moves every queued row into the notification table exactly once,
+coalesces duplicates and keeps the unread counters in step
+"""
+
+from datetime import datetime
+
+import pytest
+
+from app import (
+    db, get_unread_notification_count, Notification, notification_dispatcher, NotificationOutbox
+)
+
+
+def queue(user_id, title, count=1):
+    """Append outbox rows without an ORM flush, so nothing drains them on commit."""
+    db.session.execute(NotificationOutbox.__table__.insert(), [
+        {"user_id": user_id, "title": title, "message": f"{title} message", "type": "info",
+         "created_at": datetime(2026, 1, 1)}
+        for _ in range(count)
+    ])
+    db.session.commit()
+
+
+def test_drain_delivers_every_batch(app, make_student, monkeypatch):
+    users = [int(make_student().user_id) for _ in range(3)]
+    for i in range(7):
+        queue(users[i % 3], f"Drive {i}")
+    monkeypatch.setattr(notification_dispatcher, "batch_size", 3)
+
+    assert notification_dispatcher.drain() == 7
+
+    assert NotificationOutbox.query.count() == 0
+    assert Notification.query.count() == 7
+    assert notification_dispatcher.drain() == 0
+
+
+def test_drain_coalesces_duplicates(app, make_student):
+    user_id = int(make_student().user_id)
+    queue(user_id, "Shortlisted", count=3)
+    queue(user_id, "Interview scheduled")
+
+    assert notification_dispatcher.drain() == 4
+
+    titles = sorted(n.title for n in Notification.query.filter_by(user_id=user_id))
+    assert titles == ["Interview scheduled", "Shortlisted"]
+
+
+def test_drain_keeps_unread_counter_in_step(app, make_student):
+    user_id = int(make_student().user_id)
+    db.session.add(Notification(user_id=user_id, title="Welcome", message="Hi"))
+    db.session.commit()
+    assert get_unread_notification_count(user_id) == 1
+
+    queue(user_id, "Drive A")
+    queue(user_id, "Drive B")
+    notification_dispatcher.drain()
+    db.session.expire_all()
+
+    assert get_unread_notification_count(user_id) == 3
+
+
+def test_committed_orm_append_is_dispatched(app, make_student):
+    user_id = int(make_student().user_id)
+    db.session.add(NotificationOutbox(user_id=user_id, title="Offer", message="Congratulations"))
+    db.session.commit()
+
+    assert NotificationOutbox.query.count() == 0
+    assert Notification.query.filter_by(user_id=user_id, title="Offer").count() == 1
+
+
+def test_rolled_back_append_is_never_delivered(app, make_student):
+    user_id = int(make_student().user_id)
+    db.session.add(NotificationOutbox(user_id=user_id, title="Offer", message="Congratulations"))
+    db.session.flush()
+    db.session.rollback()
+
+    assert notification_dispatcher.drain() == 0
+    assert Notification.query.filter_by(user_id=user_id).count() == 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
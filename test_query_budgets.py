@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Query budget tests for PyTech Arena
+List views must issue a constant number of reads however many rows they
+render, and going over budget fails loudly under TESTING
+"""
+
+import logging
+
+import pytest
+from flask import g
+
+from app import app as flask_app, candidate_search, db, search_candidates, StudentProfile
+
+
+def test_recruiter_students_stays_within_budget(login_as, make_student):
+    for i in range(30):
+        make_student(gpa=6 + i % 4)
+    client = login_as(3, "recruiter")
+
+    response = client.get("/api/recruiter/students?per_page=30")
+
+    assert response.status_code == 200
+    assert len(response.get_json()["items"]) == 30
+
+
+def test_budget_is_enforced_under_testing(login_as, make_student, monkeypatch):
+    make_student()
+    view = flask_app.view_functions["api_recruiter_students"]
+    monkeypatch.setattr(view, "query_budget", 0)
+    client = login_as(3, "recruiter")
+
+    with pytest.raises(AssertionError, match="api_recruiter_students issued"):
+        client.get("/api/recruiter/students")
+
+
+def test_budget_only_warns_outside_testing(login_as, make_student, monkeypatch, caplog):
+    make_student()
+    view = flask_app.view_functions["api_recruiter_students"]
+    monkeypatch.setattr(view, "query_budget", 0)
+    monkeypatch.setitem(flask_app.config, "TESTING", False)
+    monkeypatch.setitem(flask_app.config, "ENFORCE_QUERY_BUDGETS", False)
+    client = login_as(3, "recruiter")
+
+    with caplog.at_level(logging.WARNING):
+        response = client.get("/api/recruiter/students")
+
+    assert response.status_code == 200
+    assert "(budget 0)" in caplog.text
+
+
+@pytest.mark.parametrize("statement, counted", [
+    ("SELECT 1", True),
+    ("  select 1", True),
+    ("WITH ids AS (SELECT 1 AS id) SELECT id FROM ids", True),
+    ("with\nids AS (SELECT 1 AS id) SELECT id FROM ids", True),
+    ("UPDATE user SET name = name WHERE id = '0'", False),
+])
+def test_every_read_statement_is_counted(app, statement, counted):
+    with app.test_request_context("/"):
+        db.session.execute(db.text(statement))
+        assert g.get("select_count", 0) == (1 if counted else 0)
+        db.session.rollback()
+
+
+def test_fts_search_is_counted(app, make_student):
+    make_student(skills="Python, Django")
+    assert candidate_search.available()
+    with app.test_request_context("/"):
+        query, score = search_candidates(StudentProfile.query, "django")
+        assert len(query.all()) == 1
+        assert g.select_count == 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
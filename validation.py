@@ -0,0 +1,87 @@
+"""
+Input Validation for PyTech Arena
+Validators and the input sanitizer shared by the registration form and the
+bulk student importer. Patterns are compiled once at import time.
+"""
+
+import re
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+PHONE_PATTERN = re.compile(r"^[+]?[0-9]{10,15}$")
+
+# Characters stripped by sanitize_input, as a str.translate table indexed by
+# code point so the text is scanned once. A list is looked up faster than the
+# dict str.maketrans builds; code points past its end raise IndexError, which
+# translate treats as "leave unchanged".
+_UNSAFE_CHARS = "<>&\"'/"
+_SANITIZE_TABLE = [None if chr(i) in _UNSAFE_CHARS else chr(i) for i in range(128)]
+
+MIN_PASSWORD_LENGTH = 8
+
+
+def validate_email(email: Optional[str]) -> bool:
+    """Validate email format."""
+    return bool(email) and EMAIL_PATTERN.match(email) is not None
+
+
+def validate_phone(phone: Optional[str]) -> bool:
+    """Validate phone number format."""
+    return bool(phone) and PHONE_PATTERN.match(phone) is not None
+
+
+def validate_password_strength(password: Optional[str]) -> List[str]:
+    """Validate password strength in a single pass over the characters."""
+    password = password or ""
+    upper = lower = digit = False
+    for c in password:
+        if c.isupper():
+            upper = True
+        elif c.islower():
+            lower = True
+        elif c.isdigit():
+            digit = True
+        if upper and lower and digit:
+            break
+
+    errors = []
+    if len(password) < MIN_PASSWORD_LENGTH:
+        errors.append("Password must be at least 8 characters long")
+    if not upper:
+        errors.append("Password must contain at least one uppercase letter")
+    if not lower:
+        errors.append("Password must contain at least one lowercase letter")
+    if not digit:
+        errors.append("Password must contain at least one digit")
+    return errors
+
+
+def sanitize_input(text: Optional[str]) -> str:
+    """Sanitize user input to prevent XSS."""
+    if not text:
+        return ""
+    return text.translate(_SANITIZE_TABLE).strip()
+
+
+def validate_rows(rows: Iterable[Mapping[str, str]],
+                  rules: Mapping[str, Callable[[str], Optional[str]]]) -> List[Tuple[int, Dict[str, str]]]:
+    """Check many rows against per-field rules in one pass.
+
+    Each rule takes the field value (``""`` when missing) and returns an
+    error message or None. Returns ``(row_index, {field: message})`` for the
+    rows that failed, in input order.
+    """
+    checks = list(rules.items())
+    failures = []
+    for index, row in enumerate(rows):
+        errors = None
+        for field, rule in checks:
+            message = rule(row.get(field) or "")
+            if message:
+                if errors is None:
+                    errors = {}
+                errors[field] = message
+        if errors:
+            failures.append((index, errors))
+    return failures